@@ -0,0 +1,122 @@
+# artifact_store.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from config import ARTIFACT_CONFIG
+
+
+class ArtifactStore:
+    """녹음/녹취록/요약 파일을 디스크에 보관하는 저장소
+
+    세션에는 파일 이름(핸들)만 저장하고, 마지막 사용 후 ttl_seconds가 지난 파일은 삭제
+    """
+
+    def __init__(self, root_dir, ttl_seconds, purge_interval_seconds):
+        self.root_dir = root_dir
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _new_handle(self, kind, extension):
+        return f"{kind}_{uuid.uuid4().hex}.{extension.lstrip('.')}"
+
+    def _path(self, handle):
+        # 핸들은 저장소 안의 파일 이름만 허용
+        if not handle or os.path.basename(handle) != handle:
+            return None
+        return os.path.join(self.root_dir, handle)
+
+    def put_file(self, path, kind):
+        """기존 파일을 저장소로 옮기고 핸들 반환"""
+        handle = self._new_handle(kind, os.path.splitext(path)[1] or 'bin')
+        target = self._path(handle)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # 다른 파일 시스템이면 복사 후 삭제
+            shutil.move(path, target)
+        # 옮긴 파일은 원본 수정 시각을 유지하므로, 오래된 파일이 바로 만료되지 않도록 갱신
+        os.utime(target, None)
+        self._maybe_purge()
+        return handle
+
+    def put_text(self, text, kind, extension='txt'):
+        """텍스트를 파일로 저장하고 핸들 반환"""
+        handle = self._new_handle(kind, extension)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.root_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, self._path(handle))
+        self._maybe_purge()
+        return handle
+
+    def path(self, handle):
+        """핸들의 파일 경로 (없거나 만료되었으면 None)"""
+        path = self._path(handle)
+        if not path:
+            return None
+        try:
+            # 마지막 사용 시각 갱신 (사용 중인 결과는 만료되지 않도록)
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def read_text(self, handle):
+        """텍스트 파일 내용 (없으면 None)"""
+        path = self.path(handle)
+        if not path:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def delete(self, handle):
+        """파일 삭제 (없으면 무시)"""
+        path = self._path(handle)
+        if path:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _maybe_purge(self):
+        """마지막 정리 후 일정 시간이 지났으면 만료 파일 정리"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge < self.purge_interval_seconds:
+                return
+            self._last_purge = now
+        self.purge(now - self.ttl_seconds)
+
+    def purge(self, older_than=None):
+        """마지막 사용 시각이 older_than 이전인 파일 삭제"""
+        if older_than is None:
+            older_than = time.time() - self.ttl_seconds
+        for entry in os.scandir(self.root_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < older_than:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """프로세스 전체에서 공유하는 저장소 인스턴스"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(ARTIFACT_CONFIG['root_dir'], ARTIFACT_CONFIG['ttl_seconds'],
+                                   ARTIFACT_CONFIG['purge_interval_seconds'])
+        return _store
@@ -0,0 +1,93 @@
+# audio_chunker.py
+from types import SimpleNamespace
+import numpy as np
+from audio_encoder import write_audio
+from audio_utils import open_pcm, frame_rms
+from config import TRANSCRIPTION_CONFIG, ENCODING_CONFIG
+
+
+def plan_chunks(audio_path):
+    """침묵 구간을 기준으로 오디오를 나눌 구간 계획
+
+    반환값: [(window_start, window_end, keep_start, keep_end), ...] (초 단위)
+    window는 실제 업로드할 구간(앞뒤 겹침 포함), keep은 결과에서 채택할 구간
+    """
+    samples, rate = open_pcm(audio_path)
+    duration = len(samples) / rate if rate else 0
+
+    # 업로드 용량 제한을 넘지 않는 최대 구간 길이 (업로드는 16비트 모노로 변환됨)
+    bytes_per_second = ENCODING_CONFIG['sample_rate'] * 2
+    overlap = TRANSCRIPTION_CONFIG['overlap_seconds']
+    max_seconds = min(
+        TRANSCRIPTION_CONFIG['chunk_seconds'],
+        TRANSCRIPTION_CONFIG['max_upload_bytes'] / bytes_per_second - 2 * overlap
+    )
+
+    if duration <= max_seconds:
+        return [(0.0, duration, 0.0, duration)]
+
+    window_seconds = TRANSCRIPTION_CONFIG['analysis_window_seconds']
+    rms = frame_rms(samples, rate, window_seconds)
+    search_windows = int(TRANSCRIPTION_CONFIG['silence_search_seconds'] / window_seconds)
+
+    # 목표 지점 이전의 탐색 범위에서 가장 조용한 위치를 절단점으로 선택
+    cuts = [0.0]
+    while duration - cuts[-1] > max_seconds:
+        target = int((cuts[-1] + max_seconds) / window_seconds)
+        lower = max(int(cuts[-1] / window_seconds) + 1, target - search_windows)
+        quietest = lower + int(np.argmin(rms[lower:target])) if target > lower else target
+        cuts.append(quietest * window_seconds)
+    cuts.append(duration)
+
+    plan = []
+    for keep_start, keep_end in zip(cuts[:-1], cuts[1:]):
+        plan.append((
+            max(0.0, keep_start - overlap),
+            min(duration, keep_end + overlap),
+            keep_start,
+            keep_end
+        ))
+    return plan
+
+
+def export_chunk(audio_path, window_start, window_end):
+    """계획된 구간을 업로드용 압축 파일로 저장"""
+    samples, rate = open_pcm(audio_path)
+    start = int(window_start * rate)
+    end = int(window_end * rate)
+    return write_audio(samples[start:end], rate)
+
+
+def stitch_segments(chunk_results):
+    """구간별 인식 결과를 원본 타임라인으로 합치기
+
+    chunk_results: [((window_start, window_end, keep_start, keep_end), transcript), ...]
+    겹침 구간의 세그먼트는 중간 지점이 keep 구간에 속하는 쪽만 채택
+    """
+    segments = []
+    for (window_start, _, keep_start, keep_end), transcript in chunk_results:
+        for segment in getattr(transcript, 'segments', None) or []:
+            start = getattr(segment, 'start', 0) + window_start
+            end = getattr(segment, 'end', 0) + window_start
+            text = getattr(segment, 'text', '')
+
+            midpoint = (start + end) / 2
+            if not keep_start <= midpoint < keep_end:
+                continue
+
+            # 경계에서 같은 문장이 중복 인식된 경우 제거
+            if segments and segments[-1].text.strip() == text.strip() and start < segments[-1].end:
+                continue
+
+            segments.append(SimpleNamespace(
+                id=len(segments),
+                start=start,
+                end=end,
+                text=text
+            ))
+
+    return SimpleNamespace(
+        text=''.join(segment.text for segment in segments).strip(),
+        segments=segments,
+        duration=chunk_results[-1][0][3] if chunk_results else 0.0
+    )
@@ -0,0 +1,189 @@
+# audio_encoder.py
+import os
+import queue
+import tempfile
+import threading
+import wave
+import numpy as np
+from audio_utils import to_mono, ANALYSIS_BLOCK_SECONDS
+from config import AUDIO_CONFIG, ENCODING_CONFIG
+
+try:
+    import soundfile
+except ImportError:  # soundfile이 없으면 16kHz 모노 WAV로 저장
+    soundfile = None
+
+MIME_TYPES = {
+    'flac': 'audio/flac',
+    'ogg': 'audio/ogg',
+    'wav': 'audio/wav'
+}
+
+
+def output_format():
+    """실제 사용할 저장 형식 (압축 라이브러리가 없으면 wav)"""
+    if soundfile is None:
+        return 'wav'
+    return ENCODING_CONFIG['format']
+
+
+def mime_type(path):
+    """파일 확장자에 맞는 MIME 타입"""
+    return MIME_TYPES.get(os.path.splitext(path)[1].lstrip('.').lower(), 'application/octet-stream')
+
+
+class StreamResampler:
+    """청크 단위로 이어서 처리하는 리샘플러 (저역 통과 필터 + 선형 보간)"""
+
+    def __init__(self, source_rate, target_rate, taps=63):
+        self.ratio = source_rate / target_rate
+        self.position = 0.0
+        self._last = np.zeros(0, dtype=np.float32)
+
+        # 다운샘플링 시 앨리어싱 방지용 windowed-sinc 필터
+        if source_rate > target_rate:
+            cutoff = 0.45 * target_rate / source_rate
+            n = np.arange(taps) - (taps - 1) / 2
+            kernel = np.sinc(2 * cutoff * n) * np.hamming(taps)
+            self._kernel = (kernel / kernel.sum()).astype(np.float32)
+        else:
+            self._kernel = np.ones(1, dtype=np.float32)
+        self._history = np.zeros(len(self._kernel) - 1, dtype=np.float32)
+
+    def process(self, mono):
+        """float32 모노 샘플을 받아 목표 샘플레이트로 변환"""
+        if self.ratio == 1.0:
+            return mono
+
+        padded = np.concatenate((self._history, mono))
+        filtered = np.convolve(padded, self._kernel, mode='valid')
+        if len(self._history):
+            self._history = padded[-len(self._history):]
+
+        y = np.concatenate((self._last, filtered))
+        if len(y) == 0:
+            return y
+
+        available = len(y) - 1 - self.position
+        count = int(np.floor(available / self.ratio)) + 1 if available >= 0 else 0
+        positions = self.position + np.arange(count) * self.ratio
+        resampled = np.interp(positions, np.arange(len(y)), y).astype(np.float32)
+
+        # 다음 청크는 이번 청크의 마지막 샘플부터 이어서 보간
+        self.position = self.position + count * self.ratio - (len(y) - 1)
+        self._last = y[-1:]
+        return resampled
+
+
+def _to_int16(mono):
+    return np.clip(np.round(mono), -32768, 32767).astype(np.int16)
+
+
+class _AudioWriter:
+    """설정된 형식으로 16비트 모노 파일을 이어서 기록"""
+
+    def __init__(self, path, rate):
+        self.path = path
+        if output_format() == 'wav':
+            self._file = wave.open(path, 'wb')
+            self._file.setnchannels(1)
+            self._file.setsampwidth(2)
+            self._file.setframerate(rate)
+        else:
+            self._file = soundfile.SoundFile(path, mode='w', samplerate=rate, channels=1,
+                                             format=output_format().upper(), subtype='PCM_16')
+
+    def write(self, samples):
+        if isinstance(self._file, wave.Wave_write):
+            self._file.writeframesraw(samples.tobytes())
+        else:
+            self._file.write(samples)
+
+    def close(self):
+        self._file.close()
+
+
+def write_audio(samples, rate, directory=None):
+    """int16 샘플을 업로드용 형식(16kHz 모노 압축)으로 임시 파일에 저장"""
+    target_rate = ENCODING_CONFIG['sample_rate']
+    resampler = StreamResampler(rate, target_rate)
+
+    fd, path = tempfile.mkstemp(suffix=f".{output_format()}", dir=directory)
+    os.close(fd)
+    writer = _AudioWriter(path, target_rate)
+    try:
+        # 긴 구간도 메모리 사용량이 일정하도록 블록 단위로 변환
+        block = int(ANALYSIS_BLOCK_SECONDS * rate)
+        for start in range(0, len(samples), block):
+            mono = to_mono(samples[start:start + block])
+            writer.write(_to_int16(resampler.process(mono)))
+    finally:
+        writer.close()
+    return path
+
+
+class StreamingEncoder:
+    """녹음 중 별도 스레드에서 16kHz 모노 압축 파일을 만드는 리스너
+
+    PerfectRecorder의 리스너로 등록되어 open -> feed -> close 순서로 호출됨
+    """
+
+    def __init__(self):
+        self.path = None
+        self.error = None
+        self._queue = queue.Queue()
+        self._writer = None
+        self._resampler = None
+        self._channels = 1
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def open(self, channels, sample_width, rate):
+        """녹음 시작 시 출력 파일 준비"""
+        if sample_width != 2:
+            raise ValueError("16비트 녹음만 인코딩할 수 있습니다")
+        self._channels = channels
+        self._resampler = StreamResampler(rate, ENCODING_CONFIG['sample_rate'])
+
+        os.makedirs(AUDIO_CONFIG['recording_dir'], exist_ok=True)
+        fd, self.path = tempfile.mkstemp(suffix=f".{output_format()}", dir=AUDIO_CONFIG['recording_dir'])
+        os.close(fd)
+        self._writer = _AudioWriter(self.path, ENCODING_CONFIG['sample_rate'])
+        self.thread.start()
+
+    def feed(self, data):
+        """녹음 데이터 추가 (인코딩은 인코더 스레드에서 처리)"""
+        self._queue.put(data)
+
+    def close(self):
+        """녹음 종료 신호"""
+        self._queue.put(None)
+
+    def _run(self):
+        """인코더 스레드"""
+        try:
+            while True:
+                data = self._queue.get()
+                if data is None:
+                    break
+                samples = np.frombuffer(data, dtype='<i2').reshape(-1, self._channels)
+                mono = samples.mean(axis=1, dtype=np.float32)
+                self._writer.write(_to_int16(self._resampler.process(mono)))
+        except Exception as e:
+            self.error = str(e)
+            # 녹음이 끝날 때까지 남은 데이터는 버림
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._writer.close()
+
+    def result(self, timeout=None):
+        """인코딩 완료 대기 후 파일 경로 반환"""
+        self.thread.join(timeout=timeout)
+        if self.thread.is_alive():
+            return None, "인코딩이 제한 시간 내에 끝나지 않았습니다"
+        if self.error:
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+            return None, f"인코딩 실패: {self.error}"
+        return self.path, None
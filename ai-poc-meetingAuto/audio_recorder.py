@@ -1,106 +1,783 @@
 # audio_recorder.py
 import pyaudio
+import glob
+import json
+import struct
 import threading
+import time
+import uuid
 import wave
 import tempfile
 import os
+import numpy as np
 from config import AUDIO_CONFIG
 
+# 녹음 파일 옆에 두는 체크포인트 파일 (정상 종료되면 삭제되므로 남아 있으면 중단된 녹음)
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+
+# 이 프로세스에서 기록 중인 녹음 파일 (다른 세션의 진행 중인 녹음을 복구하지 않도록)
+_active_paths = set()
+_active_lock = threading.Lock()
+
+
+class RingBuffer:
+    """미리 할당한 고정 크기 링 버퍼 (생산자 1개, 소비자 1개)
+
+    쓰기/읽기 위치를 각자 한 스레드에서만 증가시키므로 데이터 교환에 락이 필요 없음
+    가득 차면 기다리지 않고 새 청크를 버림 (오디오 콜백이 막히지 않도록)
+    버린 양은 다음 청크에 함께 기록하여 소비자가 그 자리를 무음으로 채울 수 있게 함
+    """
+
+    def __init__(self, capacity, chunk_bytes):
+        self.capacity = capacity
+        self._slots = np.zeros((capacity, chunk_bytes), dtype=np.uint8)
+        self._lengths = np.zeros(capacity, dtype=np.int64)
+        self._gaps = np.zeros(capacity, dtype=np.int64)
+        self._gap = 0
+        self._write = 0
+        self._read = 0
+        self._closed = False
+        self._ready = threading.Event()
+
+    def push(self, data):
+        """청크 추가 (가득 찼거나 청크가 너무 크면 False)"""
+        if self._write - self._read >= self.capacity or len(data) > self._slots.shape[1]:
+            return False
+        slot = self._write % self.capacity
+        self._slots[slot, :len(data)] = np.frombuffer(data, dtype=np.uint8)
+        self._lengths[slot] = len(data)
+        self._gaps[slot] = self._gap
+        self._gap = 0
+        self._write += 1
+        self._ready.set()
+        return True
+
+    def skip(self, count):
+        """버린 청크의 양 기록 (다음에 넣는 청크 앞의 빈자리)"""
+        self._gap += count
+
+    def pop(self, timeout=0.1):
+        """(앞에 버려진 양, 청크) 꺼내기 (비어 있으면 최대 timeout초 대기 후 None)"""
+        if self._read == self._write:
+            self._ready.wait(timeout)
+            self._ready.clear()
+            if self._read == self._write:
+                return None
+        slot = self._read % self.capacity
+        data = self._slots[slot, :self._lengths[slot]].tobytes()
+        gap = int(self._gaps[slot])
+        self._read += 1
+        return gap, data
+
+    def fill(self):
+        """현재 버퍼 사용률 (0~1)"""
+        return (self._write - self._read) / self.capacity
+
+    def close(self):
+        """더 이상 데이터가 들어오지 않음을 알림"""
+        self._closed = True
+        self._ready.set()
+
+    def drained(self):
+        """종료 후 남은 데이터를 모두 꺼냈는지 여부"""
+        return self._closed and self._read == self._write
+
+    def trailing_gap(self):
+        """마지막 청크 이후에 버려진 양 (종료 후 소비자가 호출)"""
+        return self._gap
+
+
+class CheckpointedWave:
+    """주기적으로 fsync하고 체크포인트를 남기는 WAV 기록기
+
+    WAV 헤더의 데이터 크기는 닫을 때만 기록되므로, 프로세스가 중간에 종료되면
+    체크포인트에 남긴 형식 정보로 recover_recording()이 헤더를 다시 씀
+    """
+
+    def __init__(self, path, channels, sample_width, rate, info):
+        self.path = path
+        self.manifest_path = path + CHECKPOINT_SUFFIX
+        self.sample_width = sample_width
+        self.data_bytes = 0
+        self._file = open(path, 'wb')
+        self._wave = wave.open(self._file, 'wb')
+        self._wave.setnchannels(channels)
+        self._wave.setsampwidth(sample_width)
+        self._wave.setframerate(rate)
+        self._info = dict(info, channels=channels, sample_width=sample_width, rate=rate,
+                          started_at=time.time())
+        with _active_lock:
+            _active_paths.add(path)
+        # 헤더를 먼저 기록해 두어야 데이터가 없어도 복구할 수 있음
+        self._wave.writeframesraw(b'')
+        self.checkpoint()
+
+    def write(self, data):
+        self._wave.writeframesraw(data)
+        self.data_bytes += len(data)
+        self.maybe_checkpoint()
+
+    def maybe_checkpoint(self):
+        """마지막 체크포인트 후 설정된 시간이 지났으면 체크포인트"""
+        if time.monotonic() - self._last_checkpoint >= AUDIO_CONFIG['checkpoint_seconds']:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """기록한 데이터를 디스크에 확정하고 체크포인트 파일 갱신"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        manifest = dict(self._info, data_bytes=self.data_bytes, updated_at=time.time())
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.manifest_path)
+        self._last_checkpoint = time.monotonic()
+
+    def close(self):
+        """WAV 헤더를 갱신하고 체크포인트 삭제 (정상 종료)"""
+        try:
+            self._wave.close()
+            self._file.close()
+        finally:
+            with _active_lock:
+                _active_paths.discard(self.path)
+            if os.path.exists(self.manifest_path):
+                os.unlink(self.manifest_path)
+
+
+def _repair_wave(path, frame_bytes):
+    """헤더의 데이터 크기를 실제 기록된 길이로 고침 (복구한 데이터 바이트 수, 실패 시 None)"""
+    with open(path, 'r+b') as f:
+        header = f.read(64)
+        data_chunk = header.find(b'data')
+        if header[:4] != b'RIFF' or data_chunk < 0:
+            return None
+        offset = data_chunk + 8
+        # 마지막 프레임이 잘렸을 수 있으므로 프레임 단위로 자름
+        data_bytes = max(0, os.fstat(f.fileno()).st_size - offset) // frame_bytes * frame_bytes
+        f.truncate(offset + data_bytes)
+        f.seek(4)
+        f.write(struct.pack('<I', offset - 8 + data_bytes))
+        f.seek(data_chunk + 4)
+        f.write(struct.pack('<I', data_bytes))
+        f.flush()
+        os.fsync(f.fileno())
+    return data_bytes
+
+
+def _orphaned_files(recording_dir):
+    """비정상 종료로 남은 녹음 파일을 녹음 ID별로 묶어 반환
+
+    진행 중인 녹음(이 프로세스에서 기록 중이거나 체크포인트가 최근에 갱신됨)은 건너뜀
+    """
+    stale_before = time.time() - AUDIO_CONFIG['checkpoint_seconds'] * 3
+
+    recordings = {}
+    for manifest_path in glob.glob(os.path.join(recording_dir, '*' + CHECKPOINT_SUFFIX)):
+        path = manifest_path[:-len(CHECKPOINT_SUFFIX)]
+        with _active_lock:
+            if path in _active_paths:
+                continue
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest['updated_at'] > stale_before:
+            continue
+        recordings.setdefault(manifest['recording_id'], []).append((manifest_path, path, manifest))
+    return recordings
+
+
+def list_orphaned_recordings(recording_dir=None):
+    """복구할 수 있는 녹음 목록 (오래된 순, 파일은 건드리지 않음)
+
+    반환값: recording_id, started_at, seconds(마지막 체크포인트 기준), tracks를 가진 dict 목록
+    """
+    recordings = []
+    for recording_id, files in _orphaned_files(recording_dir or AUDIO_CONFIG['recording_dir']).items():
+        recordings.append({
+            'recording_id': recording_id,
+            'started_at': min(manifest['started_at'] for _, _, manifest in files),
+            'seconds': max(manifest['data_bytes'] / (manifest['channels'] * manifest['sample_width'])
+                           / manifest['rate'] for _, _, manifest in files),
+            'tracks': sum(manifest['role'] == 'track' for _, _, manifest in files)
+        })
+    return sorted(recordings, key=lambda recording: recording['started_at'])
+
+
+def recover_recording(recording_id, recording_dir=None):
+    """비정상 종료로 남은 녹음 하나를 복구 (WAV 헤더를 실제 길이로 고침)
+
+    반환값: audio_path, track_paths, seconds, started_at을 가진 dict
+    (없거나 다른 세션/프로세스가 먼저 가져갔으면 None)
+    """
+    files = _orphaned_files(recording_dir or AUDIO_CONFIG['recording_dir']).get(recording_id, [])
+
+    # 다른 세션/프로세스와 동시에 복구하지 않도록 체크포인트 이름을 바꿔 선점
+    claimed = []
+    for manifest_path, path, manifest in files:
+        try:
+            os.replace(manifest_path, manifest_path + '.recovering')
+            claimed.append((manifest_path + '.recovering', path, manifest))
+        except OSError:
+            pass
+    if not claimed:
+        return None
+
+    audio, tracks = None, []
+    for claim_path, path, manifest in claimed:
+        frame_bytes = manifest['channels'] * manifest['sample_width']
+        data_bytes = _repair_wave(path, frame_bytes) if os.path.exists(path) else None
+        if data_bytes:
+            seconds = data_bytes / frame_bytes / manifest['rate']
+            if manifest['role'] == 'track':
+                tracks.append((manifest['track'], path, seconds))
+            else:
+                audio = (path, seconds)
+        elif os.path.exists(path):
+            os.unlink(path)
+        os.unlink(claim_path)
+
+    tracks.sort()
+    if audio is None and tracks:
+        # 믹스다운이 시작되기 전에 중단되었으면 첫 트랙만 사용
+        _, path, seconds = tracks[0]
+        for _, other, _ in tracks[1:]:
+            os.unlink(other)
+        audio, tracks = (path, seconds), []
+    if audio is None:
+        return None
+    return {
+        'audio_path': audio[0],
+        'track_paths': [path for _, path, _ in tracks],
+        'seconds': audio[1],
+        'started_at': min(manifest['started_at'] for _, _, manifest in claimed)
+    }
+
+
 class PerfectRecorder:
-    def __init__(self):
-        self.frames = []
+    def __init__(self, device_index=None, clock_start=None):
+        # 입력 장치 번호 (None이면 기본 장치)
+        self.device_index = device_index
+        # 여러 장치를 함께 녹음할 때 공유하는 기준 시각 (time.monotonic)
+        self.clock_start = clock_start
+        # 다중 장치 녹음에서는 MultiTrackRecorder가 녹음 ID와 트랙 번호를 지정 (복구 시 묶음 단위)
+        self.recording_id = None
+        self.track_index = None
+        self.first_capture_time = None
         self.audio = None
         self.stream = None
         self.is_recording = False
-        
+        self.frame_count = 0
+        self.file_path = None
+        self.error = None
+        self.writer_thread = None
+        self._buffer = None
+        self._wave_file = None
+        self.listeners = []
+        # 다중 장치 녹음에서만 사용 (단일 장치는 file_path 하나)
+        self.track_paths = []
+        # 캡처 상태 지표
+        self.dropped_frames = 0
+        self.overflow_count = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.max_buffer_fill = 0.0
+
+    def add_listener(self, listener):
+        """녹음 데이터를 함께 받을 리스너 등록 (open/feed/close 메서드 필요)"""
+        self.listeners.append(listener)
+
     def start_recording(self):
         """녹음 시작"""
         try:
             self.audio = pyaudio.PyAudio()
-            self.frames = []
-            self.is_recording = True
-            
+            self.frame_count = 0
+            self.error = None
+            self.dropped_frames = 0
+            self.overflow_count = 0
+            self.latency = 0.0
+            self.max_latency = 0.0
+            self.max_buffer_fill = 0.0
+            self.first_capture_time = None
+
             # pyaudio 상수 매핑
             format_map = {
                 'paInt16': pyaudio.paInt16,
                 'paInt32': pyaudio.paInt32,
                 'paFloat32': pyaudio.paFloat32
             }
-            
+            sample_format = format_map.get(AUDIO_CONFIG['format'], pyaudio.paInt16)
+
+            # 녹음 파일을 미리 열어두고 청크 단위로 바로 기록
+            os.makedirs(AUDIO_CONFIG['recording_dir'], exist_ok=True)
+            fd, self.file_path = tempfile.mkstemp(suffix=".wav", dir=AUDIO_CONFIG['recording_dir'])
+            os.close(fd)
+
+            # 프로세스가 중간에 종료되어도 다음 실행에서 복구할 수 있도록 체크포인트하며 기록
+            self._wave_file = CheckpointedWave(
+                self.file_path, AUDIO_CONFIG['channels'], self.audio.get_sample_size(sample_format),
+                AUDIO_CONFIG['rate'], {
+                    'recording_id': self.recording_id or uuid.uuid4().hex,
+                    'role': 'main' if self.track_index is None else 'track',
+                    'track': self.track_index,
+                    'device_index': self.device_index
+                })
+
+            for listener in self.listeners:
+                listener.open(AUDIO_CONFIG['channels'],
+                              self._wave_file.sample_width,
+                              AUDIO_CONFIG['rate'])
+
+            # 오디오 콜백 -> 쓰기 스레드 사이의 미리 할당된 링 버퍼
+            self._frame_bytes = AUDIO_CONFIG['channels'] * self._wave_file.sample_width
+            self._buffer = RingBuffer(AUDIO_CONFIG['buffer_chunks'],
+                                      AUDIO_CONFIG['chunk'] * self._frame_bytes)
+
+            self.is_recording = True
+
+            self.writer_thread = threading.Thread(target=self._write)
+            self.writer_thread.daemon = True
+            self.writer_thread.start()
+
+            # 콜백 모드: PortAudio 스레드가 청크마다 _on_audio를 호출 (블로킹 read 없음)
             self.stream = self.audio.open(
-                format=format_map.get(AUDIO_CONFIG['format'], pyaudio.paInt16),
+                format=sample_format,
                 channels=AUDIO_CONFIG['channels'],
                 rate=AUDIO_CONFIG['rate'],
                 input=True,
-                frames_per_buffer=AUDIO_CONFIG['chunk']
+                input_device_index=self.device_index,
+                frames_per_buffer=AUDIO_CONFIG['chunk'],
+                stream_callback=self._on_audio
             )
-            
-            self.thread = threading.Thread(target=self._record)
-            self.thread.daemon = True
-            self.thread.start()
-            
+            self.stream.start_stream()
+
             return True, "녹음 시작 성공"
         except Exception as e:
+            self.is_recording = False
+            # 장치를 연 뒤 실패했으면 스트림과 PyAudio도 정리
+            self._close_stream()
+            if self._buffer:
+                self._buffer.close()
+            if self.writer_thread:
+                self.writer_thread.join(timeout=10)
+            self._discard_file()
             return False, f"녹음 시작 실패: {str(e)}"
-    
-    def _record(self):
-        """녹음 스레드"""
-        while self.is_recording:
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """오디오 콜백 (PortAudio 스레드에서 호출되므로 버퍼에 넣기만 하고 바로 반환)"""
+        if not self.is_recording:
+            self._buffer.close()
+            return (None, pyaudio.paComplete)
+
+        # 입력 오버플로: 콜백이 늦어 장치 쪽에서 이미 데이터가 유실됨
+        if status & pyaudio.paInputOverflow:
+            self.overflow_count += 1
+
+        # 마이크 입력 시점부터 콜백 호출까지의 지연
+        try:
+            latency = time_info['current_time'] - time_info['input_buffer_adc_time']
+            if 0 <= latency < 10:
+                self.latency = latency
+                self.max_latency = max(self.max_latency, latency)
+        except (KeyError, TypeError):
+            pass
+
+        # 첫 샘플이 입력된 시각 (장치 간 시작 시점 정렬용)
+        if self.first_capture_time is None:
+            self.first_capture_time = time.monotonic() - self.latency - frame_count / AUDIO_CONFIG['rate']
+
+        # 쓰기 스레드가 밀려 버퍼가 가득 차면 기다리지 않고 버림 (쓰기 스레드가 그 자리를 무음으로 채움)
+        if self._buffer.push(in_data):
+            self.frame_count += 1
+        else:
+            self._buffer.skip(frame_count)
+            self.dropped_frames += frame_count
+
+        fill = self._buffer.fill()
+        if fill > self.max_buffer_fill:
+            self.max_buffer_fill = fill
+        return (None, pyaudio.paContinue)
+
+    def _write(self):
+        """파일 쓰기 스레드"""
+        aligned = self.clock_start is None
+        while not self._buffer.drained():
+            item = self._buffer.pop()
+            if item is None:
+                self._wave_file.maybe_checkpoint()
+                continue
+            gap, data = item
+            if not aligned:
+                # 기준 시각부터 첫 입력까지는 무음으로 채워 다른 트랙과 시작점을 맞춤
+                aligned = True
+                self._write_silence(int(round((self.first_capture_time - self.clock_start)
+                                              * AUDIO_CONFIG['rate'])))
+            # 버려진 청크 자리는 무음으로 채워 이후 시각이 당겨지지 않도록 함
+            self._write_silence(gap)
+            # 헤더는 종료 시 한 번만 갱신 (중간에는 주기적으로 fsync + 체크포인트)
+            self._wave_file.write(data)
+            self._notify('feed', data)
+
+        self._write_silence(self._buffer.trailing_gap())
+        self._notify('close')
+
+    def _write_silence(self, frames):
+        """무음 기록 (파일과 리스너 모두)"""
+        remaining = max(0, frames) * self._frame_bytes
+        block = bytes(AUDIO_CONFIG['chunk'] * self._frame_bytes)
+        while remaining > 0:
+            data = block[:remaining]
+            self._wave_file.write(data)
+            self._notify('feed', data)
+            remaining -= len(data)
+
+    def metrics(self):
+        """캡처 상태 지표 (다른 스레드에서 읽어도 되는 값만 사용)"""
+        rate = AUDIO_CONFIG['rate']
+        return {
+            'chunks': self.frame_count,
+            'recorded_seconds': self.frame_count * AUDIO_CONFIG['chunk'] / rate,
+            'dropped_frames': self.dropped_frames,
+            'dropped_seconds': self.dropped_frames / rate,
+            'overflow_count': self.overflow_count,
+            'latency_ms': self.latency * 1000,
+            'max_latency_ms': self.max_latency * 1000,
+            'buffer_fill': self._buffer.fill() if self._buffer else 0.0,
+            'max_buffer_fill': self.max_buffer_fill
+        }
+
+    def _notify(self, method, *args):
+        """리스너 호출 (리스너 오류가 녹음을 중단시키지 않도록 격리)"""
+        for listener in list(self.listeners):
+            try:
+                getattr(listener, method)(*args)
+            except Exception as e:
+                self.error = f"리스너 오류: {str(e)}"
+                self.listeners.remove(listener)
+
+    def _discard_file(self):
+        """녹음 파일 정리"""
+        if self._wave_file:
+            try:
+                self._wave_file.close()
+            except Exception:
+                pass
+            self._wave_file = None
+        if self.file_path and os.path.exists(self.file_path):
+            os.unlink(self.file_path)
+        self.file_path = None
+
+    def _close_stream(self):
+        """스트림과 PyAudio 정리 (한 단계가 실패해도 장치 핸들이 남지 않도록 나머지도 진행)"""
+        stream, self.stream = self.stream, None
+        audio, self.audio = self.audio, None
+        # stop_stream은 진행 중인 콜백이 끝날 때까지 대기
+        steps = ([stream.stop_stream, stream.close] if stream else []) + ([audio.terminate] if audio else [])
+        for step in steps:
             try:
-                data = self.stream.read(AUDIO_CONFIG['chunk'])
-                self.frames.append(data)
-            except:
-                break
-    
+                step()
+            except Exception as e:
+                self.error = f"장치 정리 오류: {str(e)}"
+
     def stop_recording(self):
-        """녹음 중지 및 파일 생성"""
+        """녹음 중지 및 파일 경로 반환"""
         try:
-            # 녹음 중지
+            # 녹음 중지 (콜백은 다음 호출에서 종료를 알림)
             self.is_recording = False
-            
-            # 스레드 종료 대기
-            if hasattr(self, 'thread'):
-                self.thread.join(timeout=3)
-            
-            # 스트림 정리
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-            
-            # PyAudio 정리
-            if self.audio:
-                self.audio.terminate()
-            
+
+            # 스트림과 PyAudio 정리
+            self._close_stream()
+
+            if self._buffer:
+                self._buffer.close()
+
+            # 남은 버퍼 기록 완료 대기
+            if self.writer_thread:
+                self.writer_thread.join(timeout=10)
+
+            # WAV 헤더 갱신 (데이터 크기 기록)
+            if self._wave_file:
+                self._wave_file.close()
+                self._wave_file = None
+
             # 데이터 확인
-            frame_count = len(self.frames)
-            if frame_count == 0:
+            if self.frame_count == 0:
+                self._discard_file()
                 return None, "녹음된 데이터가 없습니다"
-            
-            # WAV 파일 생성
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-            temp_filename = temp_file.name
-            temp_file.close()
-            
-            # WAV 파일 쓰기
-            wf = wave.open(temp_filename, 'wb')
-            wf.setnchannels(AUDIO_CONFIG['channels'])
-            wf.setsampwidth(2)  # 16비트
-            wf.setframerate(AUDIO_CONFIG['rate'])
-            wf.writeframes(b''.join(self.frames))
-            wf.close()
-            
+
             # 파일 크기 확인
-            file_size = os.path.getsize(temp_filename)
-            
+            file_size = os.path.getsize(self.file_path)
+
             if file_size > 44:  # WAV 헤더보다 큰지 확인
-                # 파일을 메모리로 읽기
-                with open(temp_filename, 'rb') as f:
-                    file_data = f.read()
-                
-                return file_data, temp_filename
+                message = f"녹음 완료 ({file_size} bytes)"
+                if self.dropped_frames or self.overflow_count:
+                    message += (f" - 유실 {self.dropped_frames / AUDIO_CONFIG['rate']:.2f}초, "
+                                f"입력 오버플로 {self.overflow_count}회")
+                return self.file_path, message
             else:
-                os.unlink(temp_filename)
+                self._discard_file()
                 return None, f"파일이 너무 작습니다 ({file_size} bytes)"
-                
+
+        except Exception as e:
+            return None, f"녹음 종료 실패: {str(e)}"
+
+    def abort_recording(self):
+        """녹음 취소 (캡처 스레드, 스트림, 장치를 모두 정리하고 파일 삭제)"""
+        path, _ = self.stop_recording()
+        if path and os.path.exists(path):
+            os.unlink(path)
+        self._discard_file()
+
+
+class _TrackInput:
+    """TrackMixer에 트랙 하나의 데이터를 전달하는 리스너"""
+
+    def __init__(self, mixer, index):
+        self.mixer = mixer
+        self.index = index
+
+    def open(self, channels, sample_width, rate):
+        self.mixer.open_track(self.index, channels, sample_width, rate)
+
+    def feed(self, data):
+        self.mixer.feed_track(self.index, data)
+
+    def close(self):
+        self.mixer.close_track(self.index)
+
+
+class TrackMixer:
+    """여러 트랙을 시간축을 맞춰 모노로 믹스다운하여 파일과 리스너에 전달
+
+    각 트랙의 쓰기 스레드에서 호출되며, 모든 트랙에 데이터가 있는 구간까지만 합쳐서 기록
+    """
+
+    def __init__(self, track_count, listeners, recording_id):
+        self.listeners = listeners
+        self.recording_id = recording_id
+        self.file_path = None
+        self.frame_count = 0
+        self.error = None
+        self.done = threading.Event()
+        self._channels = [1] * track_count
+        self._pending = [np.zeros(0, dtype=np.float32) for _ in range(track_count)]
+        # 늦은 트랙 대신 무음으로 채운 양 (나중에 도착한 같은 구간은 버림)
+        self._skipped = [0] * track_count
+        self._closed = [False] * track_count
+        self._wave_file = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """믹스다운 파일을 열고 리스너에 시작 알림"""
+        os.makedirs(AUDIO_CONFIG['recording_dir'], exist_ok=True)
+        fd, self.file_path = tempfile.mkstemp(suffix=".wav", dir=AUDIO_CONFIG['recording_dir'])
+        os.close(fd)
+        self._wave_file = CheckpointedWave(self.file_path, 1, 2, AUDIO_CONFIG['rate'], {
+            'recording_id': self.recording_id,
+            'role': 'mix',
+            'track': None
+        })
+        for listener in self.listeners:
+            listener.open(1, 2, AUDIO_CONFIG['rate'])
+
+    def track(self, index):
+        return _TrackInput(self, index)
+
+    def open_track(self, index, channels, sample_width, rate):
+        if sample_width != 2 or rate != AUDIO_CONFIG['rate']:
+            raise ValueError("모든 트랙은 같은 샘플레이트의 16비트 녹음이어야 합니다")
+        self._channels[index] = channels
+
+    def feed_track(self, index, data):
+        samples = np.frombuffer(data, dtype='<i2').reshape(-1, self._channels[index])
+        mono = samples.mean(axis=1, dtype=np.float32)
+        with self._lock:
+            late = min(self._skipped[index], len(mono))
+            self._skipped[index] -= late
+            mono = mono[late:]
+            self._pending[index] = np.concatenate((self._pending[index], mono))
+            self._mix()
+
+    def close_track(self, index):
+        with self._lock:
+            if self._closed[index]:
+                return
+            self._closed[index] = True
+            if not all(self._closed):
+                self._mix()
+                return
+            # 마지막 트랙이 끝나면 남은 데이터를 모두 기록
+            self._mix(final=True)
+            self._wave_file.close()
+            self._wave_file = None
+        self._notify('close')
+        self.done.set()
+
+    def _mix(self, final=False):
+        """모든 진행 중인 트랙에 데이터가 있는 길이만큼 평균하여 기록"""
+        lengths = [len(pending) for pending in self._pending]
+        active = [length for length, closed in zip(lengths, self._closed) if not closed]
+        count = max(lengths) if final or not active else min(active)
+
+        # 멈춘 장치 때문에 전체가 밀리지 않도록 시차가 크면 늦은 트랙은 무음으로 처리
+        max_skew = int(AUDIO_CONFIG['max_track_skew_seconds'] * AUDIO_CONFIG['rate'])
+        count = max(count, max(lengths) - max_skew)
+        if count <= 0:
+            return
+
+        mix = np.zeros(count, dtype=np.float32)
+        for index, pending in enumerate(self._pending):
+            taken = pending[:count]
+            mix[:len(taken)] += taken
+            self._pending[index] = pending[len(taken):]
+            if not self._closed[index]:
+                self._skipped[index] += count - len(taken)
+        mix /= len(self._pending)
+
+        data = np.clip(np.round(mix), -32768, 32767).astype('<i2').tobytes()
+        self._wave_file.write(data)
+        self.frame_count += 1
+        self._notify('feed', data)
+
+    def _notify(self, method, *args):
+        """리스너 호출 (리스너 오류가 녹음을 중단시키지 않도록 격리)"""
+        for listener in list(self.listeners):
+            try:
+                getattr(listener, method)(*args)
+            except Exception as e:
+                self.error = f"리스너 오류: {str(e)}"
+                self.listeners.remove(listener)
+
+    def discard(self):
+        """믹스다운 파일 정리"""
+        if self._wave_file:
+            try:
+                self._wave_file.close()
+            except Exception:
+                pass
+            self._wave_file = None
+        if self.file_path and os.path.exists(self.file_path):
+            os.unlink(self.file_path)
+        self.file_path = None
+
+
+class MultiTrackRecorder:
+    """여러 입력 장치를 같은 기준 시각으로 동시에 녹음하는 레코더
+
+    장치마다 PerfectRecorder(콜백 + 쓰기 스레드)가 트랙 파일을 따로 기록하고,
+    TrackMixer가 믹스다운 파일을 만들어 리스너에 전달함 (PerfectRecorder와 같은 인터페이스)
+    """
+
+    def __init__(self, devices):
+        self.tracks = [PerfectRecorder(device_index=device) for device in devices]
+        self.listeners = []
+        self.mixer = None
+        self.file_path = None
+        self.track_paths = []
+        self.error = None
+
+    @property
+    def is_recording(self):
+        return any(track.is_recording for track in self.tracks)
+
+    @is_recording.setter
+    def is_recording(self, value):
+        for track in self.tracks:
+            track.is_recording = value
+
+    @property
+    def frame_count(self):
+        return min(track.frame_count for track in self.tracks)
+
+    def add_listener(self, listener):
+        """믹스다운 데이터를 받을 리스너 등록 (open/feed/close 메서드 필요)"""
+        self.listeners.append(listener)
+
+    def start_recording(self):
+        """모든 장치 녹음 시작 (하나라도 실패하면 전체 취소)"""
+        self.error = None
+        self.track_paths = []
+        recording_id = uuid.uuid4().hex
+        self.mixer = TrackMixer(len(self.tracks), self.listeners, recording_id)
+        try:
+            self.mixer.start()
         except Exception as e:
-            return None, f"녹음 종료 실패: {str(e)}"
\ No newline at end of file
+            self.mixer.discard()
+            return False, f"녹음 시작 실패: {str(e)}"
+
+        clock_start = time.monotonic()
+        for index, track in enumerate(self.tracks):
+            track.clock_start = clock_start
+            track.recording_id = recording_id
+            track.track_index = index
+            track.listeners = [self.mixer.track(index)]
+            success, message = track.start_recording()
+            if not success:
+                for started in self.tracks[:index]:
+                    started.abort_recording()
+                # 시작하지 못한 트랙도 종료 처리하여 믹서가 리스너(인코더, 실시간 인식)를 닫도록 함
+                for rest in range(index, len(self.tracks)):
+                    self.mixer.close_track(rest)
+                self.mixer.discard()
+                return False, f"{index + 1}번 트랙 ({track.device_index}번 장치): {message}"
+
+        return True, f"녹음 시작 성공 ({len(self.tracks)}개 트랙)"
+
+    def stop_recording(self):
+        """모든 트랙 종료 후 믹스다운 파일 경로 반환 (트랙 파일은 track_paths)"""
+        results = [track.stop_recording() for track in self.tracks]
+        self.track_paths = [path for path, _ in results if path]
+
+        if not self.mixer.done.wait(timeout=10):
+            return None, "믹스다운이 제한 시간 내에 끝나지 않았습니다"
+        self.error = self.mixer.error or next((track.error for track in self.tracks if track.error), None)
+
+        if not self.track_paths or self.mixer.frame_count == 0:
+            self.mixer.discard()
+            return None, results[0][1]
+
+        self.file_path = self.mixer.file_path
+        metrics = self.metrics()
+        message = f"녹음 완료 ({len(self.track_paths)}개 트랙, {os.path.getsize(self.file_path)} bytes)"
+        if metrics['dropped_frames'] or metrics['overflow_count']:
+            message += (f" - 유실 {metrics['dropped_seconds']:.2f}초, "
+                        f"입력 오버플로 {metrics['overflow_count']}회")
+        return self.file_path, message
+
+    def abort_recording(self):
+        """모든 트랙 녹음 취소 (트랙별 캡처 스레드와 장치 정리 후 트랙/믹스다운 파일 삭제)"""
+        for track in self.tracks:
+            track.abort_recording()
+        if self.mixer:
+            self.mixer.done.wait(timeout=10)
+            self.mixer.discard()
+        self.track_paths = []
+        self.file_path = None
+
+    def metrics(self):
+        """트랙별 지표와 전체 지표 (유실은 합계, 지연/버퍼는 최대값)"""
+        tracks = [track.metrics() for track in self.tracks]
+        return {
+            'chunks': min(metrics['chunks'] for metrics in tracks),
+            'recorded_seconds': min(metrics['recorded_seconds'] for metrics in tracks),
+            'dropped_frames': sum(metrics['dropped_frames'] for metrics in tracks),
+            'dropped_seconds': sum(metrics['dropped_seconds'] for metrics in tracks),
+            'overflow_count': sum(metrics['overflow_count'] for metrics in tracks),
+            'latency_ms': max(metrics['latency_ms'] for metrics in tracks),
+            'max_latency_ms': max(metrics['max_latency_ms'] for metrics in tracks),
+            'buffer_fill': max(metrics['buffer_fill'] for metrics in tracks),
+            'max_buffer_fill': max(metrics['max_buffer_fill'] for metrics in tracks),
+            'tracks': tracks
+        }
+
+
+def create_recorder():
+    """설정된 입력 장치 수에 맞는 레코더 생성"""
+    devices = AUDIO_CONFIG['devices']
+    if len(devices) > 1:
+        return MultiTrackRecorder(devices)
+    return PerfectRecorder(device_index=devices[0] if devices else None)
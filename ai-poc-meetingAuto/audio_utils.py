@@ -0,0 +1,86 @@
+# audio_utils.py
+import struct
+import wave
+import numpy as np
+
+# 한 번에 분석할 블록 길이 (초) - 긴 녹음도 메모리 사용량을 일정하게 유지
+ANALYSIS_BLOCK_SECONDS = 60
+
+
+def _find_data_chunk(path):
+    """WAV 파일에서 data 청크의 시작 위치와 크기 찾기"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError("WAV 파일이 아닙니다")
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError("data 청크를 찾을 수 없습니다")
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+            if chunk_id == b'data':
+                return f.tell(), chunk_size
+            # 청크는 2바이트 단위로 정렬됨
+            f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+def open_pcm(path):
+    """16비트 WAV 파일을 (프레임 수, 채널 수) 형태의 메모리 매핑 배열로 열기"""
+    with wave.open(path, 'rb') as wf:
+        channels = wf.getnchannels()
+        sample_width = wf.getsampwidth()
+        rate = wf.getframerate()
+
+    if sample_width != 2:
+        raise ValueError(f"16비트 PCM만 지원합니다 (sample width: {sample_width})")
+
+    offset, size = _find_data_chunk(path)
+    frame_count = size // (sample_width * channels)
+    if frame_count == 0:
+        return np.zeros((0, channels), dtype=np.int16), rate
+
+    samples = np.memmap(path, dtype='<i2', mode='r', offset=offset,
+                        shape=(frame_count, channels))
+    return samples, rate
+
+
+def wav_duration(path):
+    """WAV 헤더로 재생 길이(초) 계산 (WAV가 아니면 0)"""
+    try:
+        with wave.open(path, 'rb') as wf:
+            rate = wf.getframerate()
+            return wf.getnframes() / rate if rate else 0.0
+    except (OSError, EOFError, wave.Error):
+        return 0.0
+
+
+def to_mono(samples):
+    """다채널 샘플을 float32 모노로 변환"""
+    if samples.ndim == 2 and samples.shape[1] > 1:
+        return samples.mean(axis=1, dtype=np.float32)
+    return samples.reshape(-1).astype(np.float32)
+
+
+def frame_rms(samples, rate, window_seconds):
+    """고정 길이 윈도우별 RMS 에너지 계산"""
+    window = max(1, int(rate * window_seconds))
+    block = window * max(1, int(ANALYSIS_BLOCK_SECONDS / window_seconds))
+    window_count = len(samples) // window
+    rms = np.empty(window_count, dtype=np.float32)
+
+    for start in range(0, window_count * window, block):
+        end = min(start + block, window_count * window)
+        mono = to_mono(samples[start:end]).reshape(-1, window)
+        rms[start // window:end // window] = np.sqrt(np.mean(mono * mono, axis=1))
+
+    return rms
+
+
+def write_wav(path, samples, rate):
+    """int16 샘플을 WAV 파일로 저장"""
+    channels = samples.shape[1] if samples.ndim == 2 else 1
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.ascontiguousarray(samples, dtype='<i2').tobytes())
@@ -0,0 +1,306 @@
+# batch_process.py
+"""저장된 회의 녹음 파일 일괄 처리
+
+화면 없이 여러 오디오 파일을 프로세스 풀에서 동시에 처리하여 녹취록/요약 파일을 만듦
+중간에 중단되어도 체크포인트 파일을 기준으로 끝난 파일은 건너뛰고 이어서 처리
+    python batch_process.py recordings/ --output batch_output
+    python batch_process.py "recordings/2024-*.wav" --workers 4 --no-summary
+    python batch_process.py recordings/ --formats txt,srt,json
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from audio_utils import open_pcm, ANALYSIS_BLOCK_SECONDS
+from config import OPENAI_CONFIG
+from tracing import traced
+from transcript_model import FORMATS
+
+try:
+    import soundfile
+except ImportError:  # soundfile이 없으면 16비트 WAV만 처리
+    soundfile = None
+
+# soundfile(libsndfile)로 읽는 형식
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg')
+# ffmpeg가 설치되어 있을 때만 처리하는 압축 형식
+FFMPEG_EXTENSIONS = ('.mp3', '.m4a')
+CHECKPOINT_FILE = 'batch_checkpoint.json'
+REPORT_FILE = 'batch_report.json'
+
+# 워커 프로세스마다 하나씩 만드는 서비스
+_service = None
+
+
+def supported_extensions():
+    """처리할 수 있는 오디오 확장자 (mp3/m4a는 ffmpeg가 있어야 변환 가능)"""
+    return AUDIO_EXTENSIONS + (FFMPEG_EXTENSIONS if shutil.which('ffmpeg') else ())
+
+
+def find_audio_files(inputs):
+    """디렉터리/글롭/파일 경로 목록에서 오디오 파일 찾기"""
+    extensions = supported_extensions()
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item)
+        files.extend(path for path in candidates
+                     if os.path.isfile(path) and path.lower().endswith(extensions))
+    return sorted({os.path.abspath(path) for path in files})
+
+
+def _file_signature(path):
+    """파일이 바뀌었는지 확인하기 위한 크기/수정 시각"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _prepare_wav(path, directory):
+    """파이프라인이 읽을 수 있는 16비트 WAV 경로 반환 (변환했으면 임시 파일 여부 True)"""
+    if path.lower().endswith(FFMPEG_EXTENSIONS):
+        return _decode_ffmpeg(path, directory), True
+
+    try:
+        open_pcm(path)
+        return path, False
+    except (ValueError, wave.Error, EOFError):
+        if soundfile is None:
+            raise ValueError("16비트 WAV가 아닌 파일은 soundfile 패키지가 있어야 처리할 수 있습니다")
+
+    info = soundfile.info(path)
+    fd, wav_path = tempfile.mkstemp(suffix=".wav", dir=directory)
+    os.close(fd)
+    try:
+        with wave.open(wav_path, 'wb') as wf:
+            wf.setnchannels(info.channels)
+            wf.setsampwidth(2)
+            wf.setframerate(info.samplerate)
+            # 긴 파일도 메모리 사용량이 일정하도록 블록 단위로 변환
+            blocksize = int(ANALYSIS_BLOCK_SECONDS * info.samplerate)
+            for block in soundfile.blocks(path, blocksize=blocksize, dtype='int16', always_2d=True):
+                wf.writeframesraw(block.tobytes())
+    except Exception:
+        os.unlink(wav_path)
+        raise
+    return wav_path, True
+
+
+def _decode_ffmpeg(path, directory):
+    """ffmpeg로 mp3/m4a를 16비트 WAV로 변환 (샘플레이트와 채널 수는 원본 유지)"""
+    if shutil.which('ffmpeg') is None:
+        raise ValueError("mp3/m4a 파일은 ffmpeg가 설치되어 있어야 처리할 수 있습니다")
+
+    fd, wav_path = tempfile.mkstemp(suffix=".wav", dir=directory)
+    os.close(fd)
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', path, '-vn', '-acodec', 'pcm_s16le', '-f', 'wav', wav_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        os.unlink(wav_path)
+        raise ValueError(f"ffmpeg 변환 실패: {result.stderr.strip()[-500:]}")
+    return wav_path
+
+
+def _init_worker(workers):
+    """워커 프로세스 초기화 (요청 한도는 프로세스 수로 나눠서 적용)"""
+    global _service
+    OPENAI_CONFIG['requests_per_minute'] = max(1, OPENAI_CONFIG['requests_per_minute'] // workers)
+    OPENAI_CONFIG['tokens_per_minute'] = max(1, OPENAI_CONFIG['tokens_per_minute'] // workers)
+
+    from transcription_service import TranscriptionService
+    _service = TranscriptionService()
+
+
+@traced('pipeline')
+def process_file(audio_path, output_dir, summarize=True, formats=('txt',)):
+    """파일 하나를 녹취록/요약까지 처리 (워커 프로세스에서 실행)
+
+    반환값: 체크포인트에 기록할 결과 dict
+    """
+    service = _service
+    stages = {}
+    started = time.perf_counter()
+
+    def run_stage(name, func, *args):
+        stage_started = time.perf_counter()
+        value, error = func(*args)
+        stages[name] = round(time.perf_counter() - stage_started, 3)
+        if error:
+            raise RuntimeError(error)
+        return value
+
+    wav_path, converted = _prepare_wav(audio_path, output_dir)
+    try:
+        samples, rate = open_pcm(wav_path)
+        audio_seconds = len(samples) / rate if rate else 0.0
+        del samples
+
+        transcript_data = run_stage('transcribe', service.transcribe_audio, wav_path)
+        segments = run_stage('segment', service.process_segments, transcript_data, wav_path)
+        transcript = run_stage('transcript', service.create_transcript, segments)
+        transcript_text = transcript.to_txt()
+        summary = None
+        if summarize and not service.can_summarize():
+            print(f"  ℹ️ {os.path.basename(audio_path)}: OpenAI API 키가 없어 요약을 건너뜁니다")
+        elif summarize:
+            summary = run_stage('summary', service.create_summary, transcript_text)
+    finally:
+        if converted:
+            os.unlink(wav_path)
+
+    stem = os.path.splitext(os.path.basename(audio_path))[0]
+    # 모든 단계가 끝난 뒤 색인 (재실행 시 같은 회의가 중복 색인되지 않도록)
+    meeting_id, error = service.index_transcript(transcript, stem)
+    if error:
+        print(f"  ⚠️ {stem}: {error}")
+    else:
+        if summary is not None:
+            service.index_summary(meeting_id, summary)
+        _, error = service.index_semantic(meeting_id, transcript, stem)
+        if error:
+            print(f"  ⚠️ {stem}: {error}")
+
+    contents = {}
+    for fmt in formats:
+        kind = 'transcript' if fmt == 'txt' else f"transcript_{fmt}"
+        contents[kind] = (f"{stem}.transcript.{FORMATS[fmt][1]}",
+                          transcript_text if fmt == 'txt' else transcript.render(fmt))
+    if summary is not None:
+        contents['summary'] = (f"{stem}.summary.txt", summary)
+
+    outputs = {}
+    for kind, (name, content) in contents.items():
+        outputs[kind] = os.path.join(output_dir, name)
+        with open(outputs[kind], 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    return {
+        'audio_seconds': round(audio_seconds, 2),
+        'seconds': round(time.perf_counter() - started, 3),
+        'stages': stages,
+        'outputs': outputs,
+        'meeting_id': meeting_id
+    }
+
+
+class Checkpoint:
+    """파일별 처리 결과를 기록하는 JSON 체크포인트"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+
+    def is_done(self, audio_path):
+        """같은 파일을 이미 성공적으로 처리했는지 확인"""
+        entry = self.entries.get(audio_path)
+        return (entry is not None and entry['status'] == 'done'
+                and entry['signature'] == _file_signature(audio_path)
+                and all(os.path.exists(path) for path in entry['outputs'].values()))
+
+    def record(self, audio_path, entry):
+        """결과 기록 후 바로 저장 (임시 파일에 쓰고 교체)"""
+        self.entries[audio_path] = entry
+        directory = os.path.dirname(self.path)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def build_report(results, wall_seconds, workers):
+    """이번 실행의 처리량 보고서"""
+    done = [entry for entry in results if entry['status'] == 'done']
+    audio_seconds = sum(entry['audio_seconds'] for entry in done)
+    stage_seconds = {}
+    for entry in done:
+        for stage, seconds in entry['stages'].items():
+            stage_seconds[stage] = round(stage_seconds.get(stage, 0.0) + seconds, 3)
+
+    return {
+        'workers': workers,
+        'files_done': len(done),
+        'files_failed': len(results) - len(done),
+        'wall_seconds': round(wall_seconds, 2),
+        'audio_seconds': round(audio_seconds, 2),
+        # 실제 시간 1초에 처리한 오디오 길이 (초)
+        'realtime_factor': round(audio_seconds / wall_seconds, 2) if wall_seconds else 0.0,
+        'files_per_hour': round(len(done) / wall_seconds * 3600, 1) if wall_seconds else 0.0,
+        'stage_seconds': stage_seconds
+    }
+
+
+def run(files, output_dir, workers, summarize=True, formats=('txt',)):
+    """처리되지 않은 파일만 프로세스 풀에서 처리하고 보고서 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = Checkpoint(os.path.join(output_dir, CHECKPOINT_FILE))
+
+    pending = [path for path in files if not checkpoint.is_done(path)]
+    print(f"📂 전체 {len(files)}개 중 {len(files) - len(pending)}개 완료됨, {len(pending)}개 처리 시작")
+
+    results = []
+    started = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(workers,)) as executor:
+            futures = {executor.submit(process_file, path, output_dir, summarize, formats): path for path in pending}
+            for future in as_completed(futures):
+                audio_path = futures[future]
+                try:
+                    entry = {'status': 'done', **future.result()}
+                    print(f"  ✅ {os.path.basename(audio_path)} "
+                          f"({entry['audio_seconds']:.0f}초 오디오, {entry['seconds']:.1f}초 소요)")
+                except Exception as e:
+                    entry = {'status': 'failed', 'error': str(e), 'audio_seconds': 0.0,
+                             'stages': {}, 'outputs': {}}
+                    print(f"  ❌ {os.path.basename(audio_path)}: {e}")
+                entry['signature'] = _file_signature(audio_path)
+                checkpoint.record(audio_path, entry)
+                results.append(entry)
+
+    report = build_report(results, time.perf_counter() - started, workers)
+    with open(os.path.join(output_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회의 녹음 파일 일괄 처리")
+    parser.add_argument('inputs', nargs='+', help="오디오 파일, 디렉터리 또는 글롭 패턴")
+    parser.add_argument('--output', default='batch_output', help="녹취록/요약/체크포인트 저장 디렉터리")
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help="동시에 처리할 파일 수 (프로세스 수)")
+    parser.add_argument('--no-summary', action='store_true', help="요약 생성 생략")
+    parser.add_argument('--formats', default='txt',
+                        help=f"녹취록 저장 형식 (쉼표로 구분: {', '.join(FORMATS)})")
+    args = parser.parse_args()
+
+    formats = tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip())
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown or not formats:
+        parser.error(f"지원하지 않는 형식입니다: {', '.join(unknown) or args.formats}")
+
+    files = find_audio_files(args.inputs)
+    if not files:
+        parser.error("처리할 오디오 파일이 없습니다")
+
+    report = run(files, os.path.abspath(args.output), args.workers, summarize=not args.no_summary,
+                 formats=formats)
+    print(f"\n📊 {report['files_done']}개 완료 / {report['files_failed']}개 실패, "
+          f"{report['wall_seconds']:.1f}초 동안 오디오 {report['audio_seconds']:.0f}초 처리 "
+          f"(실시간 대비 {report['realtime_factor']:.1f}배, 시간당 {report['files_per_hour']:.0f}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+# benchmark.py
+"""회의 처리 파이프라인 벤치마크
+
+로컬 Mock OpenAI 서버와 합성 WAV로 단계별 소요 시간, 최대 메모리(RSS), API 호출 수를 측정
+    python benchmark.py --durations 60,600,3600,10800
+    python benchmark.py --durations 60 --compare benchmark_results/이전결과.json
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+import wave
+from datetime import datetime
+import numpy as np
+from config import (AUDIO_CONFIG, OPENAI_CONFIG, CACHE_CONFIG, INDEX_CONFIG, SEMANTIC_CONFIG,
+                    ARTIFACT_CONFIG, TRACING_CONFIG)
+from mock_openai_server import start_server
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+# 화자 분리 점검용 합성 음성의 모음별 포먼트 (Hz)
+VOWEL_FORMANTS = [(730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240), (530, 1840, 2480), (570, 840, 2410)]
+
+
+def synthesize_meeting(path, seconds, rate, speakers=3, seed=0):
+    """여러 화자가 번갈아 말하는 듯한 합성 WAV 생성 (블록 단위로 기록)"""
+    rng = np.random.default_rng(seed)
+    pitches = [110.0 * (1.4 ** i) for i in range(speakers)]
+    total = int(seconds * rate)
+
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+
+        written = 0
+        while written < total:
+            # 발언 구간 (배음이 있는 톤 + 잡음) 뒤에 짧은 침묵
+            speech = min(int(rng.uniform(2, 6) * rate), total - written)
+            t = np.arange(speech) / rate
+            pitch = pitches[rng.integers(speakers)]
+            voice = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 8))
+            envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+            block = voice * envelope * 4000 + rng.normal(0, 60, speech)
+            wf.writeframes(block.astype('<i2').tobytes())
+            written += speech
+
+            silence = min(int(rng.uniform(0.3, 3.0) * rate), total - written)
+            wf.writeframes(rng.normal(0, 60, silence).astype('<i2').tobytes())
+            written += silence
+
+
+def _formant_response(formants, rate, taps=512):
+    """포먼트마다 2차 공진기를 직렬로 연결한 필터의 임펄스 응답"""
+    k = np.arange(taps)
+    response = np.zeros(taps)
+    response[0] = 1.0
+    for formant in formants:
+        radius = np.exp(-np.pi * 100 / rate)
+        theta = 2 * np.pi * formant / rate
+        resonator = (1 - radius) * radius ** k * np.sin(theta * (k + 1)) / np.sin(theta)
+        response = np.convolve(response, resonator)[:taps]
+    return response
+
+
+def synthesize_voice(rng, pitch, tract, seconds, rate):
+    """성대 펄스를 모음 포먼트 필터에 통과시킨 합성 음성 (tract: 성도 길이에 따른 포먼트 배율)"""
+    block = int(0.25 * rate)
+    parts = []
+    for _ in range(max(1, int(seconds / 0.25))):
+        source = np.zeros(block)
+        source[np.arange(0, block, rate / (pitch * rng.uniform(0.9, 1.1))).astype(int)] = 1.0
+        formants = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+        response = _formant_response([formant * tract for formant in formants], rate)
+        size = block + len(response)
+        parts.append(np.fft.irfft(np.fft.rfft(source, size) * np.fft.rfft(response, size), size)[:block])
+    voice = np.concatenate(parts)
+    voice *= 4000 * rng.uniform(0.5, 1.5) / (np.abs(voice).max() + 1e-9)
+    return voice + rng.normal(0, 30, len(voice))
+
+
+def check_diarization(rate=16000, turns=30, seed=0):
+    """화자 분리 점검: 한 화자는 한 화자로 남고, 뚜렷이 다른 두 화자는 둘로 나뉘는지
+
+    반환값: 경우별 화자 수와 일치율(예측 화자마다 가장 많은 실제 화자 비율), 통과 여부
+    """
+    from diarization import MfccDiarizer
+    from transcript_model import Segment
+
+    rng = np.random.default_rng(seed)
+    voices = [(120.0, 1.0), (210.0, 1.18)]
+    cases = {
+        'one_speaker': [0] * turns,
+        'two_speakers': [int(speaker) for speaker in rng.integers(len(voices), size=turns)]
+    }
+
+    report = {}
+    for name, speakers in cases.items():
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            segments = []
+            position = 0.0
+            with wave.open(path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(rate)
+                for speaker in speakers:
+                    voice = synthesize_voice(rng, *voices[speaker], rng.uniform(1.5, 8), rate)
+                    wf.writeframes(np.clip(voice, -32768, 32767).astype('<i2').tobytes())
+                    segments.append(Segment(position, position + len(voice) / rate, None, ''))
+                    position += len(voice) / rate
+            labels = MfccDiarizer().assign(segments, path)
+        finally:
+            os.unlink(path)
+
+        matched = sum(max(sum(1 for label, speaker in zip(labels, speakers) if label == predicted and speaker == actual)
+                          for actual in set(speakers))
+                      for predicted in set(labels))
+        report[name] = {'speakers': len(set(labels)), 'agreement': round(matched / len(labels), 3)}
+
+    report['passed'] = (report['one_speaker']['speakers'] == 1
+                        and report['two_speakers']['speakers'] == 2
+                        and report['two_speakers']['agreement'] >= 0.9)
+    return report
+
+
+class RssSampler:
+    """측정 구간 동안 프로세스 RSS 최대값 기록"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._running = False
+        self._thread = None
+
+    @staticmethod
+    def current_rss():
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            # /proc가 없는 환경은 프로세스 전체 최대값으로 대체
+            usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return usage if os.uname().sysname == 'Darwin' else usage * 1024
+
+    def _run(self):
+        while self._running:
+            self.peak = max(self.peak, self.current_rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current_rss()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        self._thread.join()
+        self.peak = max(self.peak, self.current_rss())
+
+
+class Benchmark:
+    """단계별 측정 실행기"""
+
+    def __init__(self, server_url):
+        self.server_url = server_url
+
+    def _api_calls(self):
+        with urllib.request.urlopen(f"{self.server_url}/stats") as response:
+            return json.load(response)
+
+    def _reset_api_calls(self):
+        request = urllib.request.Request(f"{self.server_url}/reset", data=b'', method='POST')
+        urllib.request.urlopen(request).close()
+
+    def measure(self, stage, func, *args):
+        """함수 하나를 실행하며 시간/메모리/API 호출 수 측정"""
+        self._reset_api_calls()
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            value, error = func(*args)
+            seconds = time.perf_counter() - started
+
+        result = {
+            'stage': stage,
+            'seconds': round(seconds, 3),
+            'peak_rss_mb': round(sampler.peak / (1024 * 1024), 1),
+            'api_calls': self._api_calls(),
+            'error': error
+        }
+        return result, value
+
+
+def git_commit():
+    """현재 커밋 해시 (git이 없으면 unknown)"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(durations, rate, latency, audio_latency):
+    """길이별로 각 단계와 전체 파이프라인 측정"""
+    server, server_url = start_server(latency=latency, audio_latency=audio_latency)
+
+    # Mock 서버로 연결하고 캐시는 끔
+    # 합성 회의가 지난 회의 검색, 결과 파일, 단계 기록에 섞이지 않도록 모두 임시 디렉터리 사용 후 삭제
+    OPENAI_CONFIG['api_key'] = OPENAI_CONFIG['api_key'] or 'mock-key'
+    OPENAI_CONFIG['base_url'] = f"{server_url}/v1"
+    CACHE_CONFIG['enabled'] = False
+    work_dir = tempfile.mkdtemp(prefix='benchmark_')
+    INDEX_CONFIG['db_path'] = os.path.join(work_dir, 'meetings.db')
+    SEMANTIC_CONFIG['root_dir'] = os.path.join(work_dir, 'semantic')
+    ARTIFACT_CONFIG['root_dir'] = os.path.join(work_dir, 'artifacts')
+    TRACING_CONFIG['log_path'] = os.path.join(work_dir, 'traces', 'traces.jsonl')
+
+    from transcription_service import TranscriptionService
+    from recording_controller import RecordingController
+
+    service = TranscriptionService()
+    controller = RecordingController(service)
+    bench = Benchmark(server_url)
+    results = []
+
+    try:
+        for seconds in durations:
+            fd, audio_path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                print(f"▶ {seconds}초 합성 오디오 생성 중...")
+                synthesize_meeting(audio_path, seconds, rate)
+
+                stages = []
+                result, transcript_data = bench.measure('transcribe_audio', service.transcribe_audio, audio_path)
+                stages.append(result)
+                result, segments = bench.measure('process_segments', service.process_segments,
+                                                 transcript_data, audio_path)
+                stages.append(result)
+                result, transcript = bench.measure('create_transcript', service.create_transcript, segments)
+                stages.append(result)
+                result, _ = bench.measure('create_summary', service.create_summary, transcript.to_txt())
+                stages.append(result)
+                result, _ = bench.measure('pipeline', controller._process_audio,
+                                          lambda *args, **kwargs: None, audio_path)
+                stages.append(result)
+
+                for stage in stages:
+                    print(f"  {stage['stage']:<18} {stage['seconds']:>8.2f}초 "
+                          f"{stage['peak_rss_mb']:>8.1f}MB  {stage['api_calls']}")
+                results.append({
+                    'audio_seconds': seconds,
+                    'audio_bytes': os.path.getsize(audio_path),
+                    'stages': stages
+                })
+            finally:
+                os.unlink(audio_path)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def compare(current, baseline_path):
+    """이전 결과 대비 단계별 소요 시간 변화 출력"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous = {
+        (item['audio_seconds'], stage['stage']): stage
+        for item in baseline['results'] for stage in item['stages']
+    }
+    print(f"\n📊 {baseline['commit']} 대비 변화")
+    for item in current['results']:
+        for stage in item['stages']:
+            before = previous.get((item['audio_seconds'], stage['stage']))
+            if not before or not before['seconds']:
+                continue
+            change = (stage['seconds'] - before['seconds']) / before['seconds'] * 100
+            print(f"  {item['audio_seconds']:>6}초 {stage['stage']:<18} "
+                  f"{before['seconds']:>8.2f} → {stage['seconds']:>8.2f}초 ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회의 처리 파이프라인 벤치마크")
+    parser.add_argument('--durations', default='60,600,3600,10800',
+                        help="합성 오디오 길이 목록 (초, 쉼표 구분)")
+    parser.add_argument('--rate', type=int, default=AUDIO_CONFIG['rate'], help="합성 오디오 샘플레이트")
+    parser.add_argument('--latency', type=float, default=0.2, help="Mock API 요청당 지연 (초)")
+    parser.add_argument('--audio-latency', type=float, default=0.01, help="Mock API 오디오 1초당 지연 (초)")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로")
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    durations = [int(value) for value in args.durations.split(',') if value]
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'settings': {
+            'rate': args.rate,
+            'latency': args.latency,
+            'audio_latency': args.audio_latency
+        },
+        'results': run(durations, args.rate, args.latency, args.audio_latency),
+        'diarization_check': check_diarization()
+    }
+    check = report['diarization_check']
+    print(f"\n👥 화자 분리 점검: {'통과' if check['passed'] else '실패'} "
+          f"(한 화자 → {check['one_speaker']['speakers']}명, "
+          f"두 화자 → {check['two_speakers']['speakers']}명, 일치율 {check['two_speakers']['agreement']:.0%})")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{report['commit']}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# config.py
+import os
+import tempfile
+from dotenv import load_dotenv
+
+# 환경변수 로딩
+load_dotenv()
+
+# 애플리케이션 설정
+APP_CONFIG = {
+    'page_title': '실시간 녹음 + 녹취록 생성',
+    'page_icon': '🎙️',
+    # 녹취록 화면에 한 번에 표시할 발언 수
+    'transcript_page_size': 50
+}
+
+# 오디오 녹음 설정
+AUDIO_CONFIG = {
+    'format': 'paInt16',
+    'channels': 1,
+    'rate': 44100,
+    'chunk': 1024,
+    # 오디오 콜백과 파일 쓰기 스레드 사이의 링 버퍼 크기 (청크 개수, 가득 차면 유실)
+    'buffer_chunks': 256,
+    # 녹음 파일 저장 위치
+    'recording_dir': os.path.join(tempfile.gettempdir(), 'meeting_recordings'),
+    # 녹음 중 디스크에 확정(fsync)하는 주기 (초, 비정상 종료 시 이 시간만큼만 유실될 수 있음)
+    'checkpoint_seconds': 5,
+    # 동시에 녹음할 입력 장치 번호 (예: AUDIO_DEVICES=1,3 / 비우면 기본 장치 하나)
+    'devices': [int(index) for index in os.getenv('AUDIO_DEVICES', '').split(',') if index.strip()],
+    # 장치 사이 도착 시차가 이보다 커지면 늦은 트랙은 무음으로 채워 믹스다운 진행 (초)
+    'max_track_skew_seconds': 2.0
+}
+
+# OpenAI 설정
+OPENAI_CONFIG = {
+    'api_key': os.getenv('OPENAI_API_KEY'),
+    # 벤치마크 등에서 다른 호환 서버로 연결할 때 사용 (기본값: 공식 API)
+    'base_url': os.getenv('OPENAI_BASE_URL'),
+    'whisper_model': 'whisper-1',
+    'gpt_model': 'gpt-3.5-turbo',
+    'temperature': 0.3,
+    'max_tokens': 1000,
+    # 시도 한 번의 제한 시간 (초, 재시도마다 새로 적용)
+    'timeout': 60,
+    'connect_timeout': 10,
+    # 음성 업로드는 파일이 크므로 더 길게
+    'transcription_timeout': 300,
+    # 429/5xx/타임아웃 재시도 횟수 (지수 백오프 + 지터)
+    'max_retries': 3,
+    # 재시도, 백오프, 요청 한도 대기를 모두 포함한 호출 한 번의 전체 제한 시간 (초)
+    'deadline_seconds': 150,
+    'transcription_deadline_seconds': 600,
+    # 프로세스 전체에서 공유하는 연결 풀 크기
+    'max_connections': 20,
+    # 계정 한도보다 약간 낮게 설정 (분당 요청 수 / 분당 토큰 수)
+    'requests_per_minute': 450,
+    'tokens_per_minute': 180000
+}
+
+# 음성 인식 설정 (긴 녹음 분할 처리)
+TRANSCRIPTION_CONFIG = {
+    # 한 번에 업로드할 최대 구간 길이 (초)
+    'chunk_seconds': 600,
+    # Whisper API 업로드 제한 (25MB)보다 약간 작게
+    'max_upload_bytes': 24 * 1024 * 1024,
+    # 구간 앞뒤로 겹치는 길이 (초)
+    'overlap_seconds': 2.0,
+    # 절단점을 찾기 위해 목표 지점 이전으로 탐색하는 범위 (초)
+    'silence_search_seconds': 30,
+    # 침묵 탐색용 에너지 분석 단위 (초)
+    'analysis_window_seconds': 0.1,
+    # 동시에 처리할 구간 수
+    'max_workers': 4,
+    # 녹음 중 실시간 인식 사용 여부
+    'live_enabled': True,
+    # 실시간 인식 구간 길이 (초)
+    'live_window_seconds': 30,
+    # 구간 끝에서 절단점을 찾는 범위 (초)
+    'live_boundary_search_seconds': 2.0,
+    # 종료 후 남은 구간 인식을 기다리는 최대 시간 (초) - 초과 시 전체 재인식
+    'live_finish_timeout': 120
+}
+
+# 음성 인식 엔진 설정
+STT_CONFIG = {
+    # openai: Whisper API, faster-whisper: 로컬 CPU 모델 (오디오가 외부로 나가지 않음)
+    'backend': os.getenv('STT_BACKEND', 'openai'),
+    # 로컬 모델 크기 (tiny, base, small, medium, large-v3 등) 또는 모델 경로
+    'local_model': os.getenv('STT_LOCAL_MODEL', 'small'),
+    'device': 'cpu',
+    # int8 양자화로 메모리 사용량과 CPU 연산량 절감
+    'compute_type': 'int8',
+    # 동시에 인식할 구간 수와 구간당 CPU 스레드 수
+    'num_workers': 2,
+    'cpu_threads': max(1, (os.cpu_count() or 4) // 2),
+    # 1이면 greedy 디코딩 (빠름), 클수록 정확도 향상
+    'beam_size': 1,
+    'language': 'ko'
+}
+
+# 오디오 인코딩 설정 (업로드/다운로드용 압축 파일)
+ENCODING_CONFIG = {
+    # flac 또는 ogg (soundfile 패키지가 없으면 wav로 저장)
+    'format': 'flac',
+    # Whisper 입력에 충분한 16kHz 모노로 변환
+    'sample_rate': 16000,
+    # 종료 후 인코딩 완료를 기다리는 최대 시간 (초)
+    'finish_timeout': 30
+}
+
+# 음성 구간 검출(VAD) 설정 - 업로드 전 긴 침묵 제거
+VAD_CONFIG = {
+    'enabled': True,
+    # 분석 프레임 길이 (초)
+    'frame_seconds': 0.03,
+    # 배경 소음 대비 음성으로 판단할 에너지 배율
+    'energy_ratio': 3.0,
+    # 임계값 상한: 구간 안 큰 소리(상위 5%) 에너지 대비 배율 (계속 말하는 구간 보호)
+    'max_threshold_ratio': 0.25,
+    # 음성으로 판단할 최소 RMS (16비트 기준)
+    'min_rms': 150,
+    # 무성 자음 판단용 영교차율 기준
+    'zcr_threshold': 0.25,
+    # 음성 앞뒤로 남겨둘 여유 (초)
+    'padding_seconds': 0.3,
+    # 이보다 짧은 침묵은 제거하지 않음 (초)
+    'min_silence_seconds': 1.0,
+    # 줄어드는 길이가 이보다 작으면 원본 그대로 사용 (초)
+    'min_saving_seconds': 5.0
+}
+
+# 화자 분리 설정
+DIARIZATION_CONFIG = {
+    # mfcc: 음성 특징 기반 군집화, gap: 침묵 길이 기반 (오디오 없이 동작)
+    'engine': 'mfcc',
+    # 최대 화자 수
+    'max_speakers': 6,
+    # 가장 가까운 화자까지의 거리가 같은 화자 안에서의 변동 폭의 몇 배를 넘으면 새 화자로 볼지
+    'distance_threshold': 2.0,
+    # 같은 화자 변동 폭을 차원별로 추정할 때 평균 분산에 주는 비중 (세그먼트 수 단위)
+    'variance_prior_segments': 1,
+    # 변동 폭 추정이 안정될 때까지 화자 배정을 미룰 세그먼트 수
+    'warmup_segments': 10,
+    # 세그먼트에서 특징을 계산할 최대 길이 (초)
+    'max_segment_seconds': 10.0,
+    # 이보다 짧은 세그먼트는 직전 화자로 처리 (초)
+    'min_segment_seconds': 0.5,
+    # 다중 마이크 녹음 시 트랙별 에너지 분포의 비중 (MFCC 특징 대비, 0이면 사용 안 함)
+    'track_energy_weight': 2.0,
+    'n_mels': 26,
+    'n_mfcc': 13
+}
+
+# 회의 요약 설정 (긴 녹취록 구간별 요약)
+SUMMARY_CONFIG = {
+    # 구간 하나에 담을 최대 토큰 수
+    'chunk_tokens': 3000,
+    # 병합 단계 한 번에 넣을 부분 요약 토큰 수
+    'reduce_input_tokens': 6000,
+    # 부분 요약 응답 최대 토큰 수
+    'partial_max_tokens': 500,
+    # 동시에 요청할 구간 수
+    'max_workers': 4,
+    # 스트리밍 중 화면에 중간 결과를 전달하는 간격 (초)
+    'stream_update_seconds': 0.5,
+    # 요약 전 녹취록 압축 (시각 제거, 같은 화자 연속 발언 병합, 추임새/중복 발언 제거)
+    'compact': True,
+    # 이 말로만 이루어진 발언은 제거 (Whisper가 무음 구간에 자주 만드는 문장 포함, 문장부호/공백 무시)
+    'filler_phrases': ('음', '어', '아', '으음', '음음', '어어', '아아', '흠', '그', '저', '뭐', '에',
+                       '시청해주셔서 감사합니다', '구독과 좋아요 부탁드립니다'),
+    # 최근 몇 개 발언과 비교해 거의 같은 발언을 제거할지와 유사도 기준
+    'duplicate_window': 5,
+    'duplicate_similarity': 0.9,
+    # 이보다 짧은 발언은 같은 화자가 똑같이 반복한 경우만 중복으로 봄 (글자 수)
+    'duplicate_min_chars': 8,
+    # 병합한 발언 한 줄의 최대 길이 (글자 수, 구간 분할 단위가 너무 커지지 않도록)
+    'turn_max_chars': 1500
+}
+
+# 결과 캐시 설정 (같은 오디오/녹취록 재처리 시 API 호출 생략)
+CACHE_CONFIG = {
+    'enabled': True,
+    'cache_dir': os.path.join(tempfile.gettempdir(), 'meeting_cache'),
+    # 캐시 최대 용량 (초과 시 오래 사용하지 않은 항목부터 삭제)
+    'max_bytes': 200 * 1024 * 1024
+}
+
+# 결과 파일 저장소 설정 (세션에는 파일 핸들만 보관)
+ARTIFACT_CONFIG = {
+    'root_dir': os.path.join(tempfile.gettempdir(), 'meeting_artifacts'),
+    # 마지막 사용 후 보관 기간 (초)
+    'ttl_seconds': 24 * 3600,
+    # 만료 파일 정리 간격 (초)
+    'purge_interval_seconds': 600
+}
+
+# 지난 회의 검색 색인 설정 (세션을 초기화해도 유지)
+INDEX_CONFIG = {
+    'enabled': True,
+    'db_path': os.getenv('MEETING_INDEX_PATH',
+                         os.path.join(os.path.expanduser('~'), '.meeting_auto', 'meetings.db')),
+    # 검색 결과 최대 개수
+    'max_results': 50
+}
+
+# 지난 회의 의미 검색/질의응답 설정 (임베딩 벡터는 float32 파일로 보관)
+SEMANTIC_CONFIG = {
+    'enabled': True,
+    'root_dir': os.path.join(os.path.dirname(INDEX_CONFIG['db_path']), 'semantic'),
+    'embedding_model': 'text-embedding-3-small',
+    # 벡터 차원 (작을수록 파일과 검색 비용이 줄어듦)
+    'dimensions': 512,
+    # 검색 단위 구간 길이 (토큰)와 앞 구간과 겹칠 발언 수
+    'chunk_tokens': 300,
+    'overlap_segments': 1,
+    # 한 번의 임베딩 요청에 넣을 구간 수
+    'batch_size': 64,
+    # 검색 시 한 번에 계산할 벡터 수 (메모리 사용량 제한)
+    'search_block_rows': 65536,
+    # 답변에 사용할 구간 수
+    'top_k': 6,
+    'answer_max_tokens': 600
+}
+
+# 백그라운드 처리 작업 설정
+JOB_CONFIG = {
+    # 작업 상태 저장용 SQLite 파일
+    'db_path': os.path.join(tempfile.gettempdir(), 'meeting_jobs', 'jobs.db'),
+    # 동시에 처리할 회의 수
+    'max_workers': 4,
+    # 완료된 작업 기록 보관 기간 (초)
+    'retention_seconds': 7 * 24 * 3600
+}
+
+# 단계별 소요 시간/비용 기록 설정
+TRACING_CONFIG = {
+    'enabled': True,
+    # 단계별 기록을 한 줄씩 추가하는 JSON Lines 파일
+    'log_path': os.path.join(tempfile.gettempdir(), 'meeting_traces', 'traces.jsonl'),
+    # 화면/지표 계산에 사용할 최근 기록 수
+    'recent_records': 1000,
+    # Prometheus 텍스트 형식 지표 포트 (설정하지 않으면 사용 안 함)
+    'prometheus_port': int(os.getenv('TRACING_PROMETHEUS_PORT', '0')) or None,
+    # 지표 서버 주소 (회의별 시간/토큰/비용이 노출되므로 기본은 이 컴퓨터에서만 접근 가능)
+    'prometheus_host': os.getenv('TRACING_PROMETHEUS_HOST', '127.0.0.1'),
+    # 비용 추정 단가 (USD)
+    'price_per_audio_minute': 0.006,
+    'price_per_1k_prompt_tokens': 0.0005,
+    'price_per_1k_completion_tokens': 0.0015,
+    'price_per_1k_embedding_tokens': 0.00002
+}
+
+# 세션 상태 키
+SESSION_KEYS = {
+    'recording': 'recording',
+    'recorder': 'recorder',
+    'encoder': 'encoder',
+    'live_transcriber': 'live_transcriber',
+    'start_time': 'start_time',
+    'stop_requested': 'stop_requested',
+    'result_message': 'result_message',
+    'job_id': 'job_id',
+    'audio_artifact': 'audio_artifact',
+    'track_artifacts': 'track_artifacts',
+    'transcript_artifact': 'transcript_artifact',
+    'transcript_data_artifact': 'transcript_data_artifact',
+    'summary_artifact': 'summary_artifact'
+}
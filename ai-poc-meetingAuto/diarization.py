@@ -0,0 +1,345 @@
+# diarization.py
+import numpy as np
+from audio_utils import open_pcm, to_mono
+from config import DIARIZATION_CONFIG
+
+
+class DiarizationEngine:
+    """화자 분리 엔진 인터페이스
+
+    assign(segments, audio_path, track_paths)는 세그먼트마다 1부터 시작하는 화자 번호 목록을 반환
+    segments: start/end(초)와 text 속성을 가진 객체 목록
+    track_paths: 다중 마이크 녹음의 트랙별 WAV 경로 (믹스다운과 시작 시각이 같음)
+    """
+
+    def assign(self, segments, audio_path=None, track_paths=None):
+        raise NotImplementedError
+
+
+class GapHeuristicDiarizer(DiarizationEngine):
+    """침묵 길이만으로 화자를 바꾸는 간단한 방식 (오디오가 없을 때 사용)"""
+
+    def assign(self, segments, audio_path=None, track_paths=None):
+        speakers = []
+        current_speaker = 1
+        last_end_time = 0
+        for segment in segments:
+            # 2초 이상 침묵시 화자 변경 가능성
+            if segment.start - last_end_time > 2.0 and len(segment.text.split()) > 5:
+                current_speaker = (current_speaker % 3) + 1
+            speakers.append(current_speaker)
+            last_end_time = segment.end
+        return speakers
+
+
+def _mel_filterbank(rate, n_fft, n_mels, fmax):
+    """멜 스케일 삼각 필터뱅크 (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(fmax), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / rate).astype(int)
+
+    filterbank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for i in range(n_mels):
+        left, center, right = bins[i], bins[i + 1], bins[i + 2]
+        if center > left:
+            filterbank[i, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filterbank[i, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filterbank
+
+
+def _dct_matrix(n_mels, n_coeffs):
+    """DCT-II 변환 행렬 (n_coeffs, n_mels)"""
+    k = np.arange(n_coeffs)[:, None]
+    n = np.arange(n_mels)[None, :]
+    return (np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)).astype(np.float32)
+
+
+class MfccExtractor:
+    """NumPy로 MFCC 특징을 계산하는 클래스"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.frame = int(rate * 0.025)
+        self.hop = int(rate * 0.010)
+        self.n_fft = 1 << (self.frame - 1).bit_length()
+        self.window = np.hamming(self.frame).astype(np.float32)
+        self.filterbank = _mel_filterbank(rate, self.n_fft, DIARIZATION_CONFIG['n_mels'],
+                                          min(rate / 2, 8000))
+        self.dct = _dct_matrix(DIARIZATION_CONFIG['n_mels'], DIARIZATION_CONFIG['n_mfcc'] + 1)
+
+    def mfcc(self, signal):
+        """(프레임 수, n_mfcc) MFCC 행렬 (에너지 계수 c0 제외)"""
+        if len(signal) < self.frame:
+            return np.zeros((0, self.dct.shape[0] - 1), dtype=np.float32)
+
+        # 고주파 강조
+        emphasized = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+
+        # 프레임 분할 (복사 없이 stride 뷰 생성)
+        frame_count = 1 + (len(emphasized) - self.frame) // self.hop
+        frames = np.lib.stride_tricks.as_strided(
+            emphasized,
+            shape=(frame_count, self.frame),
+            strides=(emphasized.strides[0] * self.hop, emphasized.strides[0])
+        ) * self.window
+
+        power = np.abs(np.fft.rfft(frames, n=self.n_fft)) ** 2 / self.n_fft
+        mel_energy = np.log(power @ self.filterbank.T + 1e-10)
+        return (mel_energy @ self.dct.T)[:, 1:]
+
+    def embeddings(self, signal):
+        """세그먼트 전체, 앞 절반, 뒤 절반의 화자 임베딩 (MFCC 평균 + 표준편차)
+
+        절반끼리의 차이는 같은 화자 안에서의 변동 폭 추정에 사용
+        """
+        coeffs = self.mfcc(signal)
+        if len(coeffs) < 2:
+            return None
+        half = len(coeffs) // 2
+        return self._pool(coeffs), self._pool(coeffs[:half]), self._pool(coeffs[half:])
+
+    @staticmethod
+    def _pool(coeffs):
+        return np.concatenate((coeffs.mean(axis=0), coeffs.std(axis=0)))
+
+
+class OnlineClusterer:
+    """세그먼트가 들어오는 순서대로 화자를 배정하는 점진적 군집화
+
+    세그먼트 앞/뒤 절반 임베딩의 차이로 같은 화자 안에서의 차원별 변동 폭을 추정하고,
+    중심점까지의 거리가 그 변동 폭의 threshold배를 넘으면 새 화자로 봄
+    (지금까지 본 임베딩끼리의 상대 위치가 아니라 변동 폭이 기준이므로 화자가 한 명이어도 잡음으로 나뉘지 않음)
+    중심점이 모이면서 가까워진 화자는 합치며, 이미 배정한 번호는 resolve()로 합친 화자 번호로 바꿈
+    변동 폭 추정(observe)과 배정(assign)이 나뉘어 있어 처음 몇 세그먼트는 추정이 안정된 뒤에 배정할 수 있음
+    화자 수만큼의 중심점과 차원별 분산만 유지하므로 회의 길이와 무관하게 메모리 사용량이 일정
+    """
+
+    def __init__(self, max_speakers, threshold, weights=None):
+        self.max_speakers = max_speakers
+        self.threshold = threshold
+        # 차원별 가중치 (특징 묶음 사이의 비중 조절)
+        self.weights = np.float32(1.0) if weights is None else weights ** 2
+        self.centroids = []
+        self.counts = []
+        # 중심점별 1/길이 합 (평균한 세그먼트 길이에 따른 중심점 오차 계산용)
+        self._inverse_seconds = []
+        # 다른 화자에 합쳐진 화자의 대상 번호 (합쳐지지 않았으면 자기 번호)
+        self._parents = []
+        # 같은 화자 안에서의 1초 길이 기준 차원별 임베딩 분산 (누적 평균)
+        self._n = 0
+        self._within = None
+
+    def observe(self, halves, seconds):
+        """세그먼트 앞/뒤 절반 임베딩으로 같은 화자 안에서의 변동 폭 추정 갱신"""
+        first, second = halves
+        # 절반 길이 임베딩 두 개의 차이 분산은 전체 길이 임베딩 분산의 약 4배이고, 분산은 길이에 반비례
+        variance = (first - second) ** 2 / 4 * seconds
+        self._n += 1
+        if self._within is None:
+            self._within = np.zeros_like(variance)
+        self._within += (variance - self._within) / self._n
+
+    def _distance(self, difference, scale):
+        """임베딩 차이를 같은 화자 변동 폭 단위의 가중 RMS로 환산 (같은 화자면 약 1)
+
+        scale: 두 임베딩 각각의 1/길이(중심점은 평균한 세그먼트들의 1/길이 합 / 개수²)의 합
+        """
+        # 세그먼트가 적을 때는 차원별 추정이 불안정하므로 전체 평균 분산 쪽으로 당김
+        prior = DIARIZATION_CONFIG['variance_prior_segments']
+        within = (self._n * self._within + prior * self._within.mean()) / (self._n + prior) + 1e-9
+        z2 = difference ** 2 / (within * np.reshape(scale, (-1, 1)))
+        weights = np.broadcast_to(self.weights, within.shape)
+        return np.sqrt(z2 @ weights / weights.sum())
+
+    def _centroid_scale(self, index):
+        return self._inverse_seconds[index] / self.counts[index] ** 2
+
+    def _active(self):
+        return [index for index, parent in enumerate(self._parents) if parent == index]
+
+    def _new_speaker(self, embedding, seconds):
+        self.centroids.append(embedding.copy())
+        self.counts.append(1)
+        self._inverse_seconds.append(1 / seconds)
+        self._parents.append(len(self._parents))
+        return len(self.centroids) - 1
+
+    def _merge_close(self, index):
+        """index 화자와 가까워진 다른 화자를 합침"""
+        for other in self._active():
+            if other == index:
+                continue
+            scale = self._centroid_scale(index) + self._centroid_scale(other)
+            if self._distance(self.centroids[index] - self.centroids[other], scale)[0] > self.threshold:
+                continue
+            total = self.counts[index] + self.counts[other]
+            self.centroids[index] = (self.centroids[index] * self.counts[index]
+                                     + self.centroids[other] * self.counts[other]) / total
+            self.counts[index] = total
+            self._inverse_seconds[index] += self._inverse_seconds[other]
+            self._parents[other] = index
+
+    def resolve(self, index):
+        """합쳐진 화자를 따라가 현재 화자 번호 반환"""
+        while self._parents[index] != index:
+            index = self._parents[index]
+        return index
+
+    @property
+    def observed(self):
+        """변동 폭 추정에 사용한 세그먼트 수"""
+        return self._n
+
+    def assign(self, embedding, seconds):
+        """임베딩 하나를 배정하고 화자 인덱스(0부터) 반환 (observe()로 변동 폭을 먼저 추정해야 함)
+
+        seconds: 임베딩을 계산한 길이
+        """
+        active = self._active()
+        if not active:
+            return self._new_speaker(embedding, seconds)
+
+        centroids = np.array([self.centroids[index] for index in active])
+        scales = [1 / seconds + self._centroid_scale(index) for index in active]
+        distances = self._distance(centroids - embedding, scales)
+        best = active[int(np.argmin(distances))]
+
+        if distances.min() > self.threshold and len(active) < self.max_speakers:
+            return self._new_speaker(embedding, seconds)
+
+        # 배정된 화자의 중심점을 이동 평균으로 갱신
+        self.counts[best] += 1
+        self._inverse_seconds[best] += 1 / seconds
+        self.centroids[best] += (embedding - self.centroids[best]) / self.counts[best]
+        self._merge_close(best)
+        return best
+
+
+class TrackEnergyProfile:
+    """다중 마이크(트랙/채널)별 상대 에너지 분포
+
+    화자마다 가까운 마이크가 달라 에너지 분포가 위치 정보 역할을 함
+    """
+
+    def __init__(self, paths):
+        self.sources = [open_pcm(path) for path in paths]
+        self.size = sum(samples.shape[1] for samples, _ in self.sources)
+
+    def profile(self, start_seconds, end_seconds):
+        """구간의 채널별 로그 RMS에서 평균을 뺀 값 (전체 음량과 무관한 분포)"""
+        levels = []
+        for samples, rate in self.sources:
+            start = int(start_seconds * rate)
+            end = min(int(end_seconds * rate), len(samples))
+            if end > start:
+                block = samples[start:end].astype(np.float32)
+            else:
+                block = np.zeros((1, samples.shape[1]), dtype=np.float32)
+            levels.extend(np.log(np.sqrt(np.mean(block ** 2, axis=0)) + 1.0))
+        levels = np.array(levels, dtype=np.float32)
+        return levels - levels.mean()
+
+
+class MfccDiarizer(DiarizationEngine):
+    """세그먼트별 MFCC 임베딩을 점진적으로 군집화하는 화자 분리
+
+    다중 마이크 녹음이면 트랙별 에너지 분포를 임베딩에 덧붙여 함께 군집화
+    """
+
+    def assign(self, segments, audio_path=None, track_paths=None):
+        if not audio_path:
+            return GapHeuristicDiarizer().assign(segments)
+
+        samples, rate = open_pcm(audio_path)
+        extractor = MfccExtractor(rate)
+        mfcc_size = 2 * DIARIZATION_CONFIG['n_mfcc']
+
+        # 트랙 파일이 없어도 다채널 녹음이면 채널별 에너지 사용
+        tracks = None
+        weight = DIARIZATION_CONFIG['track_energy_weight']
+        if weight > 0:
+            tracks = TrackEnergyProfile(track_paths or [audio_path])
+            if tracks.size < 2:
+                tracks = None
+
+        weights = None
+        if tracks:
+            # 에너지 묶음 전체가 MFCC 묶음과 weight 비율의 비중을 갖도록 차원 수 보정
+            weights = np.concatenate((
+                np.ones(mfcc_size, dtype=np.float32),
+                np.full(tracks.size, weight * np.sqrt(mfcc_size / tracks.size), dtype=np.float32)
+            ))
+
+        clusterer = OnlineClusterer(DIARIZATION_CONFIG['max_speakers'],
+                                    DIARIZATION_CONFIG['distance_threshold'], weights)
+        max_frames = int(DIARIZATION_CONFIG['max_segment_seconds'] * rate)
+        min_frames = int(DIARIZATION_CONFIG['min_segment_seconds'] * rate)
+
+        # 처음 몇 세그먼트는 변동 폭 추정이 안정될 때까지 배정을 미룸 (개수가 정해져 있어 메모리는 일정)
+        warmup = DIARIZATION_CONFIG['warmup_segments']
+        pending = []
+        labels = []
+        for segment in segments:
+            start = int(segment.start * rate)
+            end = min(int(segment.end * rate), len(samples))
+
+            # 긴 세그먼트는 가운데 일부만 사용하여 계산량 제한
+            if end - start > max_frames:
+                start = (start + end - max_frames) // 2
+                end = start + max_frames
+
+            embeddings = None
+            if end - start >= min_frames:
+                embeddings = extractor.embeddings(to_mono(samples[start:end]))
+
+            # 너무 짧은 세그먼트는 직전 화자를 그대로 사용 (아래에서 채움)
+            if embeddings is None:
+                labels.append(None)
+                continue
+
+            if tracks:
+                middle = (start + end) / 2
+                bounds = [(start, end), (start, middle), (middle, end)]
+                embeddings = [np.concatenate((embedding, tracks.profile(left / rate, right / rate)))
+                              for embedding, (left, right) in zip(embeddings, bounds)]
+
+            embedding, first, second = embeddings
+            seconds = (end - start) / rate
+            clusterer.observe((first, second), seconds)
+            pending.append((len(labels), embedding, seconds))
+            labels.append(None)
+            if clusterer.observed >= warmup:
+                for position, embedding, seconds in pending:
+                    labels[position] = clusterer.assign(embedding, seconds)
+                pending = []
+
+        for position, embedding, seconds in pending:
+            labels[position] = clusterer.assign(embedding, seconds)
+
+        # 나중에 합쳐진 화자 번호를 반영하고 처음 등장한 순서대로 1부터 다시 매김
+        numbers = {}
+        speakers = []
+        previous = 1
+        for label in labels:
+            if label is not None:
+                previous = numbers.setdefault(clusterer.resolve(label), len(numbers) + 1)
+            speakers.append(previous)
+        return speakers
+
+
+# 엔진 이름 -> 클래스 (무거운 로컬 모델도 같은 인터페이스로 등록 가능)
+DIARIZERS = {
+    'gap': GapHeuristicDiarizer,
+    'mfcc': MfccDiarizer
+}
+
+
+def create_diarizer(name=None):
+    """설정된 화자 분리 엔진 생성"""
+    return DIARIZERS[name or DIARIZATION_CONFIG['engine']]()
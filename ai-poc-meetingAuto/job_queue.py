@@ -0,0 +1,185 @@
+# job_queue.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_CONFIG
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _process_alive(pid):
+    """프로세스가 실행 중인지 확인"""
+    if os.name == 'nt':
+        # Windows에서 os.kill(pid, 0)은 프로세스를 종료시키므로 핸들로 확인
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """작업 상태를 저장하는 SQLite 저장소"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    message TEXT,
+                    partial TEXT,
+                    result TEXT,
+                    error TEXT,
+                    owner_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def create(self, job_id):
+        """새 작업 등록"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, owner_pid, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, os.getpid(), now, now)
+            )
+
+    def update(self, job_id, **fields):
+        """작업 상태 갱신 (result는 JSON으로 저장)"""
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], ensure_ascii=False)
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?",
+                               (*fields.values(), job_id))
+
+    def get(self, job_id):
+        """작업 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if job['result']:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def fail_unfinished(self, message):
+        """종료된 프로세스에서 끝나지 못한 작업을 실패로 정리
+
+        같은 DB를 쓰는 다른 프로세스(다른 Streamlit 서버, 일괄 처리)의 진행 중인 작업은 유지
+        시작 시점의 현재 프로세스에는 아직 작업이 없으므로 같은 PID는 재시작 전 프로세스의 작업
+        """
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, owner_pid FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            orphaned = [(row['id'],) for row in rows
+                        if row['owner_pid'] is None or row['owner_pid'] == os.getpid()
+                        or not _process_alive(row['owner_pid'])]
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                [(FAILED, message, now, job_id) for job_id, in orphaned]
+            )
+
+    def purge(self, older_than):
+        """오래된 완료 작업 삭제"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, older_than)
+            )
+
+
+class JobQueue:
+    """로컬 워커 풀에서 처리 작업을 실행하는 큐"""
+
+    def __init__(self, store, max_workers):
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='meeting-job')
+
+    def submit(self, func, *args):
+        """작업 등록 후 작업 ID 반환
+
+        func(progress, *args)는 (결과 dict, 오류 메시지)를 반환해야 함
+        progress(message=None, stage=None, partial=None)로 진행 상황과
+        스트리밍 중인 중간 결과를 기록할 수 있음
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id)
+        self.executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def _run(self, job_id, func, args):
+        """워커 스레드에서 작업 실행"""
+        def progress(message=None, stage=None, partial=None):
+            fields = {}
+            if message is not None:
+                fields['message'] = message
+            if stage:
+                fields['stage'] = stage
+            if partial is not None:
+                fields['partial'] = partial
+            if fields:
+                self.store.update(job_id, **fields)
+
+        self.store.update(job_id, status=RUNNING)
+        try:
+            result, error = func(progress, *args)
+            if error:
+                self.store.update(job_id, status=FAILED, error=error, result=result)
+            else:
+                self.store.update(job_id, status=DONE, result=result)
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=f"처리 중 오류 발생: {str(e)}")
+
+    def get(self, job_id):
+        """작업 상태 조회"""
+        return self.store.get(job_id)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """프로세스 전체에서 공유하는 작업 큐"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            store = JobStore(JOB_CONFIG['db_path'])
+            store.fail_unfinished("서버 재시작으로 작업이 중단되었습니다")
+            store.purge(time.time() - JOB_CONFIG['retention_seconds'])
+            _job_queue = JobQueue(store, JOB_CONFIG['max_workers'])
+        return _job_queue
@@ -0,0 +1,179 @@
+# live_transcriber.py
+import os
+import queue
+import threading
+from types import SimpleNamespace
+import numpy as np
+from audio_encoder import write_audio
+from config import TRACING_CONFIG, TRANSCRIPTION_CONFIG, VAD_CONFIG
+from tracing import add, get_tracer
+from vad import compress
+
+class LiveTranscriber:
+    """녹음 중 완성된 구간을 백그라운드에서 바로 인식하는 클래스
+
+    PerfectRecorder의 리스너로 등록되어 open -> feed -> close 순서로 호출됨
+    """
+
+    def __init__(self, transcription_service):
+        self.transcription_service = transcription_service
+        self.segments = []
+        self.errors = []
+        # 구간별 인식의 전송량/오디오 길이 합계 (결과를 가져갈 때 처리 단계 기록에 더함)
+        self.usage = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._pending = bytearray()
+        self._offset = 0.0
+        self._params = None
+        self._window_bytes = 0
+        self._bytes_per_second = 0
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def open(self, channels, sample_width, rate):
+        """녹음 시작 시 오디오 형식 설정"""
+        if sample_width != 2:
+            raise ValueError("16비트 녹음만 실시간 인식할 수 있습니다")
+        self._params = (channels, sample_width, rate)
+        self._bytes_per_second = channels * sample_width * rate
+        frame_bytes = channels * sample_width
+        window_frames = int(TRANSCRIPTION_CONFIG['live_window_seconds'] * rate)
+        self._window_bytes = window_frames * frame_bytes
+        self.thread.start()
+
+    def feed(self, data):
+        """녹음 데이터 추가 (파일 쓰기 스레드에서 호출)"""
+        self._pending += data
+        if len(self._pending) >= self._window_bytes:
+            cut = self._find_cut()
+            self._submit(bytes(self._pending[:cut]))
+            del self._pending[:cut]
+
+    def close(self):
+        """녹음 종료 시 남은 꼬리 구간 제출"""
+        if self._pending:
+            self._submit(bytes(self._pending))
+            self._pending = bytearray()
+        self._queue.put(None)
+
+    def _find_cut(self):
+        """구간 끝부분에서 가장 조용한 지점을 절단 위치로 선택"""
+        channels, sample_width, rate = self._params
+        frame_bytes = channels * sample_width
+
+        search_frames = int(TRANSCRIPTION_CONFIG['live_boundary_search_seconds'] * rate)
+        step = max(1, rate // 50)  # 20ms 단위 에너지
+        window_frames = self._window_bytes // frame_bytes
+        search_start = max(0, window_frames - search_frames)
+
+        tail = np.frombuffer(self._pending, dtype='<i2',
+                             count=(window_frames - search_start) * channels,
+                             offset=search_start * frame_bytes)
+        tail = tail.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+        usable = len(tail) // step * step
+        if usable == 0:
+            return self._window_bytes
+
+        energy = np.square(tail[:usable]).reshape(-1, step).mean(axis=1)
+        quietest = int(np.argmin(energy)) * step + step // 2
+        return (search_start + quietest) * frame_bytes
+
+    def _submit(self, pcm):
+        """인식 대기열에 구간 추가"""
+        start = self._offset
+        self._offset += len(pcm) / self._bytes_per_second
+        self._queue.put((start, pcm))
+
+    def _run(self):
+        """인식 스레드"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            start, pcm = item
+            try:
+                self._traced_window(start, pcm)
+            except Exception as e:
+                with self._lock:
+                    self.errors.append(f"{start:.0f}초 구간: {str(e)}")
+
+    def _traced_window(self, start, pcm):
+        """구간 하나를 인식하고 단계 기록 (녹음 중에는 바깥 단계가 없으므로 사용량을 따로 모아둠)"""
+        if not TRACING_CONFIG['enabled']:
+            self._transcribe_window(start, pcm)
+            return
+        span = None
+        try:
+            with get_tracer().span('live_transcribe') as span:
+                span.add(audio_seconds=len(pcm) / self._bytes_per_second)
+                self._transcribe_window(start, pcm)
+        finally:
+            if span:
+                with self._lock:
+                    for name, value in span.counters.items():
+                        self.usage[name] = self.usage.get(name, 0) + value
+
+    def _transcribe_window(self, start, pcm):
+        """구간 하나를 인식하여 결과에 추가"""
+        channels, sample_width, rate = self._params
+
+        samples = np.frombuffer(pcm, dtype='<i2').reshape(-1, channels)
+
+        # 침묵을 제거 (음성 구간을 찾지 못하면 잘못 버리지 않도록 원본 그대로 전송)
+        timestamp_map = None
+        if VAD_CONFIG['enabled']:
+            compressed, timestamp_map = compress(samples, rate)
+            if len(compressed):
+                samples = compressed
+            else:
+                timestamp_map = None
+
+        # 업로드용 16kHz 모노 압축 파일로 저장 후 인식
+        window_path = write_audio(samples, rate)
+        try:
+            transcript = self.transcription_service.transcribe_file(window_path)
+        finally:
+            os.unlink(window_path)
+
+        window_segments = [
+            SimpleNamespace(
+                start=getattr(segment, 'start', 0),
+                end=getattr(segment, 'end', 0),
+                text=getattr(segment, 'text', '')
+            )
+            for segment in getattr(transcript, 'segments', None) or []
+        ]
+        if timestamp_map:
+            timestamp_map.remap_segments(window_segments)
+
+        with self._lock:
+            for segment in window_segments:
+                segment.id = len(self.segments)
+                segment.start += start
+                segment.end += start
+                self.segments.append(segment)
+
+    def get_segments(self):
+        """지금까지 인식된 세그먼트 (UI 표시용 복사본)"""
+        with self._lock:
+            return list(self.segments)
+
+    def result(self, timeout=None):
+        """남은 구간 인식 완료 대기 후 전체 결과 반환"""
+        self.thread.join(timeout=timeout)
+        # 실시간 인식 사용량을 호출한 단계(처리 파이프라인)에 합산
+        with self._lock:
+            usage, self.usage = self.usage, {}
+        add(**usage)
+        if self.thread.is_alive():
+            return None, "실시간 인식이 제한 시간 내에 끝나지 않았습니다"
+        if self.errors:
+            return None, "; ".join(self.errors)
+
+        segments = self.get_segments()
+        return SimpleNamespace(
+            text=''.join(segment.text for segment in segments).strip(),
+            segments=segments,
+            duration=self._offset
+        ), None
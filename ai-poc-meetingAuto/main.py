@@ -1,11 +1,20 @@
 # main.py
 import streamlit as st
-from config import APP_CONFIG
+from config import APP_CONFIG, TRACING_CONFIG
 from session_manager import SessionManager
 from transcription_service import TranscriptionService
 from recording_controller import RecordingController
+from tracing import start_metrics_server
 from ui_components import UIComponents
 
+@st.cache_resource
+def get_transcription_service():
+    """모든 세션과 재실행에서 공유하는 서비스 (클라이언트 연결 풀 재사용)"""
+    # 설정된 경우 Prometheus 지표 서버도 한 번만 시작
+    if TRACING_CONFIG['enabled'] and TRACING_CONFIG['prometheus_port']:
+        start_metrics_server(TRACING_CONFIG['prometheus_port'], TRACING_CONFIG['prometheus_host'])
+    return TranscriptionService()
+
 def main():
     """메인 애플리케이션"""
     
@@ -19,15 +28,24 @@ def main():
     SessionManager.initialize()
     
     # 서비스 초기화
-    transcription_service = TranscriptionService()
+    transcription_service = get_transcription_service()
     recording_controller = RecordingController(transcription_service)
     
     # 메인 타이틀
     st.title(f"{APP_CONFIG['page_icon']} {APP_CONFIG['page_title']}")
     st.write("녹음 + 자동 음성 인식 + 녹취록/요약 생성까지 한번에!")
     
+    # 백그라운드 처리 결과 반영
+    job = SessionManager.poll_job()
+    
     # UI 컴포넌트들 표시
     UIComponents.show_status(transcription_service)
+    UIComponents.show_job_status(job)
+    
+    # 녹음 중에 프로세스가 종료되어 남은 녹음은 사용자가 선택한 경우에만 복구하여 처리
+    recovered = UIComponents.show_orphaned_recordings()
+    if recovered and recording_controller.recover_recording(recovered):
+        st.rerun()
     
     st.markdown("---")
     
@@ -57,6 +75,14 @@ def main():
     
     st.markdown("---")
     
+    # 지난 회의 검색
+    UIComponents.show_meeting_search(transcription_service)
+    
+    # 단계별 성능 기록
+    UIComponents.show_trace_panel()
+    
+    st.markdown("---")
+    
     # 사용 방법
     UIComponents.show_instructions()
     
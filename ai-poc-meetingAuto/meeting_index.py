@@ -0,0 +1,208 @@
+# meeting_index.py
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from config import INDEX_CONFIG, SEMANTIC_CONFIG
+from semantic_index import get_semantic_index
+from transcript_model import Segment, Transcript
+
+# 검색 결과 스니펫에서 일치한 부분을 감싸는 표시 (화면에서 서식으로 바꿈)
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+
+def default_title(created_at):
+    """제목을 따로 주지 않은 회의의 제목"""
+    return f"회의 {created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+def build_match_query(query):
+    """검색어를 FTS5 질의로 변환 (단어마다 접두어 검색, 모든 단어 포함)
+
+    한국어는 조사가 붙어 있으므로 '예산'으로 '예산은', '예산을'도 찾도록 접두어로 검색
+    """
+    terms = [term.replace('"', '') for term in query.split()]
+    return ' '.join(f'"{term}"*' for term in terms if term) or None
+
+
+class MeetingIndex:
+    """지난 회의 녹취록을 발언 단위로 색인하는 SQLite FTS5 저장소
+
+    세션을 초기화해도 남아 있으며, 회의마다 발언 rowid 범위를 기록해 녹취록 전체도 바로 복원
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # 일괄 처리 CLI의 여러 프로세스가 동시에 기록할 수 있으므로 잠금 대기 시간 지정
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS meetings (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    segment_count INTEGER NOT NULL,
+                    first_segment INTEGER,
+                    last_segment INTEGER,
+                    summary TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS meetings_created_at ON meetings (created_at)")
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+                    text,
+                    speaker UNINDEXED,
+                    meeting_id UNINDEXED,
+                    start_seconds UNINDEXED,
+                    end_seconds UNINDEXED,
+                    tokenize = 'unicode61'
+                )
+            """)
+
+    def add_transcript(self, transcript, title=None):
+        """녹취록 하나를 색인하고 회의 ID 반환"""
+        meeting_id = uuid.uuid4().hex
+        created_at = transcript.created_at.timestamp()
+        title = title or default_title(transcript.created_at)
+        segments = transcript.segments
+
+        with self._lock, self._conn:
+            # 다른 프로세스와 rowid 범위가 겹치지 않도록 먼저 쓰기 잠금을 잡고 연속된 rowid로 저장
+            self._conn.execute("BEGIN IMMEDIATE")
+            first = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM segments").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO segments (rowid, text, speaker, meeting_id, start_seconds, end_seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(first + i, s.text, s.speaker, meeting_id, s.start, s.end) for i, s in enumerate(segments)]
+            )
+            self._conn.execute(
+                "INSERT INTO meetings "
+                "(id, title, created_at, duration, segment_count, first_segment, last_segment) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (meeting_id, title, created_at, segments[-1].end if segments else 0.0,
+                 len(segments), first, first + len(segments) - 1)
+            )
+        return meeting_id
+
+    def set_summary(self, meeting_id, summary):
+        """요약 저장 (녹취록 색인 후 요약이 끝나면 호출)"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE meetings SET summary = ? WHERE id = ?", (summary, meeting_id))
+
+    def search(self, query, speaker=None, date_from=None, date_to=None, limit=50):
+        """발언 검색 (관련도순)
+
+        date_from/date_to: datetime.date (포함)
+        반환값: meeting_id, title, created_at, start, end, speaker, snippet을 가진 dict 목록
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        conditions = ["segments MATCH ?"]
+        params = [match]
+        if speaker:
+            conditions.append("speaker = ?")
+            params.append(speaker)
+        if date_from or date_to:
+            start = datetime.combine(date_from, datetime.min.time()).timestamp() if date_from else 0
+            end = datetime.combine(date_to, datetime.max.time()).timestamp() if date_to else float('inf')
+            conditions.append("meeting_id IN (SELECT id FROM meetings WHERE created_at BETWEEN ? AND ?)")
+            params.extend([start, end])
+        params.append(limit)
+
+        # 관련도순 상위 결과를 먼저 고른 뒤 회의 정보를 붙임 (일치한 발언 전체에 조인하지 않도록)
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT hits.*, meetings.title, meetings.created_at
+                FROM (
+                    SELECT meeting_id, start_seconds, end_seconds, speaker, rank,
+                           snippet(segments, 0, '{MATCH_START}', '{MATCH_END}', '…', 24) AS snippet
+                    FROM segments
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY rank
+                    LIMIT ?
+                ) AS hits JOIN meetings ON meetings.id = hits.meeting_id
+                ORDER BY hits.rank
+            """, params).fetchall()
+
+        return [
+            {
+                'meeting_id': row['meeting_id'],
+                'title': row['title'],
+                'created_at': datetime.fromtimestamp(row['created_at']),
+                'start': row['start_seconds'],
+                'end': row['end_seconds'],
+                'speaker': row['speaker'],
+                'snippet': row['snippet']
+            }
+            for row in rows
+        ]
+
+    def list_meetings(self, limit=20):
+        """최근 회의 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, created_at, duration, segment_count FROM meetings "
+                "ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row, created_at=datetime.fromtimestamp(row['created_at'])) for row in rows]
+
+    def get_meeting(self, meeting_id):
+        """회의 정보와 녹취록 모델 (없으면 None)"""
+        with self._lock:
+            meeting = self._conn.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if meeting is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT start_seconds, end_seconds, speaker, text FROM segments "
+                "WHERE rowid BETWEEN ? AND ? ORDER BY rowid",
+                (meeting['first_segment'], meeting['last_segment'])
+            ).fetchall()
+
+        created_at = datetime.fromtimestamp(meeting['created_at'])
+        return {
+            **dict(meeting),
+            'created_at': created_at,
+            'transcript': Transcript([Segment(*row) for row in rows], created_at)
+        }
+
+    def delete_meeting(self, meeting_id):
+        """회의와 발언 색인, 질의응답용 구간 임베딩 삭제"""
+        with self._lock, self._conn:
+            meeting = self._conn.execute(
+                "SELECT first_segment, last_segment FROM meetings WHERE id = ?", (meeting_id,)
+            ).fetchone()
+            if meeting is None:
+                return
+            self._conn.execute("DELETE FROM segments WHERE rowid BETWEEN ? AND ?",
+                               (meeting['first_segment'], meeting['last_segment']))
+            self._conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+        # 삭제한 회의가 질문하기 답변의 근거로 인용되지 않도록 함께 삭제
+        if SEMANTIC_CONFIG['enabled']:
+            get_semantic_index().delete_meeting(meeting_id)
+
+    def count(self):
+        """색인된 회의 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_meeting_index():
+    """프로세스 전체에서 공유하는 회의 색인"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MeetingIndex(INDEX_CONFIG['db_path'])
+        return _index
@@ -0,0 +1,268 @@
+# mock_openai_server.py
+"""벤치마크용 로컬 OpenAI API 대체 서버
+
+실제 API 대신 설정한 지연 시간 후 미리 정해둔 응답을 돌려줌
+    python mock_openai_server.py --port 8765 --latency 0.2 --audio-latency 0.01
+앱에서는 OPENAI_BASE_URL=http://127.0.0.1:8765/v1 로 연결
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import struct
+import threading
+import time
+import wave
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# 세그먼트에 돌아가며 넣을 문장
+CANNED_SENTENCES = [
+    "오늘 회의는 다음 분기 로드맵에 대해 논의하겠습니다.",
+    "지난주에 말씀드린 일정은 조금 조정이 필요할 것 같습니다.",
+    "네, 그 부분은 제가 확인해서 공유드리겠습니다.",
+    "예산 관련해서는 재무팀과 한 번 더 협의가 필요합니다.",
+    "그럼 이번 주 금요일까지 초안을 정리해 주세요."
+]
+
+
+def _audio_duration(data):
+    """업로드된 오디오 길이 (초)"""
+    if soundfile is not None:
+        try:
+            return soundfile.info(io.BytesIO(data)).duration
+        except Exception:
+            pass
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wf:
+            return wf.getnframes() / wf.getframerate()
+    except Exception:
+        # 16kHz 16비트 모노로 가정
+        return len(data) / 32000
+
+
+def _hashed_embedding(text, dimensions):
+    """글자 bigram을 해싱한 결정적 벡터 (비슷한 문장일수록 가까움)"""
+    vector = [0.0] * dimensions
+    compact = ''.join(text.split())
+    for i in range(max(1, len(compact) - 1)):
+        digest = zlib.crc32(compact[i:i + 2].encode('utf-8'))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _multipart_file(body, content_type):
+    """multipart/form-data 본문에서 file 필드 추출"""
+    boundary = content_type.split('boundary=')[-1].strip('"').encode()
+    for part in body.split(b'--' + boundary):
+        header, _, content = part.partition(b'\r\n\r\n')
+        if b'name="file"' in header:
+            return content[:-2] if content.endswith(b'\r\n') else content
+    return b''
+
+
+class MockState:
+    """호출 횟수와 지연 설정"""
+
+    def __init__(self, latency, audio_latency, segment_seconds, token_latency=0.005):
+        self.latency = latency
+        self.audio_latency = audio_latency
+        self.token_latency = token_latency
+        self.segment_seconds = segment_seconds
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, endpoint):
+        with self.lock:
+            self.calls[endpoint] += 1
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.state.lock:
+                self._send_json(dict(self.state.calls))
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        body = self._read_body()
+        if self.path.endswith('/audio/transcriptions'):
+            self._transcription(body)
+        elif self.path.endswith('/chat/completions'):
+            self._chat(json.loads(body))
+        elif self.path.endswith('/embeddings'):
+            self._embeddings(json.loads(body))
+        elif self.path == '/reset':
+            with self.state.lock:
+                self.state.calls.clear()
+            self._send_json({})
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def _transcription(self, body):
+        """verbose_json 형식의 인식 결과"""
+        self.state.count('transcriptions')
+        data = _multipart_file(body, self.headers.get('Content-Type', ''))
+        duration = _audio_duration(data)
+        time.sleep(self.state.latency + self.state.audio_latency * duration)
+
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + self.state.segment_seconds)
+            segments.append({
+                'id': len(segments),
+                'seek': 0,
+                'start': round(start, 2),
+                'end': round(end, 2),
+                'text': ' ' + CANNED_SENTENCES[len(segments) % len(CANNED_SENTENCES)],
+                'tokens': [],
+                'temperature': 0.0,
+                'avg_logprob': -0.2,
+                'compression_ratio': 1.2,
+                'no_speech_prob': 0.01
+            })
+            start = end
+
+        self._send_json({
+            'task': 'transcribe',
+            'language': 'korean',
+            'duration': duration,
+            'text': ''.join(segment['text'] for segment in segments).strip(),
+            'segments': segments
+        })
+
+    def _chat(self, request):
+        """채팅 완성 응답 (stream=True면 SSE 청크로 전송)"""
+        self.state.count('chat')
+        time.sleep(self.state.latency)
+        prompt_chars = sum(len(message.get('content', '')) for message in request.get('messages', []))
+        content = "1. 회의 개요\n로드맵 논의\n2. 주요 논의사항\n일정 조정, 예산 협의\n3. 결론 및 다음 단계\n금요일까지 초안 정리"
+        usage = {
+            'prompt_tokens': prompt_chars,
+            'completion_tokens': len(content),
+            'total_tokens': prompt_chars + len(content)
+        }
+
+        if request.get('stream'):
+            self._stream_chat(request, content, usage)
+            return
+
+        self._send_json({
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': usage
+        })
+
+    def _embeddings(self, request):
+        """임베딩 응답 (encoding_format=base64면 float32 바이트를 base64로 전송)"""
+        self.state.count('embeddings')
+        time.sleep(self.state.latency)
+        inputs = request['input'] if isinstance(request['input'], list) else [request['input']]
+        dimensions = request.get('dimensions') or 1536
+        data = []
+        for index, text in enumerate(inputs):
+            vector = _hashed_embedding(text, dimensions)
+            if request.get('encoding_format') == 'base64':
+                vector = base64.b64encode(struct.pack(f'<{dimensions}f', *vector)).decode('ascii')
+            data.append({'object': 'embedding', 'index': index, 'embedding': vector})
+        tokens = sum(len(text) for text in inputs)
+        self._send_json({
+            'object': 'list',
+            'data': data,
+            'model': request.get('model', 'mock'),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens}
+        })
+
+    def _stream_chat(self, request, content, usage):
+        """SSE 형식으로 몇 글자씩 나누어 전송"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+
+        def send(choices, chunk_usage=None):
+            payload = {
+                'id': 'chatcmpl-mock',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': request.get('model', 'mock'),
+                'choices': choices,
+                'usage': chunk_usage
+            }
+            self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        for i in range(0, len(content), 4):
+            send([{'index': 0, 'delta': {'content': content[i:i + 4]}, 'finish_reason': None}])
+            time.sleep(self.state.token_latency)
+        send([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+        if (request.get('stream_options') or {}).get('include_usage'):
+            send([], usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_server(port=0, latency=0.2, audio_latency=0.01, segment_seconds=5.0):
+    """백그라운드 스레드에서 서버 시작 후 (서버, 기본 URL) 반환"""
+    handler = type('Handler', (MockOpenAIHandler,), {
+        'state': MockState(latency, audio_latency, segment_seconds)
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OpenAI API 대체 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help="요청당 기본 지연 (초)")
+    parser.add_argument('--audio-latency', type=float, default=0.01, help="오디오 1초당 추가 지연 (초)")
+    parser.add_argument('--segment-seconds', type=float, default=5.0, help="세그먼트 길이 (초)")
+    args = parser.parse_args()
+
+    server, url = start_server(args.port, args.latency, args.audio_latency, args.segment_seconds)
+    print(f"Mock OpenAI 서버 실행 중: {url}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# openai_client.py
+import json
+import threading
+import time
+import httpx
+from openai import APITimeoutError, OpenAI, DefaultHttpxClient
+from config import OPENAI_CONFIG
+from token_counter import count_tokens
+
+
+class TokenBucket:
+    """분당 한도를 초당 비율로 채워 넣는 토큰 버킷"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """amount만큼 남을 때까지 기다린 뒤 차감하고 대기 시간(초) 반환"""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """요청 수/토큰 수 한도를 함께 적용하는 제한기
+
+    httpx 요청 훅으로 등록되어 SDK 재시도를 포함한 모든 요청 직전에 호출됨
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(request):
+        """채팅 요청 본문에서 프롬프트 + 최대 응답 토큰 수 추정 (그 외 요청은 0)"""
+        if not request.headers.get('content-type', '').startswith('application/json'):
+            return 0
+        try:
+            body = json.loads(request.content)
+        except (httpx.RequestNotRead, ValueError):
+            return 0
+        if not isinstance(body, dict):
+            return 0
+        model = body.get('model', OPENAI_CONFIG['gpt_model'])
+        prompt = sum(count_tokens(message.get('content') or '', model)
+                     for message in body.get('messages', []) if isinstance(message.get('content'), str))
+        return prompt + (body.get('max_tokens') or 0)
+
+    def __call__(self, request):
+        waited = self.requests.acquire(1)
+        tokens = self.estimate_tokens(request)
+        if tokens:
+            waited += self.tokens.acquire(tokens)
+        if waited:
+            with self._lock:
+                self.waited_seconds += waited
+
+
+class CallDeadline:
+    """SDK 재시도와 대기 시간을 모두 포함한 호출 한 번의 전체 제한 시간
+
+    요청 훅으로 등록되어 시도마다 호출됨. SDK는 같은 스레드에서 재시도하며 시도마다
+    x-stainless-retry-count 헤더를 보내므로 첫 시도 시각부터의 경과 시간으로 남은 시간을 계산하고,
+    각 시도의 제한 시간을 남은 시간으로 줄이며 다 쓰면 더 재시도하지 않고 시간 초과로 끝냄
+    """
+
+    def __init__(self, seconds, transcription_seconds):
+        self.seconds = seconds
+        self.transcription_seconds = transcription_seconds
+        self._local = threading.local()
+
+    def begin(self, request):
+        """첫 시도이면 호출 시작 시각 기록 (요청 한도 대기 전에 호출)"""
+        if request.headers.get('x-stainless-retry-count', '0') == '0':
+            self._local.started = time.monotonic()
+
+    def enforce(self, request):
+        """남은 시간이 없으면 중단하고, 있으면 이번 시도의 제한 시간을 남은 시간 이내로 줄임"""
+        budget = (self.transcription_seconds if request.url.path.endswith('/audio/transcriptions')
+                  else self.seconds)
+        started = getattr(self._local, 'started', None)
+        remaining = budget - (time.monotonic() - started) if started is not None else budget
+        if remaining <= 0:
+            raise APITimeoutError(request=request)
+        timeout = request.extensions.get('timeout')
+        if timeout:
+            request.extensions['timeout'] = {
+                name: remaining if value is None else min(value, remaining)
+                for name, value in timeout.items()
+            }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client():
+    """프로세스 전체에서 공유하는 OpenAI 클라이언트 (API 키가 없으면 None)
+
+    하나의 연결 풀을 재사용하고, 분당 요청/토큰 한도와 요청별 제한 시간을 적용함
+    429/5xx/타임아웃은 SDK가 지수 백오프와 지터로 max_retries만큼 재시도하되,
+    재시도와 대기를 포함한 호출 전체는 deadline_seconds 안에 끝남
+    """
+    api_key = OPENAI_CONFIG['api_key']
+    if not api_key:
+        return None
+
+    key = (api_key, OPENAI_CONFIG['base_url'])
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            limiter = RateLimiter(OPENAI_CONFIG['requests_per_minute'], OPENAI_CONFIG['tokens_per_minute'])
+            deadline = CallDeadline(OPENAI_CONFIG['deadline_seconds'],
+                                    OPENAI_CONFIG['transcription_deadline_seconds'])
+            http_client = DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=OPENAI_CONFIG['max_connections'],
+                                    max_keepalive_connections=OPENAI_CONFIG['max_connections']),
+                event_hooks={'request': [deadline.begin, limiter, deadline.enforce]}
+            )
+            client = OpenAI(
+                api_key=api_key,
+                base_url=OPENAI_CONFIG['base_url'],
+                timeout=httpx.Timeout(OPENAI_CONFIG['timeout'], connect=OPENAI_CONFIG['connect_timeout']),
+                max_retries=OPENAI_CONFIG['max_retries'],
+                http_client=http_client
+            )
+            _clients[key] = client
+        return client
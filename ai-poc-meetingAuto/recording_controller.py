@@ -1,8 +1,14 @@
 # recording_controller.py
 import time
 import os
-from audio_recorder import PerfectRecorder
+from artifact_store import get_artifact_store
+from audio_encoder import StreamingEncoder
+from audio_recorder import create_recorder, recover_recording
+from live_transcriber import LiveTranscriber
+from job_queue import get_job_queue
 from session_manager import SessionManager
+from tracing import traced
+from config import TRANSCRIPTION_CONFIG, ENCODING_CONFIG
 
 class RecordingController:
     """녹음 제어 로직을 담당하는 클래스"""
@@ -15,12 +21,25 @@ class RecordingController:
         # 이전 결과 초기화
         SessionManager.clear_results()
         
-        # 녹음 시작
-        recorder = PerfectRecorder()
+        # 녹음 시작 (입력 장치가 여러 개면 트랙별 동시 녹음 + 믹스다운)
+        recorder = create_recorder()
+        
+        # 다운로드용 압축 파일은 녹음 중에 미리 인코딩
+        encoder = StreamingEncoder()
+        recorder.add_listener(encoder)
+        
+        # 녹음 중 구간별 실시간 인식
+        live_transcriber = None
+        if TRANSCRIPTION_CONFIG['live_enabled'] and self.transcription_service.can_transcribe():
+            live_transcriber = LiveTranscriber(self.transcription_service)
+            recorder.add_listener(live_transcriber)
+        
         success, message = recorder.start_recording()
         
         if success:
             SessionManager.set('recorder', recorder)
+            SessionManager.set('encoder', encoder)
+            SessionManager.set('live_transcriber', live_transcriber)
             SessionManager.set('recording', True)
             SessionManager.set('start_time', time.time())
             SessionManager.set('result_message', "✅ 녹음이 시작되었습니다!")
@@ -43,78 +62,179 @@ class RecordingController:
         recording_duration = time.time() - start_time if start_time else 0
         
         # 녹음 종료 처리
-        result = recorder.stop_recording()
+        audio_path, message = recorder.stop_recording()
+        
+        # 리스너 오류로 중간에 빠진 경우 실시간 결과는 사용하지 않음
+        live_transcriber = SessionManager.get('live_transcriber')
+        if live_transcriber not in recorder.listeners:
+            live_transcriber = None
+        
+        encoded_path = self._finish_encoder(recorder, SessionManager.get('encoder'))
         
         # 상태 초기화
         SessionManager.set('recording', False)
         SessionManager.set('recorder', None)
+        SessionManager.set('encoder', None)
+        SessionManager.set('live_transcriber', None)
         SessionManager.set('start_time', None)
         SessionManager.set('stop_requested', False)
         
-        if result and len(result) == 2:
-            file_data, temp_audio_path = result
-            file_size = len(file_data)
+        if audio_path:
+            # 다운로드는 압축 파일 (인코딩 실패 시 원본 WAV)
+            download_path = encoded_path or audio_path
+            file_size = os.path.getsize(download_path)
             SessionManager.set('result_message', 
                 f"🎉 녹음 성공! 파일 크기: {file_size/1024:.1f} KB (녹음 시간: {recording_duration:.1f}초)")
-            SessionManager.set('audio_file_data', file_data)
-            
-            # 자동으로 음성 처리 시작
-            if self.transcription_service.is_available() and temp_audio_path:
-                self._process_audio(temp_audio_path)
-            
-            # 임시 파일 정리
-            try:
-                os.unlink(temp_audio_path)
-            except:
-                pass
-            
+            self._submit_recording(audio_path, download_path, recorder.track_paths, live_transcriber)
             return True
         else:
-            SessionManager.set('result_message', "❌ 녹음 실패: 데이터가 없습니다")
-            SessionManager.set('audio_file_data', None)
+            if encoded_path:
+                os.unlink(encoded_path)
+            SessionManager.set('result_message', f"❌ 녹음 실패: {message}")
+            SessionManager.set('audio_artifact', None)
             return False
     
-    def _process_audio(self, audio_path):
-        """녹음된 오디오를 처리하여 녹취록과 요약 생성"""
+    def _submit_recording(self, audio_path, download_path, track_paths, live_transcriber=None):
+        """녹음 파일을 저장소로 옮기고 백그라운드 처리 작업 등록"""
+        # 원본 WAV는 분석용이므로 다운로드 파일과 다르면 처리 후 삭제
+        discard_audio = download_path != audio_path
+        
+        # 다운로드 파일은 저장소로 옮기고 세션에는 핸들만 보관 (메모리로 읽지 않음)
+        store = get_artifact_store()
+        audio_handle = store.put_file(download_path, 'recording')
+        SessionManager.set('audio_artifact', audio_handle)
+        if not discard_audio:
+            # 인코딩 실패로 WAV를 내려받는 경우 저장소로 옮긴 파일을 그대로 분석
+            audio_path = store.path(audio_handle)
+        
+        # 다중 장치 녹음의 트랙별 파일도 저장소에 보관 (화자 분리에도 사용)
+        track_handles = [store.put_file(path, 'track') for path in track_paths]
+        SessionManager.set('track_artifacts', track_handles)
+        track_paths = [store.path(handle) for handle in track_handles]
+        
+        # 음성 처리는 작업 큐에서 백그라운드로 실행 (화면은 상태만 조회)
+        if self.transcription_service.can_transcribe():
+            job_id = get_job_queue().submit(self._process_audio, audio_path, live_transcriber,
+                                            discard_audio, track_paths)
+            SessionManager.set('job_id', job_id)
+        elif discard_audio:
+            os.unlink(audio_path)
+    
+    def recover_recording(self, recording_id):
+        """사용자가 선택한 중단된 녹음을 복구하여 처리
+
+        진행 중인 녹음이나 처리 작업이 없는 세션에서만 복구
+        """
+        if SessionManager.is_recording() or SessionManager.get('job_id'):
+            return False
+        
+        recording = recover_recording(recording_id)
+        if recording is None:
+            SessionManager.set('result_message', "❌ 녹음을 복구할 수 없습니다 (이미 다른 세션에서 가져갔거나 데이터가 없습니다)")
+            return True
+        
+        SessionManager.clear_results()
+        started = time.strftime('%Y-%m-%d %H:%M', time.localtime(recording['started_at']))
+        SessionManager.set('result_message',
+            f"♻️ 중단된 녹음 복구 성공! ({started} 시작, 녹음 시간: {recording['seconds']:.1f}초)")
+        self._submit_recording(recording['audio_path'], recording['audio_path'], recording['track_paths'])
+        return True
+    
+    def _finish_encoder(self, recorder, encoder):
+        """녹음 중 인코딩한 압축 파일 경로 반환 (실패 시 None)"""
+        if not encoder:
+            return None
+        
+        # 리스너 오류로 중간에 빠졌다면 인코더 스레드만 종료
+        if encoder not in recorder.listeners:
+            encoder.close()
+            encoder.result(timeout=ENCODING_CONFIG['finish_timeout'])
+            if encoder.path and os.path.exists(encoder.path):
+                os.unlink(encoder.path)
+            return None
+        
+        encoded_path, _ = encoder.result(timeout=ENCODING_CONFIG['finish_timeout'])
+        return encoded_path
+    
+    @traced('pipeline')
+    def _process_audio(self, progress, audio_path, live_transcriber=None, discard_audio=False, track_paths=None):
+        """녹음된 오디오를 처리하여 녹취록과 요약 생성 (작업 큐 워커에서 실행)"""
+        service = self.transcription_service
+        service.set_progress_callback(progress)
         try:
-            # 1. 음성 인식
-            transcript_data, error = self.transcription_service.transcribe_audio(audio_path)
+            # 1. 음성 인식 (실시간 인식 결과가 있으면 마지막 구간만 기다림)
+            progress("🎤 음성 인식 중...", stage='transcribe')
+            transcript_data, error = None, None
+            if live_transcriber:
+                transcript_data, error = live_transcriber.result(timeout=TRANSCRIPTION_CONFIG['live_finish_timeout'])
+            if transcript_data is None:
+                transcript_data, error = service.transcribe_audio(audio_path)
             if error:
-                SessionManager.set('result_message', f"❌ {error}")
-                return
+                return None, error
             
             # 2. 화자 분리
-            segments, error = self.transcription_service.process_segments(transcript_data)
+            progress("👥 화자 분리 중...", stage='segment')
+            segments, error = service.process_segments(transcript_data, audio_path, track_paths)
             if error:
-                SessionManager.set('result_message', f"❌ {error}")
-                return
+                return None, error
             
             # 3. 녹취록 생성
-            transcript, error = self.transcription_service.create_transcript(segments)
+            progress("📝 녹취록 생성 중...", stage='transcript')
+            transcript, error = service.create_transcript(segments)
             if error:
-                SessionManager.set('result_message', f"❌ {error}")
-                return
+                return None, error
             
-            SessionManager.set('transcript_content', transcript)
-            
-            # 4. 요약 생성
-            summary, error = self.transcription_service.create_summary(transcript)
+            # 지난 회의 검색용 색인 (실패해도 결과는 계속 생성)
+            meeting_id, error = service.index_transcript(transcript)
             if error:
-                # 요약 실패는 경고로 처리 (녹취록은 성공했으므로)
-                summary = "요약 생성에 실패했습니다."
+                progress(f"⚠️ {error}")
+            
+            # 4. 요약 생성 (로컬 인식만 가능한 경우 건너뜀)
+            transcript_text = transcript.to_txt()
+            if not service.can_summarize():
+                progress("ℹ️ OpenAI API 키가 없어 요약을 건너뜁니다")
+                summary = "OpenAI API 키가 설정되지 않아 요약을 생성하지 않았습니다."
+            else:
+                progress("📄 요약 생성 중...", stage='summary')
+                # 요약은 스트리밍으로 받아 화면에서 생성 중인 내용을 바로 볼 수 있게 함
+                summary, error = service.create_summary(
+                    transcript_text, on_partial=lambda text: progress(partial=text))
+                if error:
+                    # 요약 실패는 경고로 처리 (녹취록은 성공했으므로)
+                    summary = "요약 생성에 실패했습니다."
+                else:
+                    service.index_summary(meeting_id, summary)
             
-            SessionManager.set('summary_content', summary)
+            # 지난 회의 질의응답용 구간 임베딩 (실패해도 결과는 유지)
+            _, error = service.index_semantic(meeting_id, transcript)
+            if error:
+                progress(f"⚠️ {error}")
             
-        except Exception as e:
-            SessionManager.set('result_message', f"❌ 처리 중 오류 발생: {str(e)}")
+            # 결과 텍스트는 파일로 저장하고 작업 결과에는 핸들만 기록
+            store = get_artifact_store()
+            return {
+                'transcript': store.put_text(transcript_text, 'transcript'),
+                # 다른 형식(SRT/VTT/Markdown 등)은 화면에서 구조화된 데이터로 생성
+                'transcript_data': store.put_text(transcript.to_json(), 'transcript', 'json'),
+                'summary': store.put_text(summary, 'summary'),
+                'summary_stats': service.last_summary_stats,
+                'meeting_id': meeting_id
+            }, None
+        finally:
+            service.set_progress_callback(None)
+            if discard_audio and os.path.exists(audio_path):
+                os.unlink(audio_path)
     
     def reset_all(self):
         """전체 상태 초기화"""
-        # 녹음 중이면 먼저 중지
+        # 녹음 중이면 캡처 스레드, 스트림, 장치까지 정리하고 녹음 파일은 삭제
         if SessionManager.is_recording():
             recorder = SessionManager.get('recorder')
             if recorder:
-                recorder.is_recording = False
+                recorder.abort_recording()
+                encoded_path = self._finish_encoder(recorder, SessionManager.get('encoder'))
+                if encoded_path and os.path.exists(encoded_path):
+                    os.unlink(encoded_path)
         
         SessionManager.clear_all()
         return True
\ No newline at end of file
@@ -0,0 +1,109 @@
+# result_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from config import CACHE_CONFIG
+
+# 파일 해시 계산 시 읽는 단위
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    """파일 내용을 블록 단위로 읽어 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(kind, content_hash, params):
+    """결과 종류 + 입력 해시 + 모델/파라미터로 캐시 키 생성"""
+    payload = json.dumps({'kind': kind, 'content': content_hash, 'params': params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """입력 내용 해시 기반의 디스크 캐시 (용량 초과 시 오래 안 쓴 항목부터 삭제)"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """캐시 조회 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # 최근 사용 시각 갱신 (LRU 기준)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """캐시 저장 후 용량 확인"""
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        """최대 용량을 넘으면 마지막 사용 시각이 오래된 항목부터 삭제"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def stats(self):
+        """캐시 적중 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전체에서 공유하는 캐시 인스턴스"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(CACHE_CONFIG['cache_dir'], CACHE_CONFIG['max_bytes'])
+        return _cache
@@ -0,0 +1,327 @@
+# semantic_index.py
+import base64
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+from config import CACHE_CONFIG, SEMANTIC_CONFIG
+from result_cache import get_cache, make_key
+from token_counter import count_tokens
+from tracing import get_tracer
+from transcript_model import format_hms
+
+VECTORS_FILE = 'vectors.f32'
+CHUNKS_DB = 'chunks.db'
+
+
+def chunk_segments(segments, max_tokens, overlap_segments=1):
+    """발언을 시간순으로 묶어 검색 단위 구간 생성 (앞 구간의 마지막 발언을 겹쳐 문맥 유지)
+
+    반환값: start, end, text를 가진 dict 목록
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for segment in segments:
+        line = f"[{format_hms(segment.start)}] {segment.speaker}: {segment.text}"
+        tokens = count_tokens(line)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current = current[-overlap_segments:] if overlap_segments else []
+            current_tokens = sum(item[2] for item in current)
+        current.append((segment, line, tokens))
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+
+    return [
+        {
+            'start': chunk[0][0].start,
+            'end': chunk[-1][0].end,
+            'text': '\n'.join(item[1] for item in chunk)
+        }
+        for chunk in chunks
+    ]
+
+
+def build_answer_prompt(question, sources):
+    """검색된 구간만 근거로 답하도록 하는 프롬프트"""
+    context = '\n\n'.join(
+        f"[{source['title']} ({source['created_at'].strftime('%Y-%m-%d')}) "
+        f"{format_hms(source['start'])}-{format_hms(source['end'])}]\n{source['text']}"
+        for source in sources
+    )
+    return f"""다음은 지난 회의 녹취록에서 질문과 관련된 부분입니다.
+
+{context}
+
+위 내용만 근거로 질문에 한국어로 답해주세요. 근거가 된 회의 제목과 시각을 함께 적고, 관련 내용이 없으면 모른다고 답해주세요.
+
+질문: {question}"""
+
+
+def _normalize(vectors):
+    """코사인 유사도를 내적으로 계산하도록 단위 벡터로 변환"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class Embedder:
+    """OpenAI 임베딩 호출 (여러 구간을 한 번에 요청하고 질문 벡터는 결과 캐시에 보관)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.model = SEMANTIC_CONFIG['embedding_model']
+        self.dimensions = SEMANTIC_CONFIG['dimensions']
+
+    def embed(self, texts):
+        """텍스트 목록의 단위 벡터 (len(texts), dimensions) float32 배열"""
+        if self.client is None:
+            raise RuntimeError("OpenAI API 키가 설정되지 않았습니다")
+
+        vectors = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        batch_size = SEMANTIC_CONFIG['batch_size']
+        for start in range(0, len(texts), batch_size):
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + batch_size],
+                dimensions=self.dimensions
+            )
+            for item in response.data:
+                vectors[start + item.index] = item.embedding
+            usage = getattr(response, 'usage', None)
+            get_tracer().add(embedding_tokens=getattr(usage, 'prompt_tokens', 0) or 0)
+        return _normalize(vectors)
+
+    def embed_query(self, text):
+        """질문 하나의 단위 벡터 (같은 질문은 다시 호출하지 않음)"""
+        cache_key = None
+        if CACHE_CONFIG['enabled']:
+            cache_key = make_key('embedding', hashlib.sha256(text.encode('utf-8')).hexdigest(),
+                                 {'model': self.model, 'dimensions': self.dimensions})
+            cached = get_cache().get(cache_key)
+            if cached is not None:
+                return np.frombuffer(base64.b64decode(cached['vector']), dtype=np.float32)
+
+        vector = self.embed([text])[0]
+        if cache_key:
+            get_cache().set(cache_key, {'vector': base64.b64encode(vector.tobytes()).decode('ascii')})
+        return vector
+
+
+class SemanticIndex:
+    """회의 구간 임베딩 저장소
+
+    벡터는 (구간 수, 차원) float32 행렬로 파일에 이어 붙이고 메모리 매핑으로 검색
+    구간 정보는 행 번호를 키로 SQLite에 저장
+    """
+
+    def __init__(self, root_dir, dimensions):
+        self.root_dir = root_dir
+        self.dimensions = dimensions
+        self.vectors_path = os.path.join(root_dir, VECTORS_FILE)
+        self._lock = threading.Lock()
+        self._matrix = None
+        os.makedirs(root_dir, exist_ok=True)
+        # 일괄 처리 CLI의 여러 프로세스가 동시에 추가할 수 있으므로 잠금 대기 시간 지정
+        self._conn = sqlite3.connect(os.path.join(root_dir, CHUNKS_DB), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    row INTEGER PRIMARY KEY,
+                    meeting_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    start_seconds REAL NOT NULL,
+                    end_seconds REAL NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    text TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_content_hash ON chunks (content_hash)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_created_at ON chunks (created_at)")
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._repair()
+
+    def _row_bytes(self):
+        return self.dimensions * np.dtype(np.float32).itemsize
+
+    def _repair(self):
+        """중간에 중단된 추가 작업 정리 (벡터 파일과 구간 정보의 행 수를 맞춤)"""
+        rows = self._conn.execute("SELECT COALESCE(MAX(row), -1) + 1 FROM chunks").fetchone()[0]
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        file_rows = size // self._row_bytes()
+        if file_rows < rows:
+            self._conn.execute("DELETE FROM chunks WHERE row >= ?", (file_rows,))
+            rows = file_rows
+        if size != rows * self._row_bytes():
+            with open(self.vectors_path, 'ab') as f:
+                f.truncate(rows * self._row_bytes())
+        return rows
+
+    def _load_matrix(self):
+        """벡터 행렬 메모리 매핑 (다른 프로세스가 추가했으면 다시 매핑)"""
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        rows = size // self._row_bytes()
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            if rows == 0:
+                self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                         shape=(rows, self.dimensions))
+        return self._matrix
+
+    def add_meeting(self, meeting_id, title, created_at, chunks, embedder):
+        """회의 구간들을 임베딩해 추가하고 새로 임베딩한 구간 수 반환
+
+        이미 저장된 구간과 내용이 같으면 저장된 벡터를 재사용
+        """
+        if not chunks:
+            return 0
+        hashes = [hashlib.sha256(chunk['text'].encode('utf-8')).hexdigest() for chunk in chunks]
+
+        with self._lock:
+            placeholders = ', '.join('?' * len(set(hashes)))
+            known = {
+                row['content_hash']: row['row']
+                for row in self._conn.execute(
+                    f"SELECT content_hash, MIN(row) AS row FROM chunks "
+                    f"WHERE content_hash IN ({placeholders}) GROUP BY content_hash", list(set(hashes)))
+            }
+            matrix = self._load_matrix()
+            reused = {content_hash: np.array(matrix[row]) for content_hash, row in known.items()
+                      if row < matrix.shape[0]}
+
+        missing = list(dict.fromkeys(h for h in hashes if h not in reused))
+        if missing:
+            texts = {content_hash: chunk['text'] for content_hash, chunk in zip(hashes, chunks)}
+            for content_hash, vector in zip(missing, embedder.embed([texts[h] for h in missing])):
+                reused[content_hash] = vector
+        vectors = np.stack([reused[h] for h in hashes]).astype(np.float32)
+
+        with self._lock, self._conn:
+            # 쓰기 잠금을 잡은 상태에서 행 번호를 정하고 벡터를 먼저 기록
+            self._conn.execute("BEGIN IMMEDIATE")
+            first = self._repair()
+            with open(self.vectors_path, 'r+b' if os.path.exists(self.vectors_path) else 'wb') as f:
+                f.seek(first * self._row_bytes())
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._conn.executemany(
+                "INSERT INTO chunks (row, meeting_id, title, created_at, start_seconds, end_seconds, "
+                "content_hash, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(first + i, meeting_id, title, created_at.timestamp(), chunk['start'], chunk['end'],
+                  content_hash, chunk['text'])
+                 for i, (chunk, content_hash) in enumerate(zip(chunks, hashes))]
+            )
+        return len(missing)
+
+    def search(self, query_vectors, k, date_from=None, date_to=None):
+        """질문 벡터별 유사도 상위 k개 구간 (블록 단위 행렬 곱 + argpartition)
+
+        query_vectors: (질문 수, 차원) 또는 (차원,) 단위 벡터
+        반환값: 질문별 score, meeting_id, title, created_at, start, end, text를 가진 dict 목록
+        """
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        with self._lock:
+            matrix = self._load_matrix()
+            allowed = None
+            if date_from or date_to:
+                start = datetime.combine(date_from, datetime.min.time()).timestamp() if date_from else 0
+                end = datetime.combine(date_to, datetime.max.time()).timestamp() if date_to else float('inf')
+                allowed = np.fromiter(
+                    (row for (row,) in self._conn.execute(
+                        "SELECT row FROM chunks WHERE created_at BETWEEN ? AND ? ORDER BY row", (start, end))),
+                    dtype=np.int64)
+                allowed = allowed[allowed < matrix.shape[0]]
+
+        total = matrix.shape[0] if allowed is None else len(allowed)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        block_rows = SEMANTIC_CONFIG['search_block_rows']
+        for block_start in range(0, total, block_rows):
+            block_end = min(block_start + block_rows, total)
+            if allowed is None:
+                rows = np.arange(block_start, block_end)
+                block = matrix[block_start:block_end]
+            else:
+                rows = allowed[block_start:block_end]
+                block = matrix[rows]
+            scores = np.concatenate([best_scores, queries @ block.T], axis=1)
+            candidates = np.concatenate([best_rows, np.broadcast_to(rows, (len(queries), len(rows)))], axis=1)
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                candidates = np.take_along_axis(candidates, top, axis=1)
+            best_scores, best_rows = scores, candidates
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+        wanted = sorted({int(row) for row in best_rows.ravel()})
+        with self._lock:
+            info = {
+                row['row']: row
+                for row in self._conn.execute(
+                    f"SELECT * FROM chunks WHERE row IN ({', '.join('?' * len(wanted))})", wanted)
+            } if wanted else {}
+
+        return [
+            [
+                {
+                    'score': float(score),
+                    'meeting_id': info[row]['meeting_id'],
+                    'title': info[row]['title'],
+                    'created_at': datetime.fromtimestamp(info[row]['created_at']),
+                    'start': info[row]['start_seconds'],
+                    'end': info[row]['end_seconds'],
+                    'text': info[row]['text']
+                }
+                for score, row in zip(scores, rows) if int(row) in info
+            ]
+            for scores, rows in zip(best_scores, best_rows)
+        ]
+
+    def delete_meeting(self, meeting_id):
+        """회의의 구간 삭제 (벡터 파일의 행은 그대로 두고 0으로 덮어 검색에 걸리지 않게 함)"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = [row for (row,) in self._conn.execute(
+                "SELECT row FROM chunks WHERE meeting_id = ?", (meeting_id,))]
+            if not rows:
+                return 0
+            if os.path.exists(self.vectors_path):
+                zeros = bytes(self._row_bytes())
+                with open(self.vectors_path, 'r+b') as f:
+                    for row in rows:
+                        f.seek(row * self._row_bytes())
+                        f.write(zeros)
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._conn.execute("DELETE FROM chunks WHERE meeting_id = ?", (meeting_id,))
+        return len(rows)
+
+    def count(self):
+        """저장된 구간 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_semantic_index():
+    """프로세스 전체에서 공유하는 임베딩 저장소"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SemanticIndex(SEMANTIC_CONFIG['root_dir'], SEMANTIC_CONFIG['dimensions'])
+        return _index
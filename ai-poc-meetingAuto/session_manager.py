@@ -1,6 +1,8 @@
 # session_manager.py
 import streamlit as st
+from artifact_store import get_artifact_store
 from config import SESSION_KEYS
+from job_queue import get_job_queue, DONE, FAILED
 
 class SessionManager:
     """Streamlit 세션 상태 관리 클래스"""
@@ -11,12 +13,17 @@ class SessionManager:
         defaults = {
             SESSION_KEYS['recording']: False,
             SESSION_KEYS['recorder']: None,
+            SESSION_KEYS['encoder']: None,
+            SESSION_KEYS['live_transcriber']: None,
             SESSION_KEYS['start_time']: None,
             SESSION_KEYS['stop_requested']: False,
             SESSION_KEYS['result_message']: None,
-            SESSION_KEYS['audio_file_data']: None,
-            SESSION_KEYS['transcript_content']: None,
-            SESSION_KEYS['summary_content']: None
+            SESSION_KEYS['job_id']: None,
+            SESSION_KEYS['audio_artifact']: None,
+            SESSION_KEYS['track_artifacts']: None,
+            SESSION_KEYS['transcript_artifact']: None,
+            SESSION_KEYS['transcript_data_artifact']: None,
+            SESSION_KEYS['summary_artifact']: None
         }
         
         for key, default_value in defaults.items():
@@ -36,18 +43,78 @@ class SessionManager:
     @staticmethod
     def clear_results():
         """결과 관련 세션 상태 초기화"""
-        result_keys = ['result_message', 'audio_file_data', 'transcript_content', 'summary_content', 'stop_requested']
+        SessionManager.remove_artifacts()
+        result_keys = ['result_message', 'job_id', 'audio_artifact', 'track_artifacts', 'transcript_artifact', 'transcript_data_artifact', 'summary_artifact', 'stop_requested']
         for key in result_keys:
             SessionManager.set(key, None if key != 'stop_requested' else False)
     
     @staticmethod
     def clear_all():
         """모든 세션 상태 초기화"""
+        SessionManager.remove_artifacts()
         for key in SESSION_KEYS.values():
             if key in st.session_state:
                 del st.session_state[key]
         SessionManager.initialize()
     
+    @staticmethod
+    def remove_artifacts():
+        """이전 녹음/녹취록/요약 파일 삭제"""
+        store = get_artifact_store()
+        for key in ['audio_artifact', 'transcript_artifact', 'transcript_data_artifact', 'summary_artifact']:
+            handle = SessionManager.get(key)
+            if handle:
+                store.delete(handle)
+        for handle in SessionManager.get('track_artifacts') or []:
+            store.delete(handle)
+    
+    @staticmethod
+    def get_artifact_path(key):
+        """세션에 저장된 핸들의 파일 경로 (없거나 만료되었으면 None)"""
+        handle = SessionManager.get(key)
+        return get_artifact_store().path(handle) if handle else None
+    
+    @staticmethod
+    def get_artifact_text(key):
+        """세션에 저장된 핸들의 텍스트 내용 (없거나 만료되었으면 None)"""
+        handle = SessionManager.get(key)
+        return get_artifact_store().read_text(handle) if handle else None
+    
+    @staticmethod
+    def get_live_segments():
+        """녹음 중 실시간으로 인식된 세그먼트 목록"""
+        live_transcriber = SessionManager.get('live_transcriber')
+        if live_transcriber:
+            return live_transcriber.get_segments()
+        return []
+    
+    @staticmethod
+    def poll_job():
+        """처리 작업 상태 조회 (완료되면 결과를 세션에 반영하고 None 반환)"""
+        job_id = SessionManager.get('job_id')
+        if not job_id:
+            return None
+        
+        job = get_job_queue().get(job_id)
+        if job is None:
+            SessionManager.set('job_id', None)
+            return None
+        
+        if job['status'] == DONE:
+            result = job['result']
+            SessionManager.set('transcript_artifact', result['transcript'])
+            SessionManager.set('transcript_data_artifact', result['transcript_data'])
+            SessionManager.set('summary_artifact', result['summary'])
+            SessionManager.set('job_id', None)
+            return None
+        
+        if job['status'] == FAILED:
+            SessionManager.set('result_message', f"❌ {job['error']}")
+            SessionManager.set('job_id', None)
+            return None
+        
+        return job
+    
     @staticmethod
     def is_recording():
         """현재 녹음 중인지 확인"""
@@ -61,5 +128,5 @@ class SessionManager:
     @staticmethod
     def has_results():
         """결과 데이터가 있는지 확인"""
-        return (SessionManager.get('transcript_content') is not None or 
-                SessionManager.get('summary_content') is not None)
\ No newline at end of file
+        return (SessionManager.get('transcript_artifact') is not None or 
+                SessionManager.get('summary_artifact') is not None)
\ No newline at end of file
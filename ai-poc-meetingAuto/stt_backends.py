@@ -0,0 +1,148 @@
+# stt_backends.py
+import os
+import threading
+from types import SimpleNamespace
+from config import OPENAI_CONFIG, STT_CONFIG, TRANSCRIPTION_CONFIG
+from tracing import get_tracer
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # 로컬 엔진을 쓰지 않으면 설치하지 않아도 됨
+    WhisperModel = None
+
+
+class SttBackend:
+    """음성 인식 엔진 인터페이스
+
+    transcribe(audio_path)는 Whisper verbose_json과 같은 속성 구조를 반환
+    (text, duration, segments: id/start/end/text 속성을 가진 객체 목록)
+    """
+
+    name = None
+
+    def __init__(self, client=None):
+        self.client = client
+
+    @property
+    def max_workers(self):
+        """동시에 인식할 구간 수"""
+        return TRANSCRIPTION_CONFIG['max_workers']
+
+    def cache_params(self):
+        """결과 캐시 키에 포함할 설정"""
+        return {'backend': self.name}
+
+    def is_available(self):
+        """인식 가능 여부 (로컬 엔진은 API 키 없이도 사용 가능)"""
+        return True
+
+    def transcribe(self, audio_path):
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(SttBackend):
+    """OpenAI Whisper API"""
+
+    name = 'openai'
+
+    def is_available(self):
+        return self.client is not None
+
+    def cache_params(self):
+        return {
+            'model': OPENAI_CONFIG['whisper_model'],
+            'language': 'ko',
+            'response_format': 'verbose_json'
+        }
+
+    def transcribe(self, audio_path):
+        if self.client is None:
+            raise RuntimeError("OpenAI API 키가 설정되지 않았습니다")
+        with open(audio_path, "rb") as audio_file:
+            # 업로드 파일이 크므로 요청 제한 시간을 따로 적용
+            client = self.client.with_options(timeout=OPENAI_CONFIG['transcription_timeout'])
+            result = client.audio.transcriptions.create(
+                model=OPENAI_CONFIG['whisper_model'],
+                file=audio_file,
+                response_format="verbose_json",
+                language="ko"
+            )
+        # 요금은 전송한 오디오 길이 기준
+        get_tracer().add(bytes_uploaded=os.path.getsize(audio_path),
+                         billed_audio_seconds=getattr(result, 'duration', 0) or 0)
+        return result
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _load_local_model():
+    """프로세스 전체에서 공유하는 로컬 Whisper 모델 (처음 사용할 때 로드)"""
+    if WhisperModel is None:
+        raise RuntimeError("faster-whisper가 설치되어 있지 않습니다 (pip install faster-whisper)")
+
+    key = (STT_CONFIG['local_model'], STT_CONFIG['device'], STT_CONFIG['compute_type'])
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = WhisperModel(
+                STT_CONFIG['local_model'],
+                device=STT_CONFIG['device'],
+                compute_type=STT_CONFIG['compute_type'],
+                cpu_threads=STT_CONFIG['cpu_threads'],
+                # 여러 구간을 동시에 인식할 수 있도록 워커 수 지정
+                num_workers=STT_CONFIG['num_workers']
+            )
+            _models[key] = model
+        return model
+
+
+class FasterWhisperBackend(SttBackend):
+    """faster-whisper(CTranslate2) 기반 로컬 CPU 인식 (int8 양자화)"""
+
+    name = 'faster-whisper'
+
+    @property
+    def max_workers(self):
+        return STT_CONFIG['num_workers']
+
+    def cache_params(self):
+        return {
+            'backend': self.name,
+            'model': STT_CONFIG['local_model'],
+            'compute_type': STT_CONFIG['compute_type'],
+            'beam_size': STT_CONFIG['beam_size'],
+            'language': STT_CONFIG['language']
+        }
+
+    def transcribe(self, audio_path):
+        model = _load_local_model()
+        # 침묵 제거는 앞 단계(VAD)에서 이미 처리
+        segments, info = model.transcribe(
+            audio_path,
+            language=STT_CONFIG['language'],
+            beam_size=STT_CONFIG['beam_size'],
+            vad_filter=False
+        )
+        segments = [
+            SimpleNamespace(id=i, start=segment.start, end=segment.end, text=segment.text)
+            for i, segment in enumerate(segments)
+        ]
+        return SimpleNamespace(
+            text=''.join(segment.text for segment in segments).strip(),
+            duration=info.duration,
+            segments=segments
+        )
+
+
+# 엔진 이름 -> 클래스
+STT_BACKENDS = {
+    'openai': OpenAIWhisperBackend,
+    'faster-whisper': FasterWhisperBackend
+}
+
+
+def create_stt_backend(client, name=None):
+    """설정된 음성 인식 엔진 생성"""
+    return STT_BACKENDS[name or STT_CONFIG['backend']](client)
@@ -0,0 +1,262 @@
+# summarizer.py
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from config import OPENAI_CONFIG, SUMMARY_CONFIG
+from token_counter import count_tokens
+
+SUMMARY_FORMAT = """요약 형식:
+1. 회의 개요
+2. 주요 논의사항
+3. 결론 및 다음 단계"""
+
+# 녹취록 발언 줄: [HH:MM:SS-HH:MM:SS] 화자: 내용
+TURN_PATTERN = re.compile(r'^\[\d+:\d{2}:\d{2}-\d+:\d{2}:\d{2}\] ([^:]+): (.*)$')
+
+
+def content_lines(transcript):
+    """녹취록에서 헤더를 제외한 발언 줄만 추출"""
+    lines = [line for line in transcript.splitlines() if line.startswith('[')]
+    if not lines:
+        lines = [line for line in transcript.splitlines() if line.strip()]
+    return lines
+
+
+def _normalize(text):
+    """비교용 텍스트 (문장부호와 공백 제거, 소문자)"""
+    return re.sub(r'[\W_]+', '', text).lower()
+
+
+def _is_duplicate(speaker, normalized, recent):
+    """최근 발언 중 같거나 거의 같은 발언이 있는지 여부"""
+    min_chars = SUMMARY_CONFIG['duplicate_min_chars']
+    threshold = SUMMARY_CONFIG['duplicate_similarity']
+    for other_speaker, other in recent:
+        if normalized == other and (other_speaker == speaker or len(normalized) >= min_chars):
+            return True
+        if len(normalized) < min_chars or len(other) < min_chars:
+            continue
+        # 빠른 상한 비교로 대부분 걸러낸 뒤에만 정확한 유사도 계산
+        matcher = SequenceMatcher(None, normalized, other, autojunk=False)
+        if (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+                and matcher.ratio() >= threshold):
+            return True
+    return False
+
+
+def compact_lines(lines):
+    """요약 입력용으로 발언 줄 압축
+
+    시각을 지우고, 추임새만 있는 발언과 최근 발언과 거의 같은 발언(Whisper 반복)을 제거한 뒤
+    같은 화자의 연속 발언을 한 줄로 합침. 형식을 알 수 없는 줄은 그대로 둠
+    """
+    fillers = {_normalize(phrase) for phrase in SUMMARY_CONFIG['filler_phrases']}
+    recent = deque(maxlen=SUMMARY_CONFIG['duplicate_window'])
+    turns = []
+    for line in lines:
+        match = TURN_PATTERN.match(line)
+        if not match:
+            turns.append([None, [line.strip()], 0])
+            continue
+
+        speaker, text = match.group(1), match.group(2).strip()
+        normalized = _normalize(text)
+        words = [word for word in map(_normalize, text.split()) if word]
+        if not normalized or normalized in fillers or all(word in fillers for word in words):
+            continue
+        if _is_duplicate(speaker, normalized, recent):
+            continue
+        recent.append((speaker, normalized))
+
+        last = turns[-1] if turns else None
+        if last and last[0] == speaker and last[2] + len(text) < SUMMARY_CONFIG['turn_max_chars']:
+            last[1].append(text)
+            last[2] += len(text) + 1
+        else:
+            turns.append([speaker, [text], len(text)])
+
+    return [f"{speaker}: {' '.join(texts)}" if speaker else texts[0] for speaker, texts, _ in turns]
+
+
+class MapReduceSummarizer:
+    """긴 녹취록을 구간별로 요약한 뒤 합치는 계층형 요약기"""
+
+    def __init__(self, client):
+        self.client = client
+        self.stats = []
+
+    def summarize(self, transcript, on_partial=None):
+        """녹취록 전체 요약 (반환값: 요약, 단계별 통계)
+
+        on_partial(text)를 주면 최종 요약이 생성되는 동안 지금까지의 내용을 주기적으로 전달
+        """
+        self.stats = []
+        model = OPENAI_CONFIG['gpt_model']
+
+        # 헤더를 제외한 발언 줄만 구간으로 나눔
+        lines = content_lines(transcript)
+        if SUMMARY_CONFIG['compact']:
+            lines = self._compact(lines, model)
+        chunks = self._split(lines, SUMMARY_CONFIG['chunk_tokens'], model)
+
+        # 한 구간에 들어가면 바로 최종 요약
+        if len(chunks) <= 1:
+            summary = self._stream_final(self._final_prompt('\n'.join(lines)), on_partial)
+            return summary, self.stats
+
+        # map: 구간별 부분 요약
+        partials = self._run_stage(
+            'map',
+            [self._map_prompt(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)],
+            SUMMARY_CONFIG['partial_max_tokens']
+        )
+
+        # reduce: 부분 요약이 한 번에 들어갈 때까지 단계적으로 합침
+        level = 1
+        while True:
+            groups = self._split(partials, SUMMARY_CONFIG['reduce_input_tokens'], model)
+            # 더 묶을 수 없으면 (부분 요약 하나가 예산보다 큰 경우) 그대로 최종 단계로
+            if len(groups) <= 1 or len(groups) >= len(partials):
+                break
+            partials = self._run_stage(
+                f'reduce_{level}',
+                [self._merge_prompt(group) for group in groups],
+                SUMMARY_CONFIG['partial_max_tokens']
+            )
+            level += 1
+
+        summary = self._stream_final(self._final_prompt('\n\n'.join(partials), partial=True), on_partial)
+        return summary, self.stats
+
+    def _compact(self, lines, model):
+        """발언 줄 압축 후 줄 수와 토큰 수 변화 기록 (모두 제거되면 원래 줄 사용)"""
+        started = time.time()
+        compacted = compact_lines(lines) or lines
+        self.stats.append({
+            'stage': 'compact',
+            'calls': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'seconds': round(time.time() - started, 2),
+            'lines_before': len(lines),
+            'lines_after': len(compacted),
+            'tokens_before': count_tokens('\n'.join(lines), model),
+            'tokens_after': count_tokens('\n'.join(compacted), model)
+        })
+        return compacted
+
+    def _split(self, items, budget, model):
+        """항목 경계를 유지하면서 토큰 예산 단위로 묶기"""
+        chunks = []
+        current = []
+        current_tokens = 0
+        for item in items:
+            tokens = count_tokens(item, model)
+            if current and current_tokens + tokens > budget:
+                chunks.append('\n'.join(current))
+                current = []
+                current_tokens = 0
+            current.append(item)
+            current_tokens += tokens
+        if current:
+            chunks.append('\n'.join(current))
+        return chunks
+
+    def _run_stage(self, stage, prompts, max_tokens):
+        """한 단계의 프롬프트들을 병렬 호출하고 통계 기록"""
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=SUMMARY_CONFIG['max_workers']) as executor:
+            responses = list(executor.map(lambda prompt: self._complete(prompt, max_tokens), prompts))
+
+        usage = [getattr(response, 'usage', None) for response in responses]
+        self.stats.append({
+            'stage': stage,
+            'calls': len(prompts),
+            'prompt_tokens': sum(getattr(u, 'prompt_tokens', 0) or 0 for u in usage),
+            'completion_tokens': sum(getattr(u, 'completion_tokens', 0) or 0 for u in usage),
+            'seconds': round(time.time() - started, 2)
+        })
+        return [response.choices[0].message.content for response in responses]
+
+    def _stream_final(self, prompt, on_partial):
+        """최종 요약을 스트리밍으로 받으며 첫 토큰까지의 시간 기록"""
+        started = time.time()
+        stream = self.client.chat.completions.create(
+            model=OPENAI_CONFIG['gpt_model'],
+            messages=[{"role": "user", "content": prompt}],
+            temperature=OPENAI_CONFIG['temperature'],
+            max_tokens=OPENAI_CONFIG['max_tokens'],
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        parts = []
+        usage = None
+        first_token = None
+        last_update = 0.0
+        for chunk in stream:
+            if getattr(chunk, 'usage', None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token is None:
+                first_token = time.time() - started
+            parts.append(delta)
+
+            # 화면 갱신 부담을 줄이기 위해 일정 간격으로만 전달
+            if on_partial and time.time() - last_update >= SUMMARY_CONFIG['stream_update_seconds']:
+                on_partial(''.join(parts))
+                last_update = time.time()
+
+        summary = ''.join(parts)
+        if on_partial:
+            on_partial(summary)
+
+        self.stats.append({
+            'stage': 'final',
+            'calls': 1,
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+            'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+            'seconds': round(time.time() - started, 2),
+            'ttft_seconds': round(first_token, 2) if first_token is not None else None
+        })
+        return summary
+
+    def _complete(self, prompt, max_tokens):
+        """GPT 호출"""
+        return self.client.chat.completions.create(
+            model=OPENAI_CONFIG['gpt_model'],
+            messages=[{"role": "user", "content": prompt}],
+            temperature=OPENAI_CONFIG['temperature'],
+            max_tokens=max_tokens
+        )
+
+    def _map_prompt(self, chunk, index, total):
+        return f"""다음은 회의 녹취록의 일부입니다 ({index}/{total}).
+이 부분에서 논의된 주제, 결정사항, 할 일을 빠짐없이 간결하게 정리해주세요:
+
+{chunk}"""
+
+    def _merge_prompt(self, group):
+        return f"""다음은 회의 각 부분의 요약입니다.
+중복을 제거하고 논의된 주제, 결정사항, 할 일을 하나의 요약으로 합쳐주세요:
+
+{group}"""
+
+    def _final_prompt(self, text, partial=False):
+        if partial:
+            return f"""다음은 회의 녹취록을 부분별로 요약한 내용입니다. 전체 회의를 요약해주세요:
+
+{text}
+
+{SUMMARY_FORMAT}"""
+        return f"""다음 회의 녹취록을 요약해주세요:
+
+{text}
+
+{SUMMARY_FORMAT}"""
@@ -0,0 +1,6 @@
+# conftest.py
+import os
+import sys
+
+# 앱 모듈은 패키지가 아니므로 상위 폴더를 import 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
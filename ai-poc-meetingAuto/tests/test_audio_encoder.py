@@ -0,0 +1,40 @@
+# test_audio_encoder.py
+import numpy as np
+import pytest
+from audio_encoder import StreamResampler
+
+
+def _tone(frequency, rate, seconds=1.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (1000 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def _resample(samples, source_rate, target_rate, chunk):
+    resampler = StreamResampler(source_rate, target_rate)
+    return np.concatenate([resampler.process(samples[i:i + chunk]) for i in range(0, len(samples), chunk)])
+
+
+def test_same_rate_passes_through():
+    samples = _tone(440, 16000)
+    assert StreamResampler(16000, 16000).process(samples) is samples
+
+
+@pytest.mark.parametrize('source_rate', [44100, 48000, 8000])
+def test_output_length_follows_rate(source_rate):
+    out = _resample(_tone(300, source_rate), source_rate, 16000, 1024)
+    assert abs(len(out) - 16000) <= 64
+
+
+@pytest.mark.parametrize('chunk', [1, 37, 1024, 4096])
+def test_chunked_output_matches_single_call(chunk):
+    samples = _tone(440, 44100)
+    whole = StreamResampler(44100, 16000).process(samples)
+    np.testing.assert_allclose(_resample(samples, 44100, 16000, chunk), whole, atol=1e-2)
+
+
+def test_keeps_speech_band_and_removes_aliasing():
+    # 필터 지연이 지난 뒤 구간의 RMS로 비교
+    speech = _resample(_tone(1000, 48000), 48000, 16000, 1024)[1000:]
+    alias = _resample(_tone(12000, 48000), 48000, 16000, 1024)[1000:]
+    assert np.sqrt(np.mean(speech ** 2)) == pytest.approx(1000 / np.sqrt(2), rel=0.05)
+    assert np.sqrt(np.mean(alias ** 2)) < 1000 / np.sqrt(2) * 0.05
@@ -0,0 +1,85 @@
+# test_audio_recorder.py
+import struct
+import wave
+from audio_recorder import RingBuffer, _repair_wave
+
+
+def test_ring_buffer_keeps_order():
+    buffer = RingBuffer(4, 8)
+    for chunk in (b'a', b'bb', b'ccc'):
+        assert buffer.push(chunk)
+    assert [buffer.pop(), buffer.pop(), buffer.pop()] == [(0, b'a'), (0, b'bb'), (0, b'ccc')]
+    assert buffer.pop(timeout=0.01) is None
+
+
+def test_ring_buffer_wraps_around():
+    buffer = RingBuffer(2, 4)
+    for i in range(5):
+        assert buffer.push(bytes([i]) * 4)
+        assert buffer.pop() == (0, bytes([i]) * 4)
+
+
+def test_ring_buffer_rejects_when_full_or_oversized():
+    buffer = RingBuffer(2, 4)
+    assert not buffer.push(b'12345')
+    assert buffer.push(b'1') and buffer.push(b'2')
+    assert not buffer.push(b'3')
+    assert buffer.fill() == 1.0
+
+
+def test_ring_buffer_reports_gap_before_next_chunk():
+    buffer = RingBuffer(4, 4)
+    buffer.push(b'a')
+    buffer.skip(4)
+    buffer.skip(2)
+    buffer.push(b'b')
+    assert buffer.pop() == (0, b'a')
+    assert buffer.pop() == (6, b'b')
+
+
+def test_ring_buffer_trailing_gap_and_drain():
+    buffer = RingBuffer(4, 4)
+    buffer.push(b'a')
+    buffer.skip(3)
+    buffer.close()
+    assert not buffer.drained()
+    assert buffer.pop() == (0, b'a')
+    assert buffer.drained()
+    assert buffer.trailing_gap() == 3
+
+
+def _crashed_wave(path, data, channels=2, sample_width=2, rate=16000):
+    """헤더의 데이터 크기가 0인 채로 데이터만 기록된 WAV (녹음 중 종료된 상태)"""
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(rate)
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def test_repair_wave_restores_header(tmp_path):
+    path = tmp_path / 'crashed.wav'
+    data = bytes(range(256)) * 8
+    _crashed_wave(path, data)
+
+    assert _repair_wave(str(path), 4) == len(data)
+    with wave.open(str(path), 'rb') as wf:
+        assert wf.getnframes() == len(data) // 4
+        assert wf.readframes(wf.getnframes()) == data
+    assert struct.unpack('<I', path.read_bytes()[4:8])[0] == path.stat().st_size - 8
+
+
+def test_repair_wave_drops_partial_frame(tmp_path):
+    path = tmp_path / 'crashed.wav'
+    _crashed_wave(path, bytes(4 * 10 + 3))
+
+    assert _repair_wave(str(path), 4) == 40
+    with wave.open(str(path), 'rb') as wf:
+        assert wf.getnframes() == 10
+
+
+def test_repair_wave_rejects_non_wave(tmp_path):
+    path = tmp_path / 'broken.wav'
+    path.write_bytes(b'not a wave file' * 10)
+    assert _repair_wave(str(path), 4) is None
@@ -0,0 +1,17 @@
+# test_diarization.py
+import pytest
+from benchmark import check_diarization
+
+
+@pytest.fixture(scope='module')
+def report():
+    return check_diarization()
+
+
+def test_one_speaker_stays_one(report):
+    assert report['one_speaker']['speakers'] == 1
+
+
+def test_two_speakers_are_separated(report):
+    assert report['two_speakers']['speakers'] == 2
+    assert report['two_speakers']['agreement'] >= 0.9
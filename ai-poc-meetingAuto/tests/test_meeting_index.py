@@ -0,0 +1,43 @@
+# test_meeting_index.py
+from datetime import datetime
+import pytest
+from meeting_index import MATCH_END, MATCH_START, MeetingIndex, build_match_query
+from transcript_model import Segment, Transcript
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('예산', '"예산"*'),
+    ('  예산   회의 ', '"예산"* "회의"*'),
+    ('"예산" 결정', '"예산"* "결정"*'),
+    ('OR NEAR', '"OR"* "NEAR"*'),
+])
+def test_build_match_query(query, expected):
+    assert build_match_query(query) == expected
+
+
+@pytest.mark.parametrize('query', ['', '   ', '""'])
+def test_build_match_query_without_terms(query):
+    assert build_match_query(query) is None
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MeetingIndex(str(tmp_path / 'meetings.db'))
+    index.add_transcript(Transcript([
+        Segment(0.0, 3.0, '화자 1', '다음 분기 예산은 동결하기로 했습니다'),
+        Segment(3.0, 6.0, '화자 2', '채용 계획은 다음 회의에서 정합니다'),
+    ], datetime(2024, 5, 2, 10, 0)), title='분기 회의')
+    return index
+
+
+@pytest.mark.parametrize('query, texts', [
+    ('예산', ['다음 분기 예산은 동결하기로 했습니다']),
+    ('다음 예산', ['다음 분기 예산은 동결하기로 했습니다']),
+    ('다음', ['다음 분기 예산은 동결하기로 했습니다', '채용 계획은 다음 회의에서 정합니다']),
+    ('예산 채용', []),
+    ('"예산', ['다음 분기 예산은 동결하기로 했습니다']),
+])
+def test_search_matches_prefixes_of_every_term(index, query, texts):
+    results = index.search(query)
+    found = sorted(result['snippet'].replace(MATCH_START, '').replace(MATCH_END, '') for result in results)
+    assert found == sorted(texts)
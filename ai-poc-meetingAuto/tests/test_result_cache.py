@@ -0,0 +1,74 @@
+# test_result_cache.py
+import wave
+import pytest
+import transcription_service
+from config import TRACING_CONFIG, TRANSCRIPTION_CONFIG, VAD_CONFIG
+from result_cache import make_key
+
+
+def test_make_key_ignores_param_order():
+    assert (make_key('summary', 'abc', {'model': 'gpt', 'temperature': 0.2})
+            == make_key('summary', 'abc', {'temperature': 0.2, 'model': 'gpt'}))
+
+
+@pytest.mark.parametrize('kind, content_hash, params', [
+    ('transcription', 'abc', {'model': 'gpt'}),
+    ('summary', 'abd', {'model': 'gpt'}),
+    ('summary', 'abc', {'model': 'gpt-4o'}),
+    ('summary', 'abc', {'model': 'gpt', 'summary': {'chunk_tokens': 1}}),
+])
+def test_make_key_changes_with_each_part(kind, content_hash, params):
+    assert make_key(kind, content_hash, params) != make_key('summary', 'abc', {'model': 'gpt'})
+
+
+class _RecordingCache:
+    """조회한 키를 기록하고 항상 적중하는 캐시"""
+
+    def __init__(self):
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+        return {'text': '', 'duration': 0.0, 'segments': []}
+
+
+@pytest.fixture
+def transcription_key(monkeypatch, tmp_path):
+    """현재 설정으로 만든 음성 인식 캐시 키"""
+    cache = _RecordingCache()
+    monkeypatch.setitem(TRACING_CONFIG, 'enabled', False)
+    monkeypatch.setattr(transcription_service, 'get_cache', lambda: cache)
+    audio_path = tmp_path / 'audio.wav'
+    with wave.open(str(audio_path), 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(bytes(3200))
+    service = transcription_service.TranscriptionService()
+
+    def key():
+        _, error = service.transcribe_audio(str(audio_path))
+        assert error is None
+        return cache.keys[-1]
+    return key
+
+
+def test_transcription_key_includes_chunking_and_vad(monkeypatch, transcription_key):
+    baseline = transcription_key()
+
+    with monkeypatch.context() as m:
+        m.setitem(VAD_CONFIG, 'min_silence_seconds', VAD_CONFIG['min_silence_seconds'] + 1)
+        assert transcription_key() != baseline
+
+    with monkeypatch.context() as m:
+        m.setitem(TRANSCRIPTION_CONFIG, 'chunk_seconds', TRANSCRIPTION_CONFIG['chunk_seconds'] + 60)
+        assert transcription_key() != baseline
+
+    assert transcription_key() == baseline
+
+
+def test_transcription_key_ignores_concurrency(monkeypatch, transcription_key):
+    baseline = transcription_key()
+    monkeypatch.setitem(TRANSCRIPTION_CONFIG, 'max_workers', TRANSCRIPTION_CONFIG['max_workers'] + 1)
+    monkeypatch.setitem(TRANSCRIPTION_CONFIG, 'live_window_seconds', TRANSCRIPTION_CONFIG['live_window_seconds'] + 1)
+    assert transcription_key() == baseline
@@ -0,0 +1,34 @@
+# test_vad.py
+import numpy as np
+import pytest
+from transcript_model import Segment
+from vad import TimestampMap
+
+# 원본 0~2초, 5~7초, 10~11초를 남긴 압축 오디오 (압축 후 길이 5초)
+REGIONS = [(0.0, 2.0), (5.0, 7.0), (10.0, 11.0)]
+
+
+def test_compressed_duration():
+    assert TimestampMap(REGIONS).compressed_duration == pytest.approx(5.0)
+
+
+@pytest.mark.parametrize('compressed, original', [
+    (0.0, 0.0), (1.5, 1.5), (2.0, 5.0), (3.5, 6.5), (4.2, 10.2), (5.0, 11.0)
+])
+def test_to_original(compressed, original):
+    assert TimestampMap(REGIONS).to_original(compressed) == pytest.approx(original)
+
+
+def test_to_original_accepts_arrays():
+    np.testing.assert_allclose(TimestampMap(REGIONS).to_original([0.5, 2.5, 4.5]), [0.5, 5.5, 10.5])
+
+
+def test_empty_map_is_identity():
+    np.testing.assert_allclose(TimestampMap([]).to_original([0.0, 3.0]), [0.0, 3.0])
+
+
+def test_remap_segments_keeps_end_in_its_region():
+    # 첫 구간 끝(압축 2초)에서 끝나는 발언은 다음 구간 시작(원본 5초)이 아니라 2초에서 끝나야 함
+    segments = TimestampMap(REGIONS).remap_segments([Segment(0.5, 2.0, None, 'a'), Segment(2.5, 4.5, None, 'b')])
+    assert (segments[0].start, segments[0].end) == (pytest.approx(0.5), pytest.approx(2.0))
+    assert (segments[1].start, segments[1].end) == (pytest.approx(5.5), pytest.approx(10.5))
@@ -0,0 +1,31 @@
+# token_counter.py
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 근사치로 계산
+    tiktoken = None
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model):
+    """모델에 맞는 토크나이저 가져오기"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    """텍스트의 토큰 수 계산"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    # 근사치: 한글 등 비ASCII 문자는 글자당 약 1토큰, ASCII는 4글자당 약 1토큰
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
@@ -0,0 +1,285 @@
+# tracing.py
+"""회의 처리 단계별 소요 시간/전송량/토큰/비용 기록
+
+@traced('transcribe')처럼 (결과, 오류)를 반환하는 메서드에 붙이면 호출마다 한 줄씩 JSON Lines로 기록
+안쪽 코드에서 add(bytes_uploaded=...)로 현재 단계의 값을 더하고, 단계가 끝나면 바깥 단계에도 합산
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import TRACING_CONFIG
+
+# 단계별로 합산하는 값
+COUNTERS = ('bytes_uploaded', 'audio_seconds', 'billed_audio_seconds', 'tokens_in', 'tokens_out',
+            'embedding_tokens', 'cost_usd')
+
+
+class Span:
+    """진행 중인 단계 하나"""
+
+    __slots__ = ('trace_id', 'stage', 'parent', 'started', 'counters', 'error', '_lock')
+
+    def __init__(self, trace_id, stage, parent):
+        self.trace_id = trace_id
+        self.stage = stage
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.counters = {}
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add(self, **values):
+        # 구간별 병렬 인식처럼 여러 스레드에서 같은 단계에 더할 수 있음
+        with self._lock:
+            for name, value in values.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+
+def estimate_cost(counters):
+    """전송한 오디오 길이와 토큰 수로 API 비용 추정 (USD)"""
+    return (counters.get('billed_audio_seconds', 0) / 60 * TRACING_CONFIG['price_per_audio_minute']
+            + counters.get('tokens_in', 0) / 1000 * TRACING_CONFIG['price_per_1k_prompt_tokens']
+            + counters.get('tokens_out', 0) / 1000 * TRACING_CONFIG['price_per_1k_completion_tokens']
+            + counters.get('embedding_tokens', 0) / 1000 * TRACING_CONFIG['price_per_1k_embedding_tokens'])
+
+
+def percentile(values, fraction):
+    """정렬된 값 목록의 분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+class Tracer:
+    """단계 기록기 (최근 기록은 메모리에, 전체 기록은 JSON Lines 파일에 보관)"""
+
+    def __init__(self, log_path, recent_records):
+        self.log_path = log_path
+        self.recent = deque(maxlen=recent_records)
+        # 프로세스 시작 후 누적값 (Prometheus 카운터)
+        self.totals = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self):
+        """현재 스레드에서 진행 중인 단계 (없으면 None)"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def add(self, **values):
+        """현재 단계에 값 더하기 (진행 중인 단계가 없으면 무시)"""
+        span = self.current()
+        if span:
+            span.add(**values)
+
+    @contextmanager
+    def span(self, stage):
+        """단계 하나를 측정 (바깥 단계가 있으면 같은 trace_id 사용)"""
+        parent = self.current()
+        span = Span(parent.trace_id if parent else uuid.uuid4().hex[:12], stage, parent)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = str(e)
+            raise
+        finally:
+            stack.pop()
+            self._finish(span)
+
+    def propagate(self, func):
+        """작업 스레드에서 실행할 함수가 현재 단계에 값을 더하도록 감싸기"""
+        span = self.current()
+        if span is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            stack.append(span)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stack.pop()
+        return wrapper
+
+    def _finish(self, span):
+        seconds = time.perf_counter() - span.started
+        counters = dict(span.counters)
+        counters['cost_usd'] = estimate_cost(counters)
+        if span.parent:
+            # 비용은 바깥 단계에서 합산된 값으로 다시 추정
+            span.parent.add(**span.counters)
+
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'trace_id': span.trace_id,
+            'stage': span.stage,
+            'parent': span.parent.stage if span.parent else None,
+            'seconds': round(seconds, 4),
+            'status': 'error' if span.error else 'ok',
+            'error': span.error,
+            **{name: round(counters.get(name, 0), 6) for name in COUNTERS}
+        }
+
+        with self._lock:
+            self.recent.append(record)
+            totals = self.totals.setdefault(span.stage, dict.fromkeys(('count', 'errors', 'seconds') + COUNTERS, 0))
+            totals['count'] += 1
+            totals['errors'] += record['status'] == 'error'
+            totals['seconds'] += seconds
+            for name in COUNTERS:
+                totals[name] += record[name]
+            if self.log_path:
+                try:
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                except OSError:
+                    # 기록 실패로 처리 자체가 실패하지 않도록 무시
+                    pass
+
+    def summary(self):
+        """최근 기록 기준 단계별 호출 수, 오류 수, p50/p95 소요 시간과 합계"""
+        with self._lock:
+            records = list(self.recent)
+
+        by_stage = {}
+        for record in records:
+            by_stage.setdefault(record['stage'], []).append(record)
+
+        rows = []
+        for stage, items in by_stage.items():
+            seconds = sorted(item['seconds'] for item in items)
+            rows.append({
+                'stage': stage,
+                'count': len(items),
+                'errors': sum(item['status'] == 'error' for item in items),
+                'p50_seconds': round(percentile(seconds, 0.5), 3),
+                'p95_seconds': round(percentile(seconds, 0.95), 3),
+                'mean_seconds': round(sum(seconds) / len(seconds), 3),
+                **{name: round(sum(item[name] for item in items), 4) for name in COUNTERS}
+            })
+        return rows
+
+    def recent_traces(self, limit=5):
+        """최근 처리 건별 단계 기록 (최신순)"""
+        with self._lock:
+            records = list(self.recent)
+
+        traces = {}
+        finished = {}
+        for position, record in enumerate(records):
+            traces.setdefault(record['trace_id'], []).append(record)
+            # 바깥 단계가 가장 나중에 끝나므로 마지막 기록 위치가 처리 완료 순서
+            finished[record['trace_id']] = position
+        return [traces[trace_id] for trace_id in sorted(finished, key=finished.get, reverse=True)[:limit]]
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식 지표 (바깥 단계 값에는 안쪽 단계 값이 포함됨)"""
+        summary = {row['stage']: row for row in self.summary()}
+        with self._lock:
+            totals = {stage: dict(values) for stage, values in self.totals.items()}
+
+        lines = [
+            "# HELP meeting_stage_seconds 단계별 소요 시간 (분위수는 최근 기록 기준)",
+            "# TYPE meeting_stage_seconds summary"
+        ]
+        for stage, values in totals.items():
+            row = summary.get(stage)
+            if row:
+                lines.append(f'meeting_stage_seconds{{stage="{stage}",quantile="0.5"}} {row["p50_seconds"]}')
+                lines.append(f'meeting_stage_seconds{{stage="{stage}",quantile="0.95"}} {row["p95_seconds"]}')
+            lines.append(f'meeting_stage_seconds_sum{{stage="{stage}"}} {values["seconds"]:.4f}')
+            lines.append(f'meeting_stage_seconds_count{{stage="{stage}"}} {values["count"]}')
+
+        for name in ('errors',) + COUNTERS:
+            metric = f"meeting_stage_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for stage, values in totals.items():
+                lines.append(f'{metric}{{stage="{stage}"}} {values[name]:g}')
+        return '\n'.join(lines) + '\n'
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """프로세스 전체에서 공유하는 기록기"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(TRACING_CONFIG['log_path'], TRACING_CONFIG['recent_records'])
+        return _tracer
+
+
+def add(**values):
+    """현재 단계에 전송량/오디오 길이/토큰 수 등 더하기"""
+    if TRACING_CONFIG['enabled']:
+        get_tracer().add(**values)
+
+
+def traced(stage):
+    """(결과, 오류)를 반환하는 함수의 단계 기록 데코레이터 (오류가 반환되면 실패로 기록)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACING_CONFIG['enabled']:
+                return func(*args, **kwargs)
+            with get_tracer().span(stage) as span:
+                result = func(*args, **kwargs)
+                if isinstance(result, tuple) and len(result) == 2 and result[1]:
+                    span.error = str(result[1])
+                return result
+        return wrapper
+    return decorator
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics 에 Prometheus 텍스트 형식으로 응답"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = get_tracer().prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """백그라운드 스레드에서 지표 서버 시작 (이미 실행 중이면 그대로 반환)"""
+    global _metrics_server
+    with _tracer_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            thread = threading.Thread(target=_metrics_server.serve_forever)
+            thread.daemon = True
+            thread.start()
+        return _metrics_server
@@ -0,0 +1,155 @@
+# transcript_model.py
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+# 형식 이름 -> (표시 이름, 확장자, MIME 타입)
+FORMATS = {
+    'txt': ('텍스트', 'txt', 'text/plain'),
+    'srt': ('SRT 자막', 'srt', 'application/x-subrip'),
+    'vtt': ('WebVTT 자막', 'vtt', 'text/vtt'),
+    'json': ('JSON', 'json', 'application/json'),
+    'md': ('Markdown', 'md', 'text/markdown')
+}
+
+
+def format_hms(seconds):
+    """HH:MM:SS (초 단위 버림)"""
+    total = max(0, int(seconds))
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+def parse_hms(value):
+    """HH:MM:SS, MM:SS 또는 초 문자열을 초로 변환 (형식이 틀리면 None)"""
+    try:
+        parts = [float(part) for part in value.strip().split(':')]
+    except ValueError:
+        return None
+    if not 1 <= len(parts) <= 3 or any(part < 0 for part in parts):
+        return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+
+def format_clock(seconds, separator):
+    """자막용 HH:MM:SS,mmm (VTT는 separator='.')"""
+    millis = max(0, int(round(seconds * 1000)))
+    total, millis = divmod(millis, 1000)
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}{separator}{millis:03d}"
+
+
+class Segment:
+    """화자가 배정된 발언 하나 (시각은 초 단위)"""
+
+    __slots__ = ('start', 'end', 'speaker', 'text')
+
+    def __init__(self, start, end, speaker, text):
+        self.start = start
+        self.end = end
+        self.speaker = speaker
+        self.text = text
+
+    def to_dict(self):
+        return {'start': self.start, 'end': self.end, 'speaker': self.speaker, 'text': self.text}
+
+
+class Transcript:
+    """녹취록 모델 (각 형식은 세그먼트를 한 번 순회하여 생성)"""
+
+    __slots__ = ('segments', 'created_at')
+
+    def __init__(self, segments, created_at=None):
+        self.segments = segments
+        self.created_at = created_at or datetime.now()
+
+    def render(self, fmt):
+        """형식 이름(txt/srt/vtt/json/md)으로 문자열 생성"""
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        return getattr(self, f"to_{fmt}")()
+
+    def to_txt(self):
+        header = f"""📋 회의 녹취록
+생성일시: {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+
+=== 화자별 발언 내용 ===
+"""
+        return header + ''.join([
+            f"\n[{format_hms(s.start)}-{format_hms(s.end)}] {s.speaker}: {s.text}"
+            for s in self.segments
+        ])
+
+    def to_srt(self):
+        return ''.join([
+            f"{index}\n{format_clock(s.start, ',')} --> {format_clock(s.end, ',')}\n{s.speaker}: {s.text}\n\n"
+            for index, s in enumerate(self.segments, 1)
+        ])
+
+    def to_vtt(self):
+        return "WEBVTT\n\n" + ''.join([
+            f"{format_clock(s.start, '.')} --> {format_clock(s.end, '.')}\n<v {s.speaker}>{s.text}\n\n"
+            for s in self.segments
+        ])
+
+    def to_json(self):
+        return json.dumps({
+            'created_at': self.created_at.isoformat(timespec='seconds'),
+            'segments': [s.to_dict() for s in self.segments]
+        }, ensure_ascii=False)
+
+    def to_md(self):
+        header = f"# 📋 회의 녹취록\n\n생성일시: {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        return header + ''.join([
+            f"- `{format_hms(s.start)}` **{s.speaker}**: {s.text}\n"
+            for s in self.segments
+        ])
+
+    @classmethod
+    def from_json(cls, text):
+        """to_json() 결과에서 복원"""
+        data = json.loads(text)
+        return cls(
+            [Segment(item['start'], item['end'], item['speaker'], item['text']) for item in data['segments']],
+            datetime.fromisoformat(data['created_at'])
+        )
+
+
+class TranscriptIndex:
+    """화면 표시용 세그먼트 색인 (화자별 위치 목록과 시작 시각으로 필요한 구간만 찾음)"""
+
+    def __init__(self, transcript):
+        self.segments = transcript.segments
+        self.starts = [segment.start for segment in self.segments]
+        self.by_speaker = {}
+        for position, segment in enumerate(self.segments):
+            self.by_speaker.setdefault(segment.speaker, []).append(position)
+        self.all_positions = list(range(len(self.segments)))
+
+    @property
+    def speakers(self):
+        return sorted(self.by_speaker)
+
+    @property
+    def duration(self):
+        return self.segments[-1].end if self.segments else 0.0
+
+    def positions(self, speakers=None):
+        """선택한 화자들의 세그먼트 위치 (시간순)"""
+        if not speakers or set(speakers) >= set(self.by_speaker):
+            return self.all_positions
+        if len(speakers) == 1:
+            return self.by_speaker.get(speakers[0], [])
+        return sorted(position for speaker in speakers for position in self.by_speaker.get(speaker, []))
+
+    def locate(self, seconds, positions):
+        """positions 안에서 seconds 시각에 진행 중이거나 그 이후 첫 세그먼트의 순번"""
+        position = max(0, bisect_right(self.starts, seconds) - 1)
+        if position < len(self.segments) and self.segments[position].end <= seconds:
+            position += 1
+        return min(bisect_left(positions, position), max(0, len(positions) - 1))
+
+    def page(self, positions, page, page_size):
+        """positions의 page번째(0부터) 구간 세그먼트 목록"""
+        return [self.segments[position] for position in positions[page * page_size:(page + 1) * page_size]]
@@ -1,37 +1,160 @@
 # transcription_service.py
+import hashlib
+import os
+import threading
 import streamlit as st
-from datetime import datetime, timedelta
-from openai import OpenAI
-from config import OPENAI_CONFIG
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+from audio_chunker import plan_chunks, export_chunk, stitch_segments
+from audio_utils import wav_duration
+from config import OPENAI_CONFIG, SUMMARY_CONFIG, CACHE_CONFIG, TRANSCRIPTION_CONFIG, VAD_CONFIG, INDEX_CONFIG, SEMANTIC_CONFIG
+from result_cache import get_cache, hash_file, make_key
+from semantic_index import Embedder, build_answer_prompt, chunk_segments, get_semantic_index
+from diarization import create_diarizer, GapHeuristicDiarizer
+from meeting_index import get_meeting_index, default_title
+from openai_client import get_openai_client
+from stt_backends import create_stt_backend
+from summarizer import MapReduceSummarizer, content_lines
+from tracing import traced, get_tracer
+from transcript_model import Segment, Transcript
+from vad import compress_silence
 
 class TranscriptionService:
     def __init__(self):
-        self.client = None
-        if OPENAI_CONFIG['api_key']:
-            self.client = OpenAI(api_key=OPENAI_CONFIG['api_key'])
+        # 연결 풀과 요청 한도를 공유하는 프로세스 공용 클라이언트
+        self.client = get_openai_client()
+        # 음성 인식 엔진 (API 또는 로컬 모델)
+        self.stt_backend = create_stt_backend(self.client)
+        # 진행 상황 콜백과 요약 통계는 호출한 스레드별로 보관
+        self._local = threading.local()
     
-    def is_available(self):
-        """서비스 사용 가능 여부 확인"""
+    def can_transcribe(self):
+        """음성 인식 가능 여부 (로컬 엔진이면 API 키가 없어도 가능)"""
+        return self.stt_backend.is_available()
+    
+    def can_summarize(self):
+        """요약/임베딩/질문하기 가능 여부 (OpenAI API 필요)"""
         return self.client is not None
     
+    @property
+    def last_summary_stats(self):
+        """현재 스레드에서 마지막으로 생성한 요약의 단계별 통계"""
+        return getattr(self._local, 'summary_stats', [])
+    
+    def set_progress_callback(self, callback):
+        """현재 스레드의 진행 상황 출력 대상 설정 (None이면 화면 출력)"""
+        self._local.progress = callback
+    
+    def _log(self, message):
+        """진행 상황 출력 (작업 큐에서는 콜백, 화면 스크립트에서는 st.write)"""
+        callback = getattr(self._local, 'progress', None)
+        if callback:
+            callback(message)
+        elif get_script_run_ctx(suppress_warning=True) is not None:
+            st.write(message)
+    
+    def cache_stats(self):
+        """결과 캐시 적중 통계"""
+        return get_cache().stats()
+    
+    @traced('transcribe')
     def transcribe_audio(self, audio_path):
-        """OpenAI Whisper로 음성 인식"""
+        """OpenAI Whisper로 음성 인식 (긴 녹음은 구간별 병렬 처리)"""
         try:
-            st.write("🎤 음성 인식 중...")
+            get_tracer().add(audio_seconds=wav_duration(audio_path))
+            cache_key = None
+            if CACHE_CONFIG['enabled']:
+                # 구간 분할과 침묵 제거 설정도 결과를 바꾸므로 키에 포함 (실시간 인식/동시 처리 수는 제외)
+                cache_key = make_key('transcription', hash_file(audio_path), {
+                    **self.stt_backend.cache_params(),
+                    'chunking': {name: value for name, value in TRANSCRIPTION_CONFIG.items()
+                                 if not name.startswith('live_') and name != 'max_workers'},
+                    'vad': VAD_CONFIG
+                })
+                cached = get_cache().get(cache_key)
+                if cached is not None:
+                    self._log("✅ 음성 인식 완료! (캐시)")
+                    return self._transcript_from_dict(cached), None
             
-            with open(audio_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model=OPENAI_CONFIG['whisper_model'],
-                    file=audio_file,
-                    response_format="verbose_json",
-                    language="ko"
-                )
+            # 긴 침묵을 제거한 오디오로 인식 (시각은 원본 기준으로 되돌림)
+            work_path, timestamp_map = None, None
+            if VAD_CONFIG['enabled']:
+                work_path, timestamp_map = compress_silence(audio_path)
+                if work_path:
+                    self._log(f"🔇 침묵 구간 제거: {timestamp_map.compressed_duration:.0f}초 분량만 전송")
+            
+            try:
+                transcript = self._transcribe_path(work_path or audio_path)
+            finally:
+                if work_path:
+                    os.unlink(work_path)
+            
+            if timestamp_map:
+                timestamp_map.remap_segments(transcript.segments)
             
-            st.write("✅ 음성 인식 완료!")
+            if cache_key:
+                get_cache().set(cache_key, self._transcript_to_dict(transcript))
+            
+            self._log("✅ 음성 인식 완료!")
             return transcript, None
         except Exception as e:
             return None, f"음성 인식 실패: {str(e)}"
     
+    def _transcribe_path(self, audio_path):
+        """파일 하나를 인식 (업로드 제한을 넘으면 구간별 병렬 처리)"""
+        plan = plan_chunks(audio_path)
+        
+        if len(plan) == 1:
+            self._log("🎤 음성 인식 중...")
+            return self._transcribe_chunk(audio_path, plan[0])
+        
+        self._log(f"🎤 음성 인식 중... ({len(plan)}개 구간 병렬 처리)")
+        with ThreadPoolExecutor(max_workers=self.stt_backend.max_workers) as executor:
+            # 구간별 전송량이 현재 단계 기록에 합산되도록 작업 스레드에 전달
+            transcribe_chunk = get_tracer().propagate(
+                lambda window: self._transcribe_chunk(audio_path, window))
+            results = list(executor.map(transcribe_chunk, plan))
+        return stitch_segments(list(zip(plan, results)))
+    
+    def transcribe_file(self, audio_path):
+        """단일 파일 인식 (설정된 엔진 사용)"""
+        return self.stt_backend.transcribe(audio_path)
+    
+    def _transcribe_chunk(self, audio_path, window):
+        """계획된 구간 하나를 잘라서 인식"""
+        window_start, window_end, _, _ = window
+        chunk_path = export_chunk(audio_path, window_start, window_end)
+        try:
+            return self.transcribe_file(chunk_path)
+        finally:
+            os.unlink(chunk_path)
+    
+    def _transcript_to_dict(self, transcript):
+        """인식 결과를 캐시 저장용 dict로 변환"""
+        return {
+            'text': getattr(transcript, 'text', ''),
+            'duration': getattr(transcript, 'duration', None),
+            'segments': [
+                {
+                    'id': getattr(segment, 'id', i),
+                    'start': getattr(segment, 'start', 0),
+                    'end': getattr(segment, 'end', 0),
+                    'text': getattr(segment, 'text', '')
+                }
+                for i, segment in enumerate(getattr(transcript, 'segments', None) or [])
+            ]
+        }
+    
+    def _transcript_from_dict(self, data):
+        """캐시 dict를 verbose_json과 같은 속성 구조로 복원"""
+        return SimpleNamespace(
+            text=data['text'],
+            duration=data['duration'],
+            segments=[SimpleNamespace(**segment) for segment in data['segments']]
+        )
+    
     def format_timestamp(self, seconds):
         """타임스탬프 포맷팅"""
         try:
@@ -43,83 +166,163 @@ class TranscriptionService:
         except:
             return "00:00:00"
     
-    def process_segments(self, transcript_data):
-        """화자 분리 (간단 버전)"""
+    @traced('segment')
+    def process_segments(self, transcript_data, audio_path=None, track_paths=None):
+        """화자 분리 (오디오가 있으면 음성 특징 기반, 없으면 침묵 길이 기반)
+
+        track_paths: 다중 마이크 녹음의 트랙별 WAV (트랙별 에너지를 화자 구분에 함께 사용)
+        """
         try:
-            st.write("👥 화자 분리 중...")
+            self._log("👥 화자 분리 중...")
             
-            segments = transcript_data.segments
-            processed_segments = []
-            current_speaker = 1
-            last_end_time = 0
+            segments = [
+                SimpleNamespace(
+                    start=getattr(segment, 'start', 0),
+                    end=getattr(segment, 'end', 0),
+                    text=getattr(segment, 'text', '').strip()
+                )
+                for segment in transcript_data.segments
+            ]
             
-            for i, segment in enumerate(segments):
-                start_time = getattr(segment, 'start', 0)
-                end_time = getattr(segment, 'end', 0)
-                text = getattr(segment, 'text', '').strip()
-                
-                # 2초 이상 침묵시 화자 변경 가능성
-                if start_time - last_end_time > 2.0 and len(text.split()) > 5:
-                    current_speaker = (current_speaker % 3) + 1
-                
-                processed_segments.append({
-                    'start_time': self.format_timestamp(start_time),
-                    'end_time': self.format_timestamp(end_time),
-                    'speaker': f"참석자 {current_speaker}",
-                    'text': text
-                })
-                
-                last_end_time = end_time
+            diarizer = create_diarizer() if audio_path else GapHeuristicDiarizer()
+            speakers = diarizer.assign(segments, audio_path, track_paths)
+            
+            processed_segments = [
+                Segment(segment.start, segment.end, f"참석자 {speaker}", segment.text)
+                for segment, speaker in zip(segments, speakers)
+            ]
             
-            st.write("✅ 화자 분리 완료!")
+            self._log("✅ 화자 분리 완료!")
             return processed_segments, None
         except Exception as e:
             return None, f"화자 분리 실패: {str(e)}"
     
+    @traced('transcript')
     def create_transcript(self, segments):
-        """구조화된 녹취록 생성"""
+        """구조화된 녹취록 생성 (형식별 문자열은 Transcript.render()로 생성)"""
         try:
-            st.write("📝 녹취록 생성 중...")
-            
-            content = f"""📋 회의 녹취록
-생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-=== 화자별 발언 내용 ===
-"""
-            
-            for segment in segments:
-                content += f"\n[{segment['start_time']}-{segment['end_time']}] {segment['speaker']}: {segment['text']}"
-            
-            st.write("✅ 녹취록 생성 완료!")
-            return content, None
+            self._log("📝 녹취록 생성 중...")
+            transcript = Transcript(segments)
+            self._log("✅ 녹취록 생성 완료!")
+            return transcript, None
         except Exception as e:
             return None, f"녹취록 생성 실패: {str(e)}"
     
-    def create_summary(self, transcript):
-        """GPT로 회의 요약 생성"""
+    def index_transcript(self, transcript, title=None):
+        """녹취록을 지난 회의 검색 색인에 추가하고 회의 ID 반환 (색인을 쓰지 않으면 None)"""
         try:
-            st.write("📄 요약 생성 중...")
-            
-            # 텍스트 길이 제한 (2000자)
-            text_to_summarize = transcript[:2000]
-            
-            prompt = f"""다음 회의 녹취록을 요약해주세요:
-
-{text_to_summarize}
+            if not INDEX_CONFIG['enabled']:
+                return None, None
+            return get_meeting_index().add_transcript(transcript, title), None
+        except Exception as e:
+            return None, f"검색 색인 실패: {str(e)}"
+    
+    def index_summary(self, meeting_id, summary):
+        """색인된 회의에 요약 저장"""
+        try:
+            if meeting_id:
+                get_meeting_index().set_summary(meeting_id, summary)
+            return meeting_id, None
+        except Exception as e:
+            return None, f"검색 색인 실패: {str(e)}"
+    
+    @traced('embed')
+    def index_semantic(self, meeting_id, transcript, title=None):
+        """녹취록을 구간으로 나눠 임베딩하고 의미 검색 저장소에 추가 (새로 임베딩한 구간 수 반환)"""
+        try:
+            if not SEMANTIC_CONFIG['enabled'] or not meeting_id or not self.can_summarize():
+                return 0, None
+            chunks = chunk_segments(transcript.segments, SEMANTIC_CONFIG['chunk_tokens'],
+                                    SEMANTIC_CONFIG['overlap_segments'])
+            added = get_semantic_index().add_meeting(
+                meeting_id, title or default_title(transcript.created_at), transcript.created_at,
+                chunks, Embedder(self.client))
+            return added, None
+        except Exception as e:
+            return None, f"의미 검색 색인 실패: {str(e)}"
+    
+    @traced('ask')
+    def ask(self, question, date_from=None, date_to=None, on_partial=None):
+        """지난 회의에서 질문과 관련된 구간만 찾아 GPT로 답변
 
-요약 형식:
-1. 회의 개요
-2. 주요 논의사항
-3. 결론 및 다음 단계"""
+        반환값: ((답변, 근거 구간 목록), 오류)
+        """
+        try:
+            embedder = Embedder(self.client)
+            sources = get_semantic_index().search(
+                embedder.embed_query(question), SEMANTIC_CONFIG['top_k'], date_from, date_to)[0]
+            if not sources:
+                return ("관련된 회의 내용을 찾지 못했습니다.", []), None
             
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=OPENAI_CONFIG['gpt_model'],
-                messages=[{"role": "user", "content": prompt}],
+                messages=[{"role": "user", "content": build_answer_prompt(question, sources)}],
                 temperature=OPENAI_CONFIG['temperature'],
-                max_tokens=OPENAI_CONFIG['max_tokens']
+                max_tokens=SEMANTIC_CONFIG['answer_max_tokens'],
+                stream=True,
+                stream_options={"include_usage": True}
             )
+            parts = []
+            for chunk in stream:
+                usage = getattr(chunk, 'usage', None)
+                if usage:
+                    get_tracer().add(tokens_in=usage.prompt_tokens or 0, tokens_out=usage.completion_tokens or 0)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    if on_partial:
+                        on_partial(''.join(parts))
+            return (''.join(parts), sources), None
+        except Exception as e:
+            return None, f"질문 답변 실패: {str(e)}"
+    
+    @traced('summary')
+    def create_summary(self, transcript, on_partial=None):
+        """GPT로 회의 요약 생성 (긴 녹취록은 구간별 요약 후 병합)
+
+        on_partial(text)로 스트리밍 중인 요약을 전달받을 수 있음
+        """
+        try:
+            self._log("📄 요약 생성 중...")
+            
+            # 생성일시 헤더가 달라도 같은 발언 내용이면 같은 키
+            cache_key = None
+            if CACHE_CONFIG['enabled']:
+                content = '\n'.join(content_lines(transcript))
+                cache_key = make_key('summary', hashlib.sha256(content.encode('utf-8')).hexdigest(), {
+                    'model': OPENAI_CONFIG['gpt_model'],
+                    'temperature': OPENAI_CONFIG['temperature'],
+                    'max_tokens': OPENAI_CONFIG['max_tokens'],
+                    'summary': SUMMARY_CONFIG
+                })
+                cached = get_cache().get(cache_key)
+                if cached is not None:
+                    self._local.summary_stats = []
+                    self._log("✅ 요약 생성 완료! (캐시)")
+                    return cached['summary'], None
+            
+            summarizer = MapReduceSummarizer(self.client)
+            summary, stats = summarizer.summarize(transcript, on_partial)
+            self._local.summary_stats = stats
+            get_tracer().add(tokens_in=sum(stage['prompt_tokens'] for stage in stats),
+                             tokens_out=sum(stage['completion_tokens'] for stage in stats))
+            
+            if cache_key:
+                get_cache().set(cache_key, {'summary': summary})
+            
+            # 단계별 토큰 사용량 및 소요 시간
+            for stage in stats:
+                if 'tokens_before' in stage:
+                    saved = 1 - stage['tokens_after'] / stage['tokens_before'] if stage['tokens_before'] else 0
+                    self._log(f"　• {stage['stage']}: {stage['lines_before']} → {stage['lines_after']}줄, "
+                             f"토큰 {stage['tokens_before']} → {stage['tokens_after']} ({saved:.0%} 절감), "
+                             f"{stage['seconds']}초")
+                    continue
+                ttft = f", 첫 토큰 {stage['ttft_seconds']}초" if stage.get('ttft_seconds') is not None else ""
+                self._log(f"　• {stage['stage']}: {stage['calls']}회 호출, "
+                         f"입력 {stage['prompt_tokens']} / 출력 {stage['completion_tokens']} 토큰, "
+                         f"{stage['seconds']}초{ttft}")
             
-            st.write("✅ 요약 생성 완료!")
-            return response.choices[0].message.content, None
+            self._log("✅ 요약 생성 완료!")
+            return summary, None
         except Exception as e:
             return None, f"요약 생성 실패: {str(e)}"
\ No newline at end of file
@@ -1,8 +1,59 @@
 # ui_components.py
+import math
+import os
+import re
 import streamlit as st
 import time
 from datetime import datetime
+from artifact_store import get_artifact_store
+from audio_recorder import list_orphaned_recordings
+from audio_encoder import mime_type
+from config import APP_CONFIG, INDEX_CONFIG, SEMANTIC_CONFIG, TRACING_CONFIG
+from meeting_index import get_meeting_index, MATCH_START, MATCH_END
 from session_manager import SessionManager
+from tracing import get_tracer
+from transcript_model import FORMATS, Transcript, TranscriptIndex, format_hms, parse_hms
+
+MARKDOWN_SPECIAL = re.compile(r'([\\`*_{}\[\]<>()#+\-.!|~$])')
+
+
+def escape_markdown(text):
+    """발언 내용이 Markdown 서식으로 해석되지 않도록 특수 문자 이스케이프"""
+    return MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_transcript_index(handle):
+    """녹취록 데이터 색인 (결과 파일은 바뀌지 않으므로 핸들 기준으로 세션 간 공유)"""
+    data = get_artifact_store().read_text(handle)
+    return TranscriptIndex(Transcript.from_json(data)) if data else None
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_transcript_page(handle, speakers, page, page_size):
+    """화면에 보이는 구간만 Markdown으로 생성"""
+    index = load_transcript_index(handle)
+    if index is None:
+        return ""
+    return "  \n".join(
+        f"`{format_hms(segment.start)}` **{segment.speaker}**: {escape_markdown(segment.text)}"
+        for segment in index.page(index.positions(speakers), page, page_size)
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_transcript_download(handle, fmt):
+    """녹취록 데이터를 다운로드 형식으로 변환 (핸들과 형식 기준으로 캐시하여 재실행마다 다시 만들지 않음)"""
+    data = get_artifact_store().read_text(handle)
+    return Transcript.from_json(data).render(fmt) if data else None
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_meeting_download(meeting_id, fmt):
+    """지난 회의 녹취록을 다운로드 형식으로 변환 (저장된 회의는 바뀌지 않으므로 회의 ID 기준으로 캐시)"""
+    meeting = get_meeting_index().get_meeting(meeting_id)
+    return meeting['transcript'].render(fmt) if meeting else None
+
 
 class UIComponents:
     """UI 컴포넌트들을 관리하는 클래스"""
@@ -12,12 +63,20 @@ class UIComponents:
         """현재 상태 표시"""
         st.header("📊 현재 상태")
         
-        # API 상태 확인
-        if transcription_service.is_available():
+        # API 상태 확인 (로컬 음성 인식은 API 키 없이도 동작)
+        if transcription_service.can_summarize():
             st.success("✅ OpenAI API 연결됨")
+        elif transcription_service.can_transcribe():
+            st.warning("⚠️ OpenAI API 키 없음 - 로컬 음성 인식만 사용합니다 (요약/질문하기 생략)")
         else:
             st.error("❌ OpenAI API 연결 실패 - .env 파일의 OPENAI_API_KEY를 확인하세요")
         
+        # 결과 캐시 적중 현황
+        cache_stats = transcription_service.cache_stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            st.caption(f"💾 결과 캐시: 적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회 "
+                       f"(적중률 {cache_stats['hit_rate']:.0%})")
+        
         # 녹음 상태에 따른 표시
         if SessionManager.is_recording():
             if SessionManager.is_stop_requested():
@@ -36,8 +95,19 @@ class UIComponents:
                     with col2:
                         recorder = SessionManager.get('recorder')
                         if recorder:
-                            frame_count = len(recorder.frames)
+                            frame_count = recorder.frame_count
                             st.metric("녹음된 데이터", f"{frame_count} 프레임")
+                    
+                    # 캡처 상태 (지연, 버퍼 사용률, 유실)
+                    if recorder:
+                        UIComponents.show_capture_metrics(recorder.metrics())
+                
+                # 실시간 녹취록 미리보기
+                live_segments = SessionManager.get_live_segments()
+                if live_segments:
+                    with st.expander(f"📝 실시간 녹취록 ({len(live_segments)}개 문장)", expanded=True):
+                        for segment in live_segments[-10:]:
+                            st.write(f"[{transcription_service.format_timestamp(segment.start)}] {segment.text.strip()}")
         else:
             st.info("⚪ 대기 중")
         
@@ -49,6 +119,111 @@ class UIComponents:
             else:
                 st.error(result_message)
     
+    @staticmethod
+    def show_capture_metrics(metrics):
+        """녹음 캡처 지표 표시"""
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("입력 지연", f"{metrics['latency_ms']:.0f} ms",
+                      help=f"최대 {metrics['max_latency_ms']:.0f} ms")
+        with col2:
+            st.metric("버퍼 사용률", f"{metrics['buffer_fill']:.0%}",
+                      help=f"최대 {metrics['max_buffer_fill']:.0%}")
+        with col3:
+            st.metric("유실", f"{metrics['dropped_seconds']:.2f}초",
+                      help=f"입력 오버플로 {metrics['overflow_count']}회")
+        
+        if metrics['dropped_frames'] or metrics['overflow_count']:
+            st.warning(f"⚠️ 녹음 데이터 일부가 유실되었습니다 "
+                       f"({metrics['dropped_seconds']:.2f}초, 입력 오버플로 {metrics['overflow_count']}회). "
+                       "시스템 부하를 줄이거나 버퍼 크기를 늘려주세요.")
+    
+    @staticmethod
+    def show_trace_panel():
+        """단계별 소요 시간/전송량/토큰/비용 (디버그용)"""
+        if not TRACING_CONFIG['enabled']:
+            return
+        
+        tracer = get_tracer()
+        rows = tracer.summary()
+        if not rows:
+            return
+        
+        with st.expander("🛠️ 단계별 성능 기록 (디버그)"):
+            st.caption(f"최근 {sum(row['count'] for row in rows)}개 기록 기준 · 전체 기록: {tracer.log_path}")
+            st.dataframe([
+                {
+                    '단계': row['stage'],
+                    '호출': row['count'],
+                    '오류': row['errors'],
+                    'p50 (초)': row['p50_seconds'],
+                    'p95 (초)': row['p95_seconds'],
+                    '평균 (초)': row['mean_seconds'],
+                    '전송 (MB)': round(row['bytes_uploaded'] / (1024 * 1024), 2),
+                    '오디오 (초)': round(row['audio_seconds'], 1),
+                    '입력 토큰': int(row['tokens_in']),
+                    '출력 토큰': int(row['tokens_out']),
+                    '비용 (USD)': round(row['cost_usd'], 4)
+                }
+                for row in rows
+            ], use_container_width=True, hide_index=True)
+            
+            # 가장 최근 처리 건의 단계별 소요 시간
+            traces = tracer.recent_traces(limit=1)
+            if traces:
+                records = traces[0]
+                total = next((record['seconds'] for record in records if record['parent'] is None), None)
+                st.write("**최근 처리 건**")
+                for record in records:
+                    if record['parent'] is None:
+                        continue
+                    share = f" ({record['seconds'] / total:.0%})" if total else ""
+                    status = " ❌" if record['status'] == 'error' else ""
+                    st.write(f"　• {record['stage']}: {record['seconds']:.2f}초{share}{status}")
+                if total is not None:
+                    st.write(f"　• 전체: {total:.2f}초")
+    
+    @staticmethod
+    def show_job_status(job):
+        """백그라운드 처리 진행 상황"""
+        if not job:
+            return
+        
+        st.warning(f"⏳ 음성 처리 중... {job['message'] or '대기 중'}")
+        
+        # 요약이 스트리밍으로 생성되는 중이면 지금까지의 내용을 표시
+        if job.get('partial'):
+            st.info(job['partial'] + " ▌")
+        
+        if st.button("🔄 처리 상태 확인", use_container_width=True):
+            st.rerun()
+    
+    @staticmethod
+    def show_orphaned_recordings():
+        """중단된 녹음 목록 (다른 사용자의 녹음일 수 있으므로 직접 선택한 경우에만 복구)
+
+        반환값: 복구를 선택한 녹음 ID (없으면 None)
+        """
+        if SessionManager.is_recording() or SessionManager.get('job_id'):
+            return None
+        recordings = list_orphaned_recordings()
+        if not recordings:
+            return None
+        
+        selected = None
+        with st.expander(f"♻️ 중단된 녹음 {len(recordings)}개 (프로세스가 녹음 중에 종료됨)"):
+            for recording in recordings:
+                started = time.strftime('%Y-%m-%d %H:%M', time.localtime(recording['started_at']))
+                tracks = f", {recording['tracks']}개 트랙" if recording['tracks'] else ""
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(f"{started} 시작 · 약 {recording['seconds']:.0f}초{tracks}")
+                with col2:
+                    if st.button("복구하여 처리", key=f"recover_{recording['recording_id']}",
+                                 use_container_width=True):
+                        selected = recording['recording_id']
+        return selected
+    
     @staticmethod
     def show_control_buttons():
         """녹음 제어 버튼들"""
@@ -90,68 +265,289 @@ class UIComponents:
             tab1, tab2 = st.tabs(["📝 녹취록", "📄 요약"])
             
             with tab1:
-                transcript_content = SessionManager.get('transcript_content')
-                if transcript_content:
-                    st.text_area(
-                        "녹취록 내용", 
-                        transcript_content, 
-                        height=400,
-                        key="transcript_area"
-                    )
+                transcript_path = SessionManager.get_artifact_path('transcript_artifact')
+                if transcript_path:
+                    data_handle = SessionManager.get('transcript_data_artifact')
+                    index = load_transcript_index(data_handle) if data_handle else None
+                    if index:
+                        UIComponents.show_transcript_viewer(data_handle, index)
+                    else:
+                        st.text_area(
+                            "녹취록 내용", 
+                            SessionManager.get_artifact_text('transcript_artifact'), 
+                            height=400,
+                            key="transcript_area"
+                        )
                     
-                    # 다운로드 버튼
-                    st.download_button(
-                        "📥 녹취록 다운로드 (.txt)",
-                        transcript_content,
-                        file_name=f"transcript_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
+                    # 다운로드 버튼 (형식별)
+                    UIComponents.show_transcript_downloads(transcript_path)
+                elif SessionManager.get('transcript_artifact'):
+                    st.info("녹취록 보관 기간이 지나 파일이 삭제되었습니다.")
                 else:
                     st.info("녹취록이 아직 생성되지 않았습니다.")
             
             with tab2:
-                summary_content = SessionManager.get('summary_content')
-                if summary_content:
+                summary_path = SessionManager.get_artifact_path('summary_artifact')
+                if summary_path:
                     st.text_area(
                         "요약 내용", 
-                        summary_content, 
+                        SessionManager.get_artifact_text('summary_artifact'), 
                         height=400,
                         key="summary_area"
                     )
                     
-                    # 다운로드 버튼
+                    # 다운로드 버튼 (저장된 파일에서 바로 전송)
+                    with open(summary_path, 'rb') as summary_file:
+                        st.download_button(
+                            "📥 요약 다운로드 (.txt)",
+                            summary_file,
+                            file_name=f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                            mime="text/plain",
+                            use_container_width=True
+                        )
+                elif SessionManager.get('summary_artifact'):
+                    st.info("요약 보관 기간이 지나 파일이 삭제되었습니다.")
+                else:
+                    st.info("요약이 아직 생성되지 않았습니다.")
+    
+    @staticmethod
+    def show_transcript_viewer(handle, index):
+        """녹취록 페이지 보기 (화자 필터, 시각 이동)
+
+        재실행마다 현재 페이지 구간만 그리도록 위젯 키에 핸들을 넣어 결과별로 상태를 분리
+        """
+        page_size = APP_CONFIG['transcript_page_size']
+        page_key = f"transcript_page_{handle}"
+        speakers_key = f"transcript_speakers_{handle}"
+        jump_key = f"transcript_jump_{handle}"
+        
+        def reset_page():
+            st.session_state[page_key] = 1
+        
+        def jump_to_time():
+            seconds = parse_hms(st.session_state[jump_key] or '')
+            if seconds is not None:
+                positions = index.positions(st.session_state.get(speakers_key))
+                st.session_state[page_key] = index.locate(seconds, positions) // page_size + 1
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            speakers = st.multiselect("화자 (선택하지 않으면 전체)", index.speakers, key=speakers_key,
+                                      on_change=reset_page)
+        with col2:
+            jump = st.text_input("시각 이동", key=jump_key, on_change=jump_to_time,
+                                 placeholder=format_hms(index.duration))
+        if jump and parse_hms(jump) is None:
+            st.caption("⚠️ 시각은 HH:MM:SS, MM:SS 또는 초 단위로 입력하세요.")
+        
+        positions = index.positions(speakers)
+        page_count = max(1, math.ceil(len(positions) / page_size))
+        if st.session_state.get(page_key, 1) > page_count:
+            reset_page()
+        page = st.number_input(f"페이지 (전체 {page_count})", min_value=1, max_value=page_count,
+                               step=1, key=page_key)
+        
+        first = (page - 1) * page_size
+        last = min(first + page_size, len(positions))
+        st.caption(f"발언 {len(positions)}개 중 {first + 1 if positions else 0}-{last}번째 "
+                   f"(전체 {len(index.segments)}개)")
+        st.markdown(render_transcript_page(handle, tuple(speakers), page - 1, page_size))
+    
+    @staticmethod
+    def show_transcript_downloads(transcript_path):
+        """녹취록 형식별 다운로드 버튼 (TXT는 저장된 파일, 나머지는 구조화된 데이터로 생성)"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        handle = SessionManager.get('transcript_data_artifact')
+        
+        columns = st.columns(len(FORMATS))
+        for column, (fmt, (label, extension, mime)) in zip(columns, FORMATS.items()):
+            with column:
+                if fmt == 'txt':
+                    with open(transcript_path, 'rb') as transcript_file:
+                        content = transcript_file.read()
+                else:
+                    content = render_transcript_download(handle, fmt) if handle else None
+                    if content is None:
+                        continue
+                st.download_button(
+                    f"📥 {label}",
+                    content,
+                    file_name=f"transcript_{stamp}.{extension}",
+                    mime=mime,
+                    key=f"transcript_download_{fmt}",
+                    use_container_width=True
+                )
+    
+    @staticmethod
+    def show_meeting_search(transcription_service):
+        """지난 회의 검색 (세션을 초기화해도 유지되는 색인에서 조회)"""
+        if not INDEX_CONFIG['enabled']:
+            return
+        
+        st.header("🔎 지난 회의 검색")
+        try:
+            index = get_meeting_index()
+            meeting_count = index.count()
+        except Exception as e:
+            st.warning(f"⚠️ 검색 색인을 열 수 없습니다: {str(e)}")
+            return
+        
+        if not meeting_count:
+            st.info("아직 색인된 회의가 없습니다. 녹음을 처리하면 자동으로 추가됩니다.")
+            return
+        
+        if not SEMANTIC_CONFIG['enabled'] or not transcription_service.can_summarize():
+            UIComponents.show_keyword_search(index, meeting_count)
+            return
+        
+        tab1, tab2 = st.tabs(["🔎 키워드 검색", "💬 질문하기"])
+        with tab1:
+            UIComponents.show_keyword_search(index, meeting_count)
+        with tab2:
+            UIComponents.show_meeting_qa(transcription_service)
+    
+    @staticmethod
+    def show_keyword_search(index, meeting_count):
+        """검색어/화자/기간으로 발언 검색 후 회의 녹취록 열기"""
+        col1, col2, col3 = st.columns([3, 1, 2])
+        with col1:
+            query = st.text_input("검색어", key="search_query", placeholder="예: 예산 일정")
+        with col2:
+            speaker = st.text_input("화자", key="search_speaker", placeholder="참석자 1")
+        with col3:
+            dates = st.date_input("기간", value=(), key="search_dates")
+        
+        if query.strip():
+            date_from = dates[0] if len(dates) > 0 else None
+            date_to = dates[1] if len(dates) > 1 else date_from
+            started = time.perf_counter()
+            results = index.search(query, speaker.strip() or None, date_from, date_to,
+                                   INDEX_CONFIG['max_results'])
+            st.caption(f"회의 {meeting_count}개에서 {len(results)}건 찾음 "
+                       f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+            
+            for result in results:
+                snippet = escape_markdown(result['snippet']).replace(MATCH_START, '**').replace(MATCH_END, '**')
+                st.markdown(f"**{escape_markdown(result['title'])}** · "
+                            f"{result['created_at'].strftime('%Y-%m-%d %H:%M')} · "
+                            f"`{format_hms(result['start'])}` {result['speaker']}  \n{snippet}")
+            
+            # 검색된 회의를 일치 순서대로 열 수 있게 함
+            meetings = {result['meeting_id']: result for result in results}
+        else:
+            meetings = {meeting['id']: meeting for meeting in index.list_meetings()}
+        
+        if not meetings:
+            return
+        
+        meeting_id = st.selectbox(
+            "회의 열기",
+            [None, *meetings],
+            format_func=lambda key: "선택하세요" if key is None else
+                f"{meetings[key]['title']} ({meetings[key]['created_at'].strftime('%Y-%m-%d %H:%M')})",
+            key="search_meeting"
+        )
+        meeting = index.get_meeting(meeting_id) if meeting_id else None
+        if meeting:
+            st.caption(f"발언 {meeting['segment_count']}개 · {format_hms(meeting['duration'])}")
+            if meeting['summary']:
+                st.text_area("요약", meeting['summary'], height=200, key=f"search_summary_{meeting_id}")
+            
+            columns = st.columns(len(FORMATS))
+            for column, (fmt, (label, extension, mime)) in zip(columns, FORMATS.items()):
+                with column:
                     st.download_button(
-                        "📥 요약 다운로드 (.txt)",
-                        summary_content,
-                        file_name=f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                        mime="text/plain",
+                        f"📥 {label}",
+                        render_meeting_download(meeting_id, fmt),
+                        file_name=f"transcript_{meeting['created_at'].strftime('%Y%m%d_%H%M%S')}.{extension}",
+                        mime=mime,
+                        key=f"search_download_{fmt}",
                         use_container_width=True
                     )
-                else:
-                    st.info("요약이 아직 생성되지 않았습니다.")
+    
+    @staticmethod
+    def show_meeting_qa(transcription_service):
+        """지난 회의 내용에 대한 질문 (관련 구간만 찾아 답변 생성)"""
+        col1, col2 = st.columns([4, 2])
+        with col1:
+            question = st.text_input("질문", key="qa_question",
+                                     placeholder="예: 지난달 예산에 대해 무엇을 결정했나요?")
+        with col2:
+            dates = st.date_input("기간", value=(), key="qa_dates")
+        
+        if st.button("💬 질문하기", disabled=not question.strip(), use_container_width=True):
+            date_from = dates[0] if len(dates) > 0 else None
+            date_to = dates[1] if len(dates) > 1 else date_from
+            placeholder = st.empty()
+            with st.spinner("관련 회의 내용을 찾는 중..."):
+                result, error = transcription_service.ask(
+                    question.strip(), date_from, date_to,
+                    on_partial=lambda text: placeholder.info(text + " ▌"))
+            placeholder.empty()
+            st.session_state['qa_result'] = (question.strip(), result, error)
+        
+        if 'qa_result' not in st.session_state:
+            return
+        
+        asked, result, error = st.session_state['qa_result']
+        if error:
+            st.error(f"❌ {error}")
+            return
+        
+        answer, sources = result
+        st.markdown(f"**Q. {escape_markdown(asked)}**")
+        st.info(answer)
+        if sources:
+            with st.expander(f"📚 근거 구간 ({len(sources)}개)"):
+                for source in sources:
+                    st.markdown(f"**{escape_markdown(source['title'])}** · "
+                                f"{source['created_at'].strftime('%Y-%m-%d')} · "
+                                f"`{format_hms(source['start'])}-{format_hms(source['end'])}` "
+                                f"(유사도 {source['score']:.2f})")
+                    st.text(source['text'])
     
     @staticmethod
     def show_audio_download():
-        """WAV 파일 다운로드"""
-        audio_file_data = SessionManager.get('audio_file_data')
-        if audio_file_data:
+        """녹음 파일 다운로드"""
+        audio_file_path = SessionManager.get_artifact_path('audio_artifact')
+        if audio_file_path:
             st.header("📥 녹음 파일 다운로드")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.download_button(
-                    "📥 WAV 파일 다운로드",
-                    audio_file_data,
-                    file_name=f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav",
-                    mime="audio/wav",
-                    use_container_width=True
-                )
+                extension = os.path.splitext(audio_file_path)[1]
+                # 파일 객체를 넘겨 세션 상태에 오디오 데이터를 두지 않음
+                with open(audio_file_path, 'rb') as audio_file:
+                    st.download_button(
+                        f"📥 {extension.lstrip('.').upper()} 파일 다운로드",
+                        audio_file,
+                        file_name=f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}",
+                        mime=mime_type(audio_file_path),
+                        use_container_width=True
+                    )
             
             with col2:
-                file_size = len(audio_file_data)
+                file_size = os.path.getsize(audio_file_path)
                 st.metric("파일 크기", f"{file_size/1024:.1f} KB")
+            
+            # 다중 장치 녹음의 트랙별 원본
+            track_handles = SessionManager.get('track_artifacts') or []
+            if track_handles:
+                with st.expander(f"🎚️ 트랙별 원본 ({len(track_handles)}개)"):
+                    for index, handle in enumerate(track_handles, 1):
+                        track_path = get_artifact_store().path(handle)
+                        if not track_path:
+                            continue
+                        with open(track_path, 'rb') as track_file:
+                            st.download_button(
+                                f"📥 트랙 {index} WAV 다운로드 ({os.path.getsize(track_path)/1024:.1f} KB)",
+                                track_file,
+                                file_name=f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}_track{index}.wav",
+                                mime="audio/wav",
+                                key=f"track_download_{index}",
+                                use_container_width=True
+                            )
     
     @staticmethod
     def show_instructions():
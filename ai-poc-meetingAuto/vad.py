@@ -0,0 +1,136 @@
+# vad.py
+import os
+import tempfile
+import wave
+import numpy as np
+from audio_utils import open_pcm, to_mono, ANALYSIS_BLOCK_SECONDS
+from config import VAD_CONFIG
+
+
+class TimestampMap:
+    """침묵을 줄인 오디오의 시각을 원본 녹음 시각으로 변환하는 클래스"""
+
+    def __init__(self, regions):
+        # regions: 남겨둔 원본 구간 [(start, end), ...] (초)
+        self.original_starts = np.array([start for start, _ in regions], dtype=np.float64)
+        lengths = np.array([end - start for start, end in regions], dtype=np.float64)
+        self.compressed_starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1])) if len(regions) else np.zeros(0)
+        self.compressed_duration = float(lengths.sum()) if len(regions) else 0.0
+
+    def to_original(self, times):
+        """압축된 오디오 기준 시각(들)을 원본 기준으로 변환"""
+        times = np.asarray(times, dtype=np.float64)
+        if len(self.compressed_starts) == 0:
+            return times
+        index = np.searchsorted(self.compressed_starts, times, side='right') - 1
+        index = np.clip(index, 0, len(self.compressed_starts) - 1)
+        return self.original_starts[index] + (times - self.compressed_starts[index])
+
+    def remap_segments(self, segments):
+        """세그먼트의 start/end를 원본 시각으로 변경"""
+        if not segments:
+            return segments
+        starts = self.to_original([segment.start for segment in segments])
+        # 끝 시각은 구간 경계에서 다음 구간으로 넘어가지 않도록 살짝 앞에서 변환
+        ends = self.to_original([max(segment.start, segment.end - 1e-3) for segment in segments]) + 1e-3
+        for segment, start, end in zip(segments, starts, ends):
+            segment.start = float(start)
+            segment.end = float(end)
+        return segments
+
+
+def frame_features(samples, rate):
+    """프레임별 RMS 에너지와 영교차율(zero-crossing rate) 계산"""
+    frame = max(1, int(rate * VAD_CONFIG['frame_seconds']))
+    frame_count = len(samples) // frame
+    rms = np.empty(frame_count, dtype=np.float32)
+    zcr = np.empty(frame_count, dtype=np.float32)
+
+    block = frame * max(1, int(ANALYSIS_BLOCK_SECONDS / VAD_CONFIG['frame_seconds']))
+    for start in range(0, frame_count * frame, block):
+        end = min(start + block, frame_count * frame)
+        frames = to_mono(samples[start:end]).reshape(-1, frame)
+        index = slice(start // frame, end // frame)
+        rms[index] = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr[index] = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame
+
+    return rms, zcr
+
+
+def detect_speech(samples, rate):
+    """음성이 있는 구간 목록 반환 [(start, end), ...] (초)"""
+    rms, zcr = frame_features(samples, rate)
+    if len(rms) == 0:
+        return []
+
+    frame_seconds = VAD_CONFIG['frame_seconds']
+
+    # 배경 소음 수준을 기준으로 임계값 설정
+    # 쉬지 않고 말하거나 조용히 말하는 구간은 하위 에너지도 음성이므로,
+    # 구간 안의 큰 소리 대비 일정 비율을 넘지 않도록 상한을 둠
+    noise_floor = float(np.percentile(rms, 10))
+    ceiling = float(np.percentile(rms, 95)) * VAD_CONFIG['max_threshold_ratio']
+    threshold = max(min(noise_floor * VAD_CONFIG['energy_ratio'], ceiling), VAD_CONFIG['min_rms'])
+    speech = rms > threshold
+    # 에너지가 약해도 영교차율이 높으면 무성 자음(ㅅ, ㅎ 등)으로 판단
+    speech |= (rms > threshold * 0.5) & (zcr > VAD_CONFIG['zcr_threshold'])
+
+    # 말 앞뒤 여유 구간 확보
+    padding = int(VAD_CONFIG['padding_seconds'] / frame_seconds)
+    if padding:
+        speech = np.convolve(speech, np.ones(2 * padding + 1, dtype=np.int32), mode='same') > 0
+
+    # 연속 구간 경계 찾기
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) == 0:
+        return []
+
+    # 짧은 침묵은 자르지 않고 앞뒤 구간을 합침
+    min_gap = int(VAD_CONFIG['min_silence_seconds'] / frame_seconds)
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_gap))
+    merged_starts = starts[keep]
+    merged_ends = np.concatenate((ends[np.flatnonzero(keep)[1:] - 1], ends[-1:]))
+
+    duration = len(samples) / rate
+    return [(float(start * frame_seconds), float(min(end * frame_seconds, duration)))
+            for start, end in zip(merged_starts, merged_ends)]
+
+
+def compress(samples, rate):
+    """침묵 구간을 제거한 샘플과 시각 변환표 반환"""
+    regions = detect_speech(samples, rate)
+    if not regions:
+        return samples[:0], TimestampMap([])
+    pieces = [samples[int(start * rate):int(end * rate)] for start, end in regions]
+    return np.concatenate(pieces), TimestampMap(regions)
+
+
+def compress_silence(audio_path):
+    """WAV 파일의 긴 침묵을 제거한 임시 파일 생성
+
+    반환값: (압축 파일 경로, TimestampMap) / 줄일 침묵이 거의 없으면 (None, None)
+    """
+    samples, rate = open_pcm(audio_path)
+    duration = len(samples) / rate if rate else 0
+    regions = detect_speech(samples, rate)
+    timestamp_map = TimestampMap(regions)
+
+    if not regions or duration - timestamp_map.compressed_duration < VAD_CONFIG['min_saving_seconds']:
+        return None, None
+
+    fd, compressed_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    with wave.open(compressed_path, 'wb') as wf:
+        wf.setnchannels(samples.shape[1])
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        # 블록 단위로 기록하여 메모리 사용량 제한
+        block = int(ANALYSIS_BLOCK_SECONDS * rate)
+        for start, end in regions:
+            for offset in range(int(start * rate), int(end * rate), block):
+                piece = samples[offset:min(offset + block, int(end * rate))]
+                wf.writeframes(np.ascontiguousarray(piece).tobytes())
+
+    return compressed_path, timestamp_map
@@ -0,0 +1,110 @@
+"""멀티턴 대화 기록 관리
+
+최근 대화만 토큰 예산 안에서 그대로 보내고, 밀려난 대화는 요약문 하나로 누적하여
+대화가 길어져도 요청 한 번의 프롬프트 크기가 일정 범위를 넘지 않도록 함
+
+    memory = ConversationMemory(client, "너는 ...", model="gpt-4o")
+    memory.add_user("안녕")
+    response = client.chat.completions.create(model="gpt-4o", messages=memory.messages())
+    memory.add_assistant(response.choices[0].message.content)
+"""
+import os
+import sys
+
+# 회의 앱과 같은 토큰 계산 사용 (토크나이저 캐시, tiktoken이 없을 때의 근사치)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai-poc-meetingAuto'))
+from token_counter import count_tokens
+
+# 메시지 하나당 역할/구분자에 붙는 토큰 수 (OpenAI 채팅 형식 기준)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """다음은 사용자와 AI의 이전 대화입니다.
+이후 대화에 필요한 사실, 사용자의 요청과 선호, 합의된 내용을 빠짐없이 간결한 한국어로 요약해주세요.
+
+[기존 요약]
+{summary}
+
+[추가 대화]
+{dialogue}"""
+
+
+class ConversationMemory:
+    """토큰 수 기준 슬라이딩 윈도우 + 누적 요약으로 대화 기록을 관리하는 클래스
+
+    - 시스템 프롬프트는 항상 첫 메시지로 그대로 유지 (요청마다 같은 접두어)
+    - 최근 대화는 max_history_tokens 안에서 원문 그대로 유지
+    - 예산을 넘으면 가장 오래된 질문/답변 쌍부터 빼서 요약문에 합침
+    """
+
+    def __init__(self, client, system_prompt, model="gpt-4o",
+                 max_history_tokens=2000, summary_max_tokens=300):
+        self.client = client
+        self.system_prompt = system_prompt
+        self.model = model
+        self.max_history_tokens = max_history_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summary = ""
+        self.turns = []
+        self._token_counts = []
+
+    def add_user(self, content):
+        """사용자 메시지 추가"""
+        self._append("user", content)
+
+    def add_assistant(self, content):
+        """AI 응답 추가 후 예산을 넘은 대화 정리"""
+        self._append("assistant", content)
+        self._trim()
+
+    def _append(self, role, content):
+        self.turns.append({"role": role, "content": content})
+        self._token_counts.append(count_tokens(content, self.model) + MESSAGE_OVERHEAD_TOKENS)
+
+    def history_tokens(self):
+        """윈도우에 남아 있는 대화의 토큰 수"""
+        return sum(self._token_counts)
+
+    def messages(self):
+        """API에 보낼 메시지 목록 (시스템 프롬프트 + 요약 + 최근 대화)"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"이전 대화 요약:\n{self.summary}"})
+        return messages + self.turns
+
+    def _trim(self):
+        """오래된 질문/답변 쌍을 윈도우에서 빼서 요약에 반영"""
+        evicted = []
+        # 마지막 질문/답변 쌍은 예산을 넘더라도 남겨둠
+        while len(self.turns) > 2 and self.history_tokens() > self.max_history_tokens:
+            count = 2 if self.turns[0]["role"] == "user" and self.turns[1]["role"] == "assistant" else 1
+            evicted.extend(self.turns[:count])
+            del self.turns[:count]
+            del self._token_counts[:count]
+
+        if evicted:
+            self.summary = self._summarize(evicted)
+
+    def _summarize(self, evicted):
+        """기존 요약과 밀려난 대화를 합쳐 새 요약 생성"""
+        dialogue = "\n".join(
+            f"{'사용자' if turn['role'] == 'user' else 'AI'}: {turn['content']}" for turn in evicted
+        )
+        prompt = SUMMARY_PROMPT.format(summary=self.summary or "(없음)", dialogue=dialogue)
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                temperature=0.0,
+                max_tokens=self.summary_max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return response.choices[0].message.content.strip()
+        except Exception:
+            # 요약에 실패해도 대화는 계속되도록 밀려난 대화를 잘라서 붙임
+            fallback = f"{self.summary}\n{dialogue}".strip()
+            return fallback[-self.summary_max_tokens * 2:]
+
+    def clear(self):
+        """대화 기록 초기화 (시스템 프롬프트는 유지)"""
+        self.summary = ""
+        self.turns = []
+        self._token_counts = []
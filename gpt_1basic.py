@@ -1,11 +1,14 @@
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import sys
 
 load_dotenv()
-api_key=os.getenv('OPENAI_API_KEY')
 
-client=OpenAI(api_key=api_key)
+# 회의 앱과 같은 공용 클라이언트 사용 (연결 풀, 분당 요청/토큰 한도, 호출 전체 제한 시간)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai-poc-meetingAuto'))
+from openai_client import get_openai_client
+
+client=get_openai_client()
 
 response=client.chat.completions.create(
     model="gpt-4o",
@@ -1,15 +1,24 @@
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import sys
+import time
+from conversation_memory import ConversationMemory
 
 load_dotenv()
-api_key=os.getenv('OPENAI_API_KEY')
 
-client=OpenAI(api_key=api_key)
+# 회의 앱과 같은 공용 클라이언트 사용 (연결 풀, 분당 요청/토큰 한도, 호출 전체 제한 시간)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai-poc-meetingAuto'))
+from openai_client import get_openai_client
 
-messages = [
-    {"role": "system", "content": "너는 배트맨에 나오는 조커이며, 그 캐릭터에 부합하게 답변해줘"}
-]
+client=get_openai_client()
+
+# 최근 대화만 토큰 예산 안에서 보내고 오래된 대화는 요약으로 유지
+memory = ConversationMemory(
+    client,
+    "너는 배트맨에 나오는 조커이며, 그 캐릭터에 부합하게 답변해줘",
+    model="gpt-4o",
+    max_history_tokens=2000
+)
 
 while True:
     user_input = input("사용자:")
@@ -17,16 +26,33 @@ while True:
         break
 
     # 대화 내역에 사용자 메시지 추가
-    messages.append({"role": "user", "content": user_input})
+    memory.add_user(user_input)
 
-    # OpenAI API 호출
-    response = client.chat.completions.create(
+    # OpenAI API 호출 (스트리밍으로 받은 만큼 바로 출력)
+    started = time.perf_counter()
+    first_token_at = None
+    stream = client.chat.completions.create(
         model="gpt-4o",
         temperature=0.9,
-        messages=messages
+        messages=memory.messages(),
+        stream=True
     )
 
-    # AI 응답 저장 및 출력
-    ai_message = response.choices[0].message.content
-    messages.append({"role": "assistant", "content": ai_message})
-    print("AI:", ai_message)
\ No newline at end of file
+    print("AI: ", end="", flush=True)
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if first_token_at is None:
+                first_token_at = time.perf_counter() - started
+            parts.append(delta)
+            print(delta, end="", flush=True)
+    print()
+
+    # AI 응답 저장
+    ai_message = "".join(parts)
+    memory.add_assistant(ai_message)
+    if first_token_at is not None:
+        print(f"(첫 토큰 {first_token_at:.2f}초 / 전체 {time.perf_counter() - started:.2f}초)")
@@ -1,14 +1,19 @@
 import streamlit as st
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import sys
+import time
+from conversation_memory import ConversationMemory
 
 # 환경 변수 로드
 load_dotenv()
 
-api_key = os.getenv("OPENAI_API_KEY")
-#api_key = st.secrets["OPENAI_API_KEY"]
-client = OpenAI(api_key=api_key)
+# 회의 앱과 같은 공용 클라이언트 사용 (연결 풀, 분당 요청/토큰 한도, 호출 전체 제한 시간)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai-poc-meetingAuto'))
+from openai_client import get_openai_client
+
+# 재실행/세션마다 새로 만들지 않고 프로세스 전체에서 연결 풀을 공유
+client = get_openai_client()
 
 
 
@@ -16,12 +21,19 @@ client = OpenAI(api_key=api_key)
 st.set_page_config(page_title="🃏 조커와 대화하기", layout="wide")
 st.title("🃏 조커와 대화하기")
 
+SYSTEM_PROMPT = "너는 배트맨에 나오는 조커이며, 그 캐릭터에 부합하게 답변해줘"
+
 # 세션 상태 초기화
 if "messages" not in st.session_state:
     st.session_state.messages = [
-        {"role": "system", "content": "너는 배트맨에 나오는 조커이며, 그 캐릭터에 부합하게 답변해줘"}
+        {"role": "system", "content": SYSTEM_PROMPT}
     ]
 
+# API로 보낼 대화 기록 (화면 표시용 messages와 별도로 토큰 예산 안에서 관리)
+if "memory" not in st.session_state:
+    st.session_state.memory = ConversationMemory(client, SYSTEM_PROMPT, model="gpt-4o",
+                                                 max_history_tokens=2000)
+
 # 대화 출력
 chat_container = st.container()
 with chat_container:
@@ -31,6 +43,11 @@ with chat_container:
         elif msg["role"] == "assistant":
             st.markdown(f"🃏 **조커:** {msg['content']}")
 
+# 직전 응답의 첫 토큰 지연 시간
+if "first_token_seconds" in st.session_state:
+    st.caption(f"⏱️ 첫 토큰 {st.session_state.first_token_seconds:.2f}초 / "
+               f"전체 {st.session_state.total_seconds:.2f}초")
+
 # 입력창 아래 고정
 st.markdown("---")
 user_input = st.chat_input("메시지를 입력하세요 (엔터로 전송):")
@@ -38,16 +55,39 @@ user_input = st.chat_input("메시지를 입력하세요 (엔터로 전송):")
 if user_input:
     # 사용자 메시지 추가
     st.session_state.messages.append({"role": "user", "content": user_input})
+    st.session_state.memory.add_user(user_input)
+
+    st.markdown(f"👤 **사용자:** {user_input}")
+
+    # GPT 응답 생성 (받은 토큰부터 바로 표시)
+    placeholder = st.empty()
+    placeholder.markdown("🃏 **조커:** _생각 중..._")
+    started = time.perf_counter()
+    first_token_at = None
+    stream = client.chat.completions.create(
+        model="gpt-4o",
+        temperature=0.9,
+        messages=st.session_state.memory.messages(),
+        stream=True
+    )
+
+    ai_message = ""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if first_token_at is None:
+                first_token_at = time.perf_counter() - started
+            ai_message += delta
+            placeholder.markdown(f"🃏 **조커:** {ai_message}▌")
+    placeholder.markdown(f"🃏 **조커:** {ai_message}")
 
-    # GPT 응답 생성
-    with st.spinner("조커가 생각 중..."):
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            temperature=0.9,
-            messages=st.session_state.messages
-        )
-        ai_message = response.choices[0].message.content
-        st.session_state.messages.append({"role": "assistant", "content": ai_message})
+    st.session_state.messages.append({"role": "assistant", "content": ai_message})
+    st.session_state.memory.add_assistant(ai_message)
+    if first_token_at is not None:
+        st.session_state.first_token_seconds = first_token_at
+        st.session_state.total_seconds = time.perf_counter() - started
 
     # 강제로 새로고침
    # st.rerun()